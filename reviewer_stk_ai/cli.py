@@ -15,18 +15,42 @@ from reviewer_stk_ai.src.utils.constants import APPLICATION_NAME
 from reviewer_stk_ai.src.utils.constants import (
     EXIT_FAIL,
     EXIT_SUCCESS,
+    EXIT_PARTIAL,
     DEFAULT_IGNORED_DIRECTORIES,
     DEFAULT_EXTENSION,
     DEFAULT_REPORT_DIRECTORY,
     DEFAULT_REPORT_FILENAME,
     DEFAULT_DIRECTORY,
     DEFAULT_IGNORED_FILES,
+    DEFAULT_CONCURRENCY,
+    DEFAULT_DEADLINE_GRACE,
+    DEFAULT_CALLBACK_RECEIVER_TIMEOUT,
+    DEFAULT_REVIEW_CACHE_MAX_SIZE,
+    DEFAULT_REVIEW_CACHE_MAX_AGE,
+    ENGINES,
+    ENGINE_THREAD,
+    CONVERSATION_MODES,
+    CONVERSATION_INDEPENDENT,
+    LATENCY_HISTORY_PATH,
+    JOURNAL_PATH,
+    DEFAULT_QUEUE_PATH,
+    TOKEN_CACHE_PATH,
+    DEFAULT_LEASE_SECONDS,
+    TEMP_PATH_REVIEW,
 )
 from reviewer_stk_ai.src.utils.file_helper import (
     find_all_files,
 )
-from reviewer_stk_ai.src.utils.git_helper import find_all_changed_code
-from reviewer_stk_ai.src.utils.report_helper import generate_report
+from reviewer_stk_ai.src.utils.git_helper import find_all_changed_code, find_all_code
+from reviewer_stk_ai.src.utils.report_helper import merge_reports
+from reviewer_stk_ai.src.utils.report_writer import ReportWriter
+from reviewer_stk_ai.src.utils.shard_helper import (
+    SHARD_STRATEGIES,
+    SHARD_STRATEGY_HASH,
+    find_shard_files,
+    get_shard_file_name,
+    select_shard,
+)
 
 version = importlib.metadata.version(APPLICATION_NAME)
 
@@ -52,12 +76,151 @@ def common_auth_stk_options(function):
         metavar="<string>",
     )(function)
 
+    function = click.option(
+        "--conversation-mode",
+        type=click.Choice(CONVERSATION_MODES, case_sensitive=False),
+        envvar="CR_STK_AI_CONVERSATION_MODE",
+        default=CONVERSATION_INDEPENDENT,
+        help="How reviews share the LLM conversation: one per file, one opened "
+        "before the reviews start, or the one of the first completed review.",
+    )(function)
+
+    function = click.option(
+        "--engine",
+        type=click.Choice(ENGINES, case_sensitive=False),
+        envvar="CR_STK_AI_ENGINE",
+        default=ENGINE_THREAD,
+        help="Engine used to run the reviews: thread pool, asyncio event loop "
+        "or two-phase (submit every file, then poll every execution).",
+    )(function)
+
+    function = click.option(
+        "--callback-receiver-timeout",
+        type=click.STRING,
+        envvar="CR_STK_AI_CALLBACK_RECEIVER_TIMEOUT",
+        default=str(DEFAULT_CALLBACK_RECEIVER_TIMEOUT),
+        help="Seconds to wait for the callback notification of an execution "
+        "before polling for it.",
+        metavar="<int>",
+    )(function)
+
+    function = click.option(
+        "--callback-receiver-url",
+        type=click.STRING,
+        envvar="CR_STK_AI_CALLBACK_RECEIVER_URL",
+        help="URL sent to STK AI to reach the callback receiver, when it differs "
+        "from the address it listens on.",
+        metavar="<string>",
+    )(function)
+
+    function = click.option(
+        "--callback-receiver",
+        type=click.STRING,
+        envvar="CR_STK_AI_CALLBACK_RECEIVER",
+        help="Address (host:port) of a local listener receiving the completed "
+        "executions instead of polling for them.",
+        metavar="<string>",
+    )(function)
+
+    function = click.option(
+        "--callback-rate-limit",
+        type=click.STRING,
+        envvar="CR_STK_AI_CALLBACK_RATE_LIMIT",
+        default="0",
+        help="Maximum callback checks per second shared by all workers, 0 disables it.",
+        metavar="<float>",
+    )(function)
+
+    function = click.option(
+        "--execution-rate-limit",
+        type=click.STRING,
+        envvar="CR_STK_AI_EXECUTION_RATE_LIMIT",
+        default="0",
+        help="Maximum executions (and token requests) created per second shared "
+        "by all workers, 0 disables it.",
+        metavar="<float>",
+    )(function)
+
+    function = click.option(
+        "--review-cache-max-age",
+        type=click.STRING,
+        envvar="CR_STK_AI_REVIEW_CACHE_MAX_AGE",
+        default=str(DEFAULT_REVIEW_CACHE_MAX_AGE),
+        help="Days a review is kept on the review cache, 0 keeps it forever.",
+        metavar="<int>",
+    )(function)
+
+    function = click.option(
+        "--review-cache-max-size",
+        type=click.STRING,
+        envvar="CR_STK_AI_REVIEW_CACHE_MAX_SIZE",
+        default=str(DEFAULT_REVIEW_CACHE_MAX_SIZE),
+        help="Megabytes of reviews kept on the review cache, the least recently "
+        "used are evicted first. 0 disables the limit.",
+        metavar="<int>",
+    )(function)
+
+    function = click.option(
+        "--review-cache-dir",
+        type=click.STRING,
+        envvar="CR_STK_AI_REVIEW_CACHE_DIR",
+        default="",
+        help="Directory of the review cache: files reviewed before with the same "
+        "content are not sent again. Disabled when empty.",
+        metavar="<string>",
+    )(function)
+
+    function = click.option(
+        "--pack-size",
+        type=click.STRING,
+        envvar="CR_STK_AI_PACK_SIZE",
+        default="0",
+        help="Files smaller than this size in bytes are reviewed together, in "
+        "executions of up to this size, 0 disables it.",
+        metavar="<int>",
+    )(function)
+
+    function = click.option(
+        "--chunk-size",
+        type=click.STRING,
+        envvar="CR_STK_AI_CHUNK_SIZE",
+        default="0",
+        help="Files bigger than this size in bytes are split in chunks reviewed "
+        "in parallel, 0 disables it.",
+        metavar="<int>",
+    )(function)
+
+    function = click.option(
+        "--minimize/--no-minimize",
+        envvar="CR_STK_AI_MINIMIZE",
+        default=False,
+        help="Strip comments, docstrings, long strings and indentation from the "
+        "files before sending them, keeping their line numbers, to save tokens.",
+    )(function)
+
+    function = click.option(
+        "--adaptive-concurrency/--no-adaptive-concurrency",
+        envvar="CR_STK_AI_ADAPTIVE_CONCURRENCY",
+        default=False,
+        help="Adjust the files in flight to the latency and errors of STK AI, "
+        "using --concurrency as the upper bound.",
+    )(function)
+
+    function = click.option(
+        "--concurrency",
+        type=click.STRING,
+        envvar="CR_STK_AI_CONCURRENCY",
+        default=str(DEFAULT_CONCURRENCY),
+        help="Maximum number of files reviewed at the same time.",
+        metavar="<int>",
+    )(function)
+
     function = click.option(
         "--retry-timeout",
         type=click.STRING,
         envvar="CR_STK_AI_RETRY_TIMEOUT",
         default="10",
-        help="Wait time in seconds between response checks.",
+        help="Longest wait time in seconds between response checks.",
         metavar="<int>",
     )(function)
 
@@ -70,6 +233,14 @@ def common_auth_stk_options(function):
         metavar="<int>",
     )(function)
 
+    function = click.option(
+        "--token-cache/--no-token-cache",
+        envvar="CR_STK_AI_TOKEN_CACHE",
+        default=True,
+        help=f"Share the access token between runs and processes, in the "
+        f"owner-only file {TOKEN_CACHE_PATH}.",
+    )(function)
+
     function = click.option(
         "--realm",
         type=click.STRING,
@@ -101,8 +272,8 @@ def common_auth_stk_options(function):
         "--client-secret",
         type=click.STRING,
         envvar="CR_STK_AI_CLIENT_SECRET",
-        help="Client secret generated on the StackSpot AI platform",
-        required=True,
+        help="Client secret generated on the StackSpot AI platform, required by "
+        "the commands calling STK AI",
         metavar="<string>",
     )(function)
 
@@ -110,8 +281,8 @@ def common_auth_stk_options(function):
         "--client-id",
         type=click.STRING,
         envvar="CR_STK_AI_CLIENT_ID",
-        help="Client ID generated on the StackSpot AI platform",
-        required=True,
+        help="Client ID generated on the StackSpot AI platform, required by the "
+        "commands calling STK AI",
         metavar="<string>",
     )(function)
 
@@ -119,8 +290,8 @@ def common_auth_stk_options(function):
         "--quick-command-id",
         type=click.STRING,
         envvar="CR_STK_AI_ID_QUICK_COMMAND",
-        help="Remote quick command identifier on the STK AI portal",
-        required=True,
+        help="Remote quick command identifier on the STK AI portal, required by "
+        "the commands calling STK AI",
         metavar="<string>",
     )(function)
 
@@ -178,6 +349,86 @@ def common_param_options(function):
     return function
 
 
+def common_shard_options(function):
+    function = click.option(
+        "--shard-strategy",
+        type=click.Choice(SHARD_STRATEGIES, case_sensitive=False),
+        envvar="CR_STK_AI_SHARD_STRATEGY",
+        default=SHARD_STRATEGY_HASH,
+        help="How files are split between shards: stable hash of the path or "
+        "balanced by size.",
+    )(function)
+
+    function = click.option(
+        "--shard-count",
+        type=click.STRING,
+        envvar="CR_STK_AI_SHARD_COUNT",
+        default="1",
+        help="Number of nodes sharing the review, each one writes a partial report.",
+        metavar="<int>",
+    )(function)
+
+    function = click.option(
+        "--shard-index",
+        type=click.STRING,
+        envvar="CR_STK_AI_SHARD_INDEX",
+        default="0",
+        help="Shard reviewed by this node, from 0 to --shard-count - 1.",
+        metavar="<int>",
+    )(function)
+
+    return function
+
+
+def common_deadline_options(function):
+    function = click.option(
+        "--deadline-grace",
+        type=click.STRING,
+        envvar="CR_STK_AI_DEADLINE_GRACE",
+        default=str(DEFAULT_DEADLINE_GRACE),
+        help="Seconds before the deadline when no new file is submitted, left "
+        "to the reviews in flight.",
+        metavar="<int>",
+    )(function)
+
+    function = click.option(
+        "--deadline",
+        type=click.STRING,
+        envvar="CR_STK_AI_DEADLINE",
+        default="0",
+        help="Maximum duration of the reviews in seconds, the files not reviewed "
+        "in time are listed on the report and the exit code is 2. 0 disables it.",
+        metavar="<int>",
+    )(function)
+
+    return function
+
+
+def common_resume_options(function):
+    function = click.option(
+        "--resume/--no-resume",
+        envvar="CR_STK_AI_RESUME",
+        default=False,
+        help="Resume the previous run from its journal: completed files are not "
+        "reviewed again and files in flight are polled instead of resubmitted.",
+    )(function)
+
+    return function
+
+
+def common_queue_options(function):
+    function = click.option(
+        "--queue-path",
+        type=click.STRING,
+        envvar="CR_STK_AI_QUEUE_PATH",
+        default=DEFAULT_QUEUE_PATH,
+        help="SQLite file of the work queue, shared by every worker.",
+        metavar="<string>",
+    )(function)
+
+    return function
+
+
 @click.group(invoke_without_command=True)
 @common_auth_stk_options
 @common_param_options
@@ -192,8 +443,24 @@ def cli(
     host_stk_ai,
     host_token_stk_ai,
     realm,
+    token_cache,
     retry_max_attempts,
     retry_timeout,
+    concurrency,
+    adaptive_concurrency,
+    minimize,
+    chunk_size,
+    pack_size,
+    review_cache_dir,
+    review_cache_max_size,
+    review_cache_max_age,
+    execution_rate_limit,
+    callback_rate_limit,
+    callback_receiver,
+    callback_receiver_url,
+    callback_receiver_timeout,
+    engine,
+    conversation_mode,
     http_proxy,
     https_proxy,
     directory,
@@ -207,7 +474,13 @@ def cli(
     from reviewer_stk_ai.src.service.stk_token_service import StkTokenService
     from reviewer_stk_ai.src.service.stk_execution_service import StkExecutionService
     from reviewer_stk_ai.src.service.stk_callback_service import StkCallbackService
+    from reviewer_stk_ai.src.service.stk_callback_poller import StkCallbackPoller
     from reviewer_stk_ai.src.service.reviewer_service import ReviewerService
+    from reviewer_stk_ai.src.utils.http_client import HttpClient
+    from reviewer_stk_ai.src.utils.rate_limiter import TokenBucketRateLimiter
+    from reviewer_stk_ai.src.utils.retry_policy import RetryPolicy
+    from reviewer_stk_ai.src.utils.token_cache import TokenCache
+    from reviewer_stk_ai.src.utils.latency_history import LatencyHistory
 
     ctx.ensure_object(dict)
 
@@ -239,9 +512,9 @@ def cli(
         extra={
             "properties": {
                 "client_id",
-                client_id[:4],
+                (client_id or "")[:4],
                 "client_secret",
-                client_secret[:4],
+                (client_secret or "")[:4],
                 "host_stk_ai",
                 host_stk_ai,
                 "host_token_stk_ai",
@@ -250,6 +523,36 @@ def cli(
                 retry_timeout,
                 "retry_max_attempts",
                 retry_max_attempts,
+                "concurrency",
+                concurrency,
+                "adaptive_concurrency",
+                adaptive_concurrency,
+                "minimize",
+                minimize,
+                "chunk_size",
+                chunk_size,
+                "pack_size",
+                pack_size,
+                "review_cache_dir",
+                review_cache_dir,
+                "review_cache_max_size",
+                review_cache_max_size,
+                "review_cache_max_age",
+                review_cache_max_age,
+                "execution_rate_limit",
+                execution_rate_limit,
+                "callback_rate_limit",
+                callback_rate_limit,
+                "callback_receiver",
+                callback_receiver,
+                "callback_receiver_url",
+                callback_receiver_url,
+                "callback_receiver_timeout",
+                callback_receiver_timeout,
+                "engine",
+                engine,
+                "conversation_mode",
+                conversation_mode,
                 "http_proxy",
                 http_proxy,
                 "https_proxy",
@@ -260,47 +563,265 @@ def cli(
     ctx.obj["params"] = ctx.params
     ctx.obj["config"] = EnvConfig(args=ctx.params)
 
-    stk_token_service = StkTokenService(env_config=ctx.obj["config"])
+    # Budgets shared by every worker of the run
+    execution_rate_limiter = TokenBucketRateLimiter(
+        rate=float(ctx.obj["config"].get_execution_rate_limit())
+    )
+    callback_rate_limiter = TokenBucketRateLimiter(
+        rate=float(ctx.obj["config"].get_callback_rate_limit())
+    )
 
-    stk_execution_service = StkExecutionService(
-        env_config=ctx.obj["config"], stk_token_service=stk_token_service
+    # Keep-alive connections, retries, their budget and the circuit breaker
+    # shared by every service and worker of the run
+    retry_policy = RetryPolicy()
+    http_client = HttpClient(
+        env_config=ctx.obj["config"],
+        pool_size=int(ctx.obj["config"].get_concurrency()),
+        retry_policy=retry_policy,
+    )
+    ctx.obj["http_client"] = http_client
+    ctx.call_on_close(http_client.close)
+
+    stk_token_service = StkTokenService(
+        env_config=ctx.obj["config"],
+        rate_limiter=execution_rate_limiter,
+        http_client=http_client,
+        shared_token_cache=(
+            TokenCache(path=TOKEN_CACHE_PATH)
+            if ctx.obj["config"].get_token_cache()
+            else None
+        ),
     )
 
     stk_callback_service = StkCallbackService(
-        env_config=ctx.obj["config"], stk_token_service=stk_token_service
+        env_config=ctx.obj["config"],
+        stk_token_service=stk_token_service,
+        rate_limiter=callback_rate_limiter,
+        http_client=http_client,
+    )
+
+    # One scheduler thread polls every execution in flight
+    stk_callback_poller = StkCallbackPoller(
+        env_config=ctx.obj["config"],
+        stk_callback_service=stk_callback_service,
+        max_connections=int(ctx.obj["config"].get_concurrency()),
     )
+    ctx.call_on_close(stk_callback_poller.close)
+
+    # Completions pushed to a local listener, polling only as a fallback
+    stk_callback_receiver = None
+    if ctx.obj["config"].get_callback_receiver():
+        stk_callback_receiver = create_callback_receiver(
+            env_config=ctx.obj["config"],
+            stk_callback_service=stk_callback_service,
+            fallback=stk_callback_poller,
+        ).start()
+        ctx.call_on_close(stk_callback_receiver.close)
+
+    stk_execution_service = StkExecutionService(
+        env_config=ctx.obj["config"],
+        stk_token_service=stk_token_service,
+        rate_limiter=execution_rate_limiter,
+        callback_url=stk_callback_receiver and stk_callback_receiver.get_url(),
+        http_client=http_client,
+    )
+
+    # Reviews of unchanged content, shared by runs and CI jobs
+    ctx.obj["review_cache"] = create_review_cache(env_config=ctx.obj["config"])
 
     ctx.obj["reviewer_service"] = ReviewerService(
         stk_execution_service=stk_execution_service,
         stk_callback_service=stk_callback_service,
+        stk_callback_poller=stk_callback_receiver or stk_callback_poller,
+        concurrency=int(ctx.obj["config"].get_concurrency()),
+        engine=ctx.obj["config"].get_engine(),
+        conversation_mode=ctx.obj["config"].get_conversation_mode(),
+        adaptive_concurrency=ctx.obj["config"].get_adaptive_concurrency(),
+        latency_history=LatencyHistory(path=LATENCY_HISTORY_PATH).load(),
+        minimize=ctx.obj["config"].get_minimize(),
+        chunk_size=int(ctx.obj["config"].get_chunk_size()),
+        pack_size=int(ctx.obj["config"].get_pack_size()),
+        review_cache=ctx.obj["review_cache"],
+        retry_policy=retry_policy,
     )
 
     if ctx.invoked_subcommand is None:
         ctx.invoke(review_dir)
 
 
-def run(ctx, params, files):
+def require_stk_credentials(ctx):
+    """
+    The STK AI options are required only by the commands calling it, so
+    the offline commands (enqueue, merge-reports) run without them.
+    """
+    for name in ("quick_command_id", "client_id", "client_secret"):
+        if not ctx.obj["params"].get(name):
+            raise click.UsageError(
+                f"Missing option '--{name.replace('_', '-')}'.", ctx=ctx
+            )
+
+
+def select_files_of_shard(files, shard_index, shard_count, shard_strategy):
+    try:
+        index = int(shard_index)
+        count = int(shard_count)
+    except ValueError:
+        raise click.BadParameter("--shard-index and --shard-count must be integers")
+
+    if count < 1 or not 0 <= index < count:
+        raise click.BadParameter(
+            f"--shard-index must be between 0 and {count - 1}, got {index}"
+        )
+
+    if count == 1:
+        return files, None
+
+    shard_files = select_shard(
+        files=files, shard_index=index, shard_count=count, strategy=shard_strategy
+    )
+
+    click.echo(f"Shard {index + 1} of {count} has {len(shard_files)} files...")
+
+    return shard_files, (index, count)
+
+
+def echo_http_stats(ctx):
+    stats = ctx.obj["http_client"].get_stats()
+
+    if stats["requests"] > 0:
+        click.echo(
+            f"HTTP requests: {stats['requests']} over {stats['connections']} "
+            f"connections ({stats['reused']} reused), {stats['retries']} retried"
+        )
+
+
+def create_callback_receiver(env_config, stk_callback_service, fallback):
+    from reviewer_stk_ai.src.service.stk_callback_receiver import (
+        StkCallbackReceiver,
+    )
+
+    host, _, port = env_config.get_callback_receiver().rpartition(":")
+    try:
+        port = int(port)
+    except ValueError:
+        raise click.BadParameter(
+            "use host:port, e.g. 0.0.0.0:8080", param_hint="--callback-receiver"
+        )
+
+    return StkCallbackReceiver(
+        stk_callback_service=stk_callback_service,
+        fallback=fallback,
+        host=host or "127.0.0.1",
+        port=port,
+        timeout=int(env_config.get_callback_receiver_timeout()),
+        public_url=env_config.get_callback_receiver_url() or None,
+    )
+
+
+def create_review_cache(env_config):
+    from reviewer_stk_ai.src.utils.review_cache import ReviewCache
+
+    if not env_config.get_review_cache_dir():
+        return None
+
+    try:
+        max_size = int(env_config.get_review_cache_max_size())
+        max_age = int(env_config.get_review_cache_max_age())
+    except ValueError:
+        raise click.BadParameter(
+            "--review-cache-max-size and --review-cache-max-age must be integers"
+        )
+
+    return ReviewCache(
+        directory=env_config.get_review_cache_dir(),
+        namespace=env_config.get_stk_id_quick_command(),
+        max_size=max_size * 1024 * 1024,
+        max_age=max_age * 24 * 60 * 60,
+    )
+
+
+def create_deadline(deadline, deadline_grace):
+    from reviewer_stk_ai.src.utils.deadline import Deadline
+
+    try:
+        seconds = float(deadline)
+        grace = float(deadline_grace)
+    except ValueError:
+        raise click.BadParameter("--deadline and --deadline-grace must be numbers")
+
+    if seconds <= 0:
+        return None
+
+    return Deadline(seconds=seconds, grace=grace)
+
+
+def run(ctx, params, files, shard=None, deadline=None, resume=False):
+    from reviewer_stk_ai.src.utils.run_journal import RunJournal, get_journal_path
+
     if len(files) == 0:
         click.echo("No items to analyze!")
         return EXIT_SUCCESS
 
+    journal_path = get_journal_path(
+        path=JOURNAL_PATH,
+        command=ctx.command.name,
+        directory=params["directory"],
+        shard=shard,
+    )
+    journal = RunJournal(path=journal_path)
+    if resume:
+        click.echo(f"Resuming from journal {journal_path}...")
+        journal.load()
+    else:
+        journal.reset()
+
     files_reviews = FileReview.list_from_dict(files=files)
 
+    file_name_with_extension = params["report_filename"]
+    if shard is not None:
+        file_name_with_extension = get_shard_file_name(
+            file_name=file_name_with_extension,
+            shard_index=shard[0],
+            shard_count=shard[1],
+        )
+
     click.echo("Reviewing files...")
 
-    ctx.obj["reviewer_service"].run(file_reviews=files_reviews)
+    # Each review is added to the report as soon as it is done, the report is
+    # ordered when the writer closes, even when the run is interrupted
+    with ReportWriter(
+        directory=params["report_directory"],
+        file_name=file_name_with_extension,
+        index=shard is None,
+        temp_directory=TEMP_PATH_REVIEW,
+    ) as report_writer:
+        ctx.obj["reviewer_service"].run(
+            file_reviews=files_reviews,
+            report_writer=report_writer,
+            deadline=deadline,
+            journal=journal,
+        )
+
+        summary = ctx.obj["reviewer_service"].get_summary()
+        report_writer.add_not_reviewed(
+            names=summary.skipped + summary.timed_out + summary.failed
+        )
 
-    click.echo("Merging report files...")
+    click.echo(summary)
+    echo_http_stats(ctx)
 
-    click.echo("Creating report file...")
-    file_name_with_extension = params["report_filename"]
+    if report_writer.get_count() == 0 and not summary.is_partial():
+        raise ValueError(
+            f"No content to generate report, at {report_writer.get_path()}"
+        )
 
-    generate_report(
-        directory=params["report_directory"], file_name=file_name_with_extension
+    click.echo(
+        f"Report file created on {click.format_filename(report_writer.get_path())}."
     )
 
-    file_path = params["report_directory"] + "/" + file_name_with_extension
-    click.echo(f"Report file created on {click.format_filename(file_path)}.")
+    if summary.is_partial():
+        click.echo("Some files were not reviewed, the report is partial.")
+        ctx.exit(EXIT_PARTIAL)
 
     return EXIT_SUCCESS
 
@@ -322,9 +843,33 @@ def run(ctx, params, files):
     help="The Branch should be compared to base for diff",
     metavar="<string>",
 )
+@click.option(
+    "--full-content/--no-full-content",
+    envvar="CR_STK_AI_DIFF_FULL_CONTENT",
+    default=False,
+    help="Review the whole content of the changed files instead of their diff, "
+    "so unchanged content is found on the review cache.",
+)
+@common_shard_options
+@common_deadline_options
+@common_resume_options
 @click.pass_context
-def diff(ctx, base_branch, compare_branch):
+def diff(
+    ctx,
+    base_branch,
+    compare_branch,
+    full_content,
+    shard_index,
+    shard_count,
+    shard_strategy,
+    deadline,
+    deadline_grace,
+    resume,
+):
+    require_stk_credentials(ctx)
     params = ctx.obj["params"]
+    # The budget starts with the command, discovering the files included
+    run_deadline = create_deadline(deadline=deadline, deadline_grace=deadline_grace)
     try:
         click.echo(f"Finding files changed files {base_branch} > {compare_branch}.")
 
@@ -335,11 +880,21 @@ def diff(ctx, base_branch, compare_branch):
             extension=params["extension"],
             ignored_directories=convert_ignored_directories(params),
             ignored_files=convert_ignored_files(params),
+            full_content=full_content,
         )
 
         click.echo(f"Were found {len(files)} modified files...")
 
-        return run(ctx, params, files)
+        files, shard = select_files_of_shard(
+            files=files,
+            shard_index=shard_index,
+            shard_count=shard_count,
+            shard_strategy=shard_strategy,
+        )
+
+        return run(
+            ctx, params, files, shard=shard, deadline=run_deadline, resume=resume
+        )
     except InvalidGitRepositoryError as e:
         click.echo("Current repository is not a git repository!")
 
@@ -349,9 +904,17 @@ def diff(ctx, base_branch, compare_branch):
 @cli.command(
     context_settings=CONTEXT_SETTINGS, short_help="Send all files on dir for reviewing."
 )
+@common_shard_options
+@common_deadline_options
+@common_resume_options
 @click.pass_context
-def review_dir(ctx):
+def review_dir(
+    ctx, shard_index, shard_count, shard_strategy, deadline, deadline_grace, resume
+):
+    require_stk_credentials(ctx)
     params = ctx.obj["params"]
+    # The budget starts with the command, discovering the files included
+    run_deadline = create_deadline(deadline=deadline, deadline_grace=deadline_grace)
     click.echo(f"Finding files by directory: \"{params['directory']}\"")
 
     files = find_all_files(
@@ -363,7 +926,107 @@ def review_dir(ctx):
 
     click.echo(f"Were found {len(files)} files in this directory...")
 
-    return run(ctx, params, files)
+    files, shard = select_files_of_shard(
+        files=files,
+        shard_index=shard_index,
+        shard_count=shard_count,
+        shard_strategy=shard_strategy,
+    )
+
+    return run(ctx, params, files, shard=shard, deadline=run_deadline, resume=resume)
+
+
+@cli.command(
+    "warm-cache",
+    context_settings=CONTEXT_SETTINGS,
+    short_help="Review the files of a ref into the review cache.",
+)
+@click.option(
+    "--ref",
+    type=click.STRING,
+    default="main",
+    help="Branch, tag or commit whose files are reviewed.",
+    metavar="<string>",
+)
+@common_deadline_options
+@click.pass_context
+def warm_cache(ctx, ref, deadline, deadline_grace):
+    require_stk_credentials(ctx)
+    params = ctx.obj["params"]
+    review_cache = ctx.obj["review_cache"]
+    if review_cache is None:
+        raise click.BadParameter(
+            "the directory of the review cache is required",
+            param_hint="--review-cache-dir",
+        )
+
+    run_deadline = create_deadline(deadline=deadline, deadline_grace=deadline_grace)
+    try:
+        click.echo(f"Finding files of {ref}.")
+
+        files = find_all_code(
+            repository_path=params["directory"],
+            ref=ref,
+            extension=params["extension"],
+            ignored_directories=convert_ignored_directories(params),
+            ignored_files=convert_ignored_files(params),
+        )
+    except InvalidGitRepositoryError:
+        click.echo("Current repository is not a git repository!")
+        return EXIT_FAIL
+
+    click.echo(f"Were found {len(files)} files on {ref}...")
+
+    if len(files) == 0:
+        click.echo("No items to analyze!")
+        return EXIT_SUCCESS
+
+    # The reviews are kept on the cache only, no report is written
+    ctx.obj["reviewer_service"].run(
+        file_reviews=FileReview.list_from_dict(files=files), deadline=run_deadline
+    )
+
+    summary = ctx.obj["reviewer_service"].get_summary()
+    click.echo(summary)
+    echo_http_stats(ctx)
+    click.echo(
+        f"Review cache {review_cache.get_directory()} holds "
+        f"{review_cache.get_count()} reviews."
+    )
+
+    if summary.is_partial():
+        click.echo("Some files were not reviewed, the cache is partial.")
+        ctx.exit(EXIT_PARTIAL)
+
+    return EXIT_SUCCESS
+
+
+@cli.command(
+    "merge-reports",
+    context_settings=CONTEXT_SETTINGS,
+    short_help="Merge the partial reports of every shard into the report.",
+)
+@click.pass_context
+def merge_reports_command(ctx):
+    params = ctx.obj["params"]
+    try:
+        shard_files = find_shard_files(
+            directory=params["report_directory"], file_name=params["report_filename"]
+        )
+    except ValueError as e:
+        raise click.ClickException(str(e))
+
+    click.echo(f"Were found {len(shard_files)} shard reports...")
+
+    file_path = merge_reports(
+        directory=params["report_directory"],
+        file_name=params["report_filename"],
+        shard_files=shard_files,
+    )
+
+    click.echo(f"Report file created on {click.format_filename(file_path)}.")
+
+    return EXIT_SUCCESS
 
 
 def convert_ignored_files(params):
@@ -380,3 +1043,85 @@ def convert_ignored_directories(params):
         ignored_directories_set.update(DEFAULT_IGNORED_DIRECTORIES)
 
     return ignored_directories_set
+
+
+@cli.command(
+    context_settings=CONTEXT_SETTINGS,
+    short_help="Add all files on dir to the work queue.",
+)
+@common_queue_options
+@click.pass_context
+def enqueue(ctx, queue_path):
+    from reviewer_stk_ai.src.utils.work_queue import WorkQueue
+
+    params = ctx.obj["params"]
+    click.echo(f"Finding files by directory: \"{params['directory']}\"")
+
+    files = find_all_files(
+        directory=params["directory"],
+        extension=params["extension"],
+        ignored_directories=convert_ignored_directories(params),
+        ignored_files=convert_ignored_files(params),
+    )
+
+    added = WorkQueue(path=queue_path).enqueue(
+        file_reviews=FileReview.list_from_dict(files=files)
+    )
+
+    click.echo(f"Were queued {added} of {len(files)} files on {queue_path}.")
+
+    return EXIT_SUCCESS
+
+
+@cli.command(
+    context_settings=CONTEXT_SETTINGS,
+    short_help="Review the files of the work queue.",
+)
+@common_queue_options
+@click.option(
+    "--lease-seconds",
+    type=click.STRING,
+    envvar="CR_STK_AI_LEASE_SECONDS",
+    default=str(DEFAULT_LEASE_SECONDS),
+    help="Time a worker owns a file before another worker can take it.",
+    metavar="<int>",
+)
+@click.pass_context
+def work(ctx, queue_path, lease_seconds):
+    import socket
+
+    from reviewer_stk_ai.src.utils.work_queue import WorkQueue, STATUS_FAILED
+
+    require_stk_credentials(ctx)
+    params = ctx.obj["params"]
+    work_queue = WorkQueue(path=queue_path, lease_seconds=float(lease_seconds))
+    worker_id = f"{socket.gethostname()}-{os.getpid()}"
+
+    click.echo(f"Reviewing files of the work queue {queue_path}...")
+
+    reviewed = ctx.obj["reviewer_service"].run_queue(
+        work_queue=work_queue, worker_id=worker_id
+    )
+
+    counts = work_queue.get_counts()
+    click.echo(f"Were reviewed {reviewed} files by this worker, queue: {counts}")
+    echo_http_stats(ctx)
+
+    if not work_queue.is_drained():
+        click.echo("Other workers are still reviewing files.")
+        return EXIT_SUCCESS
+
+    click.echo("Creating report file...")
+    with ReportWriter(
+        directory=params["report_directory"],
+        file_name=params["report_filename"],
+        temp_directory=TEMP_PATH_REVIEW,
+    ) as report_writer:
+        for review in work_queue.find_completed():
+            report_writer.write(review=review)
+
+    click.echo(
+        f"Report file created on {click.format_filename(report_writer.get_path())}."
+    )
+
+    return EXIT_FAIL if counts.get(STATUS_FAILED, 0) > 0 else EXIT_SUCCESS
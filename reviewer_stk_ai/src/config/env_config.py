@@ -1,5 +1,14 @@
 from typing import Dict
 
+from reviewer_stk_ai.src.utils.constants import (
+    DEFAULT_CONCURRENCY,
+    ENGINE_THREAD,
+    CONVERSATION_INDEPENDENT,
+    DEFAULT_CALLBACK_RECEIVER_TIMEOUT,
+    DEFAULT_REVIEW_CACHE_MAX_SIZE,
+    DEFAULT_REVIEW_CACHE_MAX_AGE,
+)
+
 
 class EnvConfig:
     _stk_quick_command_id: str
@@ -8,6 +17,22 @@ class EnvConfig:
     _stk_realm: str
     _stk_retry_max_attempts: str
     _stk_retry_timeout: str
+    _concurrency: str
+    _engine: str
+    _conversation_mode: str
+    _adaptive_concurrency: bool
+    _minimize: bool
+    _chunk_size: str
+    _pack_size: str
+    _review_cache_dir: str
+    _review_cache_max_size: str
+    _review_cache_max_age: str
+    _execution_rate_limit: str
+    _callback_rate_limit: str
+    _callback_receiver: str
+    _callback_receiver_url: str
+    _callback_receiver_timeout: str
+    _token_cache: bool
     _proxies: Dict
 
     _host_token_stk_ai: str
@@ -20,6 +45,31 @@ class EnvConfig:
         self._stk_realm = args['realm']
         self._stk_retry_max_attempts = args['retry_max_attempts']
         self._stk_retry_timeout = args['retry_timeout']
+        self._concurrency = args.get('concurrency') or str(DEFAULT_CONCURRENCY)
+        self._engine = args.get('engine') or ENGINE_THREAD
+        self._conversation_mode = (
+            args.get('conversation_mode') or CONVERSATION_INDEPENDENT
+        )
+        self._adaptive_concurrency = bool(args.get('adaptive_concurrency'))
+        self._minimize = bool(args.get('minimize'))
+        self._chunk_size = args.get('chunk_size') or "0"
+        self._pack_size = args.get('pack_size') or "0"
+        self._review_cache_dir = args.get('review_cache_dir') or ""
+        self._review_cache_max_size = args.get('review_cache_max_size') or str(
+            DEFAULT_REVIEW_CACHE_MAX_SIZE
+        )
+        self._review_cache_max_age = args.get('review_cache_max_age') or str(
+            DEFAULT_REVIEW_CACHE_MAX_AGE
+        )
+        self._execution_rate_limit = args.get('execution_rate_limit') or "0"
+        self._callback_rate_limit = args.get('callback_rate_limit') or "0"
+        self._callback_receiver = args.get('callback_receiver') or ""
+        self._callback_receiver_url = args.get('callback_receiver_url') or ""
+        self._callback_receiver_timeout = args.get('callback_receiver_timeout') or str(
+            DEFAULT_CALLBACK_RECEIVER_TIMEOUT
+        )
+
+        self._token_cache = bool(args.get('token_cache', True))
 
         self._proxies = {}
         if args['http_proxy'] is not None and len(args['http_proxy']) > 0:
@@ -49,6 +99,54 @@ class EnvConfig:
     def get_stk_retry_timeout(self) -> str:
         return self._stk_retry_timeout
 
+    def get_concurrency(self) -> str:
+        return self._concurrency
+
+    def get_engine(self) -> str:
+        return self._engine
+
+    def get_conversation_mode(self) -> str:
+        return self._conversation_mode
+
+    def get_adaptive_concurrency(self) -> bool:
+        return self._adaptive_concurrency
+
+    def get_minimize(self) -> bool:
+        return self._minimize
+
+    def get_chunk_size(self) -> str:
+        return self._chunk_size
+
+    def get_pack_size(self) -> str:
+        return self._pack_size
+
+    def get_review_cache_dir(self) -> str:
+        return self._review_cache_dir
+
+    def get_review_cache_max_size(self) -> str:
+        return self._review_cache_max_size
+
+    def get_review_cache_max_age(self) -> str:
+        return self._review_cache_max_age
+
+    def get_execution_rate_limit(self) -> str:
+        return self._execution_rate_limit
+
+    def get_callback_rate_limit(self) -> str:
+        return self._callback_rate_limit
+
+    def get_callback_receiver(self) -> str:
+        return self._callback_receiver
+
+    def get_callback_receiver_url(self) -> str:
+        return self._callback_receiver_url
+
+    def get_callback_receiver_timeout(self) -> str:
+        return self._callback_receiver_timeout
+
+    def get_token_cache(self) -> bool:
+        return self._token_cache
+
     def get_proxies(self) -> Dict[str, str]:
         return self._proxies
 
@@ -0,0 +1,3 @@
+class CircuitOpenError(BaseException):
+    def __init__(self, *args):
+        super().__init__(*args)
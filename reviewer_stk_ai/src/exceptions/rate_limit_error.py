@@ -0,0 +1,3 @@
+class RateLimitError(BaseException):
+    def __init__(self, *args):
+        super().__init__(*args)
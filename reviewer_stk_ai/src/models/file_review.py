@@ -13,6 +13,12 @@ class FileReview:
         execution_id (str): ID analyze execution.
         conversation_id (str): ID of llm conversation.
         llm_review (str): File analyze response.
+        elapsed (float): Seconds from submission to response, None if not measured.
+        submitted_at (float): Epoch seconds of the submission, None if resumed.
+        queue_time (float): Seconds the execution waited on STK AI before it
+            started, None if not measured.
+        parent (FileReview): File this review is a chunk of, None for whole files.
+        first_line (int): Line of the file where the content starts.
     """
 
     name: str
@@ -20,6 +26,11 @@ class FileReview:
     execution_id: str
     conversation_id: str
     llm_review: str
+    elapsed: float
+    submitted_at: float
+    queue_time: float
+    parent: "FileReview"
+    first_line: int
 
     def __init__(
         self,
@@ -28,12 +39,19 @@ class FileReview:
         name: str = "",
         content: str = "",
         llm_review: str = "",
+        parent: "FileReview" = None,
+        first_line: int = 1,
     ):
         self.name = name
         self.content = content
         self.execution_id = execution_id
         self.conversation_id = conversation_id
         self.llm_review = llm_review
+        self.elapsed = None
+        self.submitted_at = None
+        self.queue_time = None
+        self.parent = parent
+        self.first_line = first_line
         self.file_content_hash = generate_file_hash(self.content)
 
     def __str__(self):
@@ -47,6 +65,12 @@ class FileReview:
             f")"
         )
 
+    def get_size(self) -> int:
+        return len(self.content.encode("utf-8"))
+
+    def get_last_line(self) -> int:
+        return self.first_line + max(0, len(self.content.splitlines()) - 1)
+
     @staticmethod
     def list_from_dict(files: Dict[str, str]) -> List:
         files_reviews = []
@@ -0,0 +1,146 @@
+from typing import Dict, List, Set
+
+
+class ReviewSummary:
+    """
+    Statistics of a review run
+
+    Attributes:
+        order (List[str]): Files in the order they were scheduled.
+        predicted_makespan (float): Predicted duration of the reviews in seconds.
+        makespan (float): Actual duration of the reviews in seconds.
+        skipped (List[str]): Files not submitted because of the deadline.
+        timed_out (List[str]): Files submitted but not completed before the deadline.
+        failed (List[str]): Files submitted whose result could not be fetched.
+        polls (Dict[str, int]): Callback checks made for each file.
+        times_to_result (Dict[str, float]): Seconds from the first check to the result.
+        bytes_sent (Dict[str, int]): Bytes of each file sent after minimization.
+        bytes_saved (Dict[str, int]): Bytes removed from each file by minimization.
+        cache_hits (List[str]): Files whose review was taken from the review cache.
+        cache_misses (Set[str]): Hashes of the contents looked up on the review
+            cache and not found, counted once however many rounds look them up.
+        awaited (List[str]): Cache hits reviewed by another job during the run.
+        duplicates (Dict[str, str]): Files not sent, mapped to the file reviewed
+            for their content.
+    """
+
+    order: List[str]
+    predicted_makespan: float
+    makespan: float
+    skipped: List[str]
+    timed_out: List[str]
+    failed: List[str]
+    polls: Dict[str, int]
+    times_to_result: Dict[str, float]
+    bytes_sent: Dict[str, int]
+    bytes_saved: Dict[str, int]
+    cache_hits: List[str]
+    cache_misses: Set[str]
+    awaited: List[str]
+    duplicates: Dict[str, str]
+
+    def __init__(self):
+        self.order = []
+        self.predicted_makespan = None
+        self.makespan = None
+        self.skipped = []
+        self.timed_out = []
+        self.failed = []
+        self.polls = {}
+        self.times_to_result = {}
+        self.bytes_sent = {}
+        self.bytes_saved = {}
+        self.cache_hits = []
+        self.cache_misses = set()
+        self.awaited = []
+        self.duplicates = {}
+
+    def record_polling(self, name: str, polls: int, time_to_result: float) -> None:
+        if polls is not None:
+            self.polls[name] = polls
+        if time_to_result is not None:
+            self.times_to_result[name] = time_to_result
+
+    def record_minimization(self, name: str, original: int, minimized: int) -> None:
+        self.bytes_sent[name] = minimized
+        self.bytes_saved[name] = original - minimized
+
+    def is_partial(self) -> bool:
+        return len(self.skipped) > 0 or len(self.timed_out) > 0 or len(self.failed) > 0
+
+    def __str__(self):
+        lines = []
+
+        if len(self.order) > 0:
+            first_files = ", ".join(self.order[:5])
+            remaining = len(self.order) - 5
+            lines.append(
+                f"Review order (longest first): {first_files}"
+                f"{f' and {remaining} more' if remaining > 0 else ''}"
+            )
+
+        if self.makespan is not None:
+            predicted = (
+                f"{self.predicted_makespan:.1f}s"
+                if self.predicted_makespan is not None
+                else "unknown (no history yet)"
+            )
+            lines.append(
+                f"Makespan: predicted {predicted}, actual {self.makespan:.1f}s"
+            )
+
+        if len(self.polls) > 0:
+            lines.append(
+                f"Polls per execution: average "
+                f"{sum(self.polls.values()) / len(self.polls):.1f}, "
+                f"max {max(self.polls.values())}"
+            )
+
+        if len(self.times_to_result) > 0:
+            lines.append(
+                f"Time to result: average "
+                f"{sum(self.times_to_result.values()) / len(self.times_to_result):.1f}s, "
+                f"max {max(self.times_to_result.values()):.1f}s"
+            )
+
+        if len(self.cache_hits) + len(self.cache_misses) > 0:
+            awaited = (
+                f" ({len(self.awaited)} awaited from other jobs)"
+                if len(self.awaited) > 0
+                else ""
+            )
+            lines.append(
+                f"Review cache: {len(self.cache_hits)} hits{awaited}, "
+                f"{len(self.cache_misses)} misses"
+            )
+
+        if len(self.duplicates) > 0:
+            lines.append(
+                f"Identical files reviewed once: {len(self.duplicates)} copies of "
+                f"{len(set(self.duplicates.values()))} files"
+            )
+
+        if len(self.bytes_saved) > 0:
+            saved = sum(self.bytes_saved.values())
+            original = saved + sum(self.bytes_sent.values())
+            largest = sorted(
+                self.bytes_saved.items(), key=lambda item: item[1], reverse=True
+            )[:5]
+            lines.append(
+                f"Bytes saved by minimization: {saved} of {original} "
+                f"({saved / max(1, original):.0%}), most on "
+                f"{', '.join(f'{name} ({saved})' for name, saved in largest)}"
+            )
+
+        if len(self.skipped) > 0:
+            lines.append(f"Skipped by the deadline: {', '.join(sorted(self.skipped))}")
+
+        if len(self.timed_out) > 0:
+            lines.append(
+                f"Timed out by the deadline: {', '.join(sorted(self.timed_out))}"
+            )
+
+        if len(self.failed) > 0:
+            lines.append(f"Failed: {', '.join(sorted(self.failed))}")
+
+        return "\n".join(lines)
@@ -1,11 +1,51 @@
+import asyncio
 import logging
-from multiprocessing import Pool, cpu_count
-from typing import List
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from functools import partial
+from typing import List, Dict, Optional, Set, Union
 
+from reviewer_stk_ai.src.exceptions.deadline_exceeded_error import (
+    DeadlineExceededError,
+)
 from reviewer_stk_ai.src.models.file_review import FileReview
+from reviewer_stk_ai.src.models.review_summary import ReviewSummary
+from reviewer_stk_ai.src.service.stk_callback_poller import StkCallbackPoller
+from reviewer_stk_ai.src.service.stk_callback_receiver import StkCallbackReceiver
 from reviewer_stk_ai.src.service.stk_callback_service import StkCallbackService
 from reviewer_stk_ai.src.service.stk_execution_service import StkExecutionService
-from reviewer_stk_ai.src.utils.constants import APPLICATION_NAME, TEMP_PATH
+from reviewer_stk_ai.src.utils.chunk_helper import split_content, shift_line_numbers
+from reviewer_stk_ai.src.utils.concurrency_controller import (
+    AdaptiveConcurrencyController,
+)
+from reviewer_stk_ai.src.utils.constants import (
+    APPLICATION_NAME,
+    TEMP_PATH_REVIEW,
+    DEFAULT_CONCURRENCY,
+    ENGINE_ASYNCIO,
+    ENGINE_THREAD,
+    ENGINE_TWO_PHASE,
+    CONVERSATION_INDEPENDENT,
+    CONVERSATION_SHARED,
+    CONVERSATION_UPFRONT,
+    REVIEW_LEASE_POLL_SECONDS,
+    INVALID_STATUS_REVIEW,
+)
+from reviewer_stk_ai.src.utils.deadline import Deadline
+from reviewer_stk_ai.src.utils.latency_history import LatencyHistory
+from reviewer_stk_ai.src.utils.minify_helper import minimize
+from reviewer_stk_ai.src.utils.pack_helper import join_files, pack_files, split_review
+from reviewer_stk_ai.src.utils.report_writer import ReportWriter
+from reviewer_stk_ai.src.utils.retry_policy import RetryPolicy
+from reviewer_stk_ai.src.utils.review_cache import ReviewCache
+from reviewer_stk_ai.src.utils.run_journal import RunJournal, STATUS_COMPLETED
+from reviewer_stk_ai.src.utils.work_queue import WorkQueue
+from reviewer_stk_ai.src.utils.schedule_helper import (
+    order_longest_first,
+    predict_makespan_seconds,
+)
 from src.utils.file_helper import create_file_and_directory
 
 logger = logging.getLogger(APPLICATION_NAME)
@@ -14,73 +54,1286 @@ logger = logging.getLogger(APPLICATION_NAME)
 class ReviewerService:
     _stk_execution_service: StkExecutionService
     _stk_callback_service: StkCallbackService
+    # Polls the executions, or waits for their notifications
+    _stk_callback_poller: Union[StkCallbackPoller, StkCallbackReceiver]
+    _concurrency: int
+    _engine: str
+    _conversation_mode: str
+    _adaptive_concurrency: bool
+    # Reports to the adaptive controller the throttling it retries
+    _retry_policy: RetryPolicy = None
+    _minimize: bool
+    _chunk_size: int
+    # Chunk reviews of each file split by its size
+    _chunks: Dict[str, List[FileReview]]
+    # Guards the chunks and the resubmitted files, shared by the workers
+    _lock: threading.Lock
+    _pack_size: int
+    # Files sent together in each pack review
+    _packs: Dict[str, List[FileReview]]
+    # Files of the packs whose review could not be split, reviewed alone
+    _unpackable: Set[str]
+    _resubmitted: List[FileReview]
+    _latency_history: LatencyHistory
+    _summary: ReviewSummary
+    _report_writer: ReportWriter = None
+    _deadline: Deadline = None
+    _journal: RunJournal = None
+    _review_cache: ReviewCache = None
+    # Files whose content another job is reviewing
+    _awaited: List[FileReview]
+    # Set to stop the renewal of the leases on the review cache
+    _lease_renewal: threading.Event = None
+    # Files with the same content as each file reviewed
+    _duplicates: Dict[str, List[FileReview]]
 
     def __init__(
         self,
         stk_execution_service=None,
         stk_callback_service=None,
+        stk_callback_poller=None,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        engine: str = ENGINE_THREAD,
+        conversation_mode: str = CONVERSATION_INDEPENDENT,
+        adaptive_concurrency: bool = False,
+        latency_history: LatencyHistory = None,
+        minimize: bool = False,
+        chunk_size: int = 0,
+        pack_size: int = 0,
+        review_cache: ReviewCache = None,
+        retry_policy: RetryPolicy = None,
     ):
         self._stk_execution_service = stk_execution_service
         self._stk_callback_service = stk_callback_service
+        self._stk_callback_poller = stk_callback_poller
+        self._concurrency = max(1, concurrency)
+        self._engine = engine
+        self._conversation_mode = conversation_mode
+        self._adaptive_concurrency = adaptive_concurrency
+        self._latency_history = latency_history
+        self._minimize = minimize
+        self._chunk_size = chunk_size
+        self._chunks = {}
+        self._lock = threading.Lock()
+        self._pack_size = pack_size
+        self._packs = {}
+        self._unpackable = set()
+        self._resubmitted = []
+        self._review_cache = review_cache
+        self._retry_policy = retry_policy
+        self._awaited = []
+        self._duplicates = {}
+        self._summary = ReviewSummary()
+
+    def run(
+        self,
+        file_reviews: List[FileReview],
+        report_writer: ReportWriter = None,
+        deadline: Deadline = None,
+        journal: RunJournal = None,
+    ) -> Dict[str, str]:
+        """
+        Reviews the files, adding each review to `report_writer` as soon as
+        it is done, when one is given. With a deadline, the files not
+        submitted or not completed in time are listed on the summary. With a
+        journal, every step is recorded on it and the files it already holds
+        are resumed instead of submitted again. With a review cache, files
+        reviewed before with the same content are not submitted at all, and
+        files being reviewed by another job are awaited once the rest is
+        done. Files with the same content are reviewed once, the review is
+        copied to each of them. Files bigger than the chunk size are reviewed
+        in chunks, in parallel, and files smaller than the pack size are
+        reviewed together, their reviews are split or joined back to one
+        review per file before they reach the report.
+        """
+        if self._engine == ENGINE_ASYNCIO:
+            return asyncio.run(
+                self.run_async(
+                    file_reviews=file_reviews,
+                    report_writer=report_writer,
+                    deadline=deadline,
+                    journal=journal,
+                )
+            )
+
+        self._report_writer = report_writer
+        self._deadline = deadline
+        self._journal = journal
+        self._summary = ReviewSummary()
+        self._unpackable = set()
 
-    def run(self, file_reviews: List[FileReview]) -> None:
         logger.info("Starting file review")
 
         if len(file_reviews) > 0:
+            started_at = time.monotonic()
+            self._start_lease_renewal()
+            try:
+                # A second round reviews the files other jobs did not finish
+                round_reviews = self._deduplicate(file_reviews=file_reviews)
+                while len(round_reviews) > 0:
+                    scheduled_reviews = self._schedule(
+                        file_reviews=self._resume(
+                            file_reviews=self._prepare_reviews(
+                                file_reviews=round_reviews
+                            )
+                        )
+                    )
+                    pending_reviews = self._open_conversation(
+                        file_reviews=scheduled_reviews
+                    )
 
-            self.process_review(review=file_reviews[0])
+                    if self._engine == ENGINE_TWO_PHASE:
+                        self._run_two_phase(file_reviews=pending_reviews)
+                    else:
+                        self._run_parallel(file_reviews=pending_reviews)
 
-            for file_review in file_reviews[1:]:
-                file_review.conversation_id = file_reviews[0].conversation_id
+                    round_reviews = (
+                        self._take_resubmitted() or self._wait_for_other_jobs()
+                    )
+            finally:
+                self._release_leases()
 
-            self._run_parallel(
-                file_reviews=file_reviews[1:],
-            )
+            self._complete_run(file_reviews=file_reviews, started_at=started_at)
 
         logger.info("File review completed")
 
+        return {review.name: review.llm_review for review in file_reviews}
+
+    async def run_async(
+        self,
+        file_reviews: List[FileReview],
+        report_writer: ReportWriter = None,
+        deadline: Deadline = None,
+        journal: RunJournal = None,
+    ) -> Dict[str, str]:
+        """
+        Asyncio version of run, meant to be awaited by tools embedding the
+        reviewer. At most `concurrency` executions are in flight at a time, or
+        the limit of the adaptive controller when it is enabled, and the waits
+        between the callback checks do not hold any thread.
+        """
+        self._report_writer = report_writer
+        self._deadline = deadline
+        self._journal = journal
+        self._summary = ReviewSummary()
+        self._unpackable = set()
+        logger.info("Starting file review")
+
+        if len(file_reviews) > 0:
+            started_at = time.monotonic()
+            semaphore = asyncio.Semaphore(self._concurrency)
+            self._start_lease_renewal()
+            try:
+                round_reviews = self._deduplicate(file_reviews=file_reviews)
+                while len(round_reviews) > 0:
+                    scheduled_reviews = self._schedule(
+                        file_reviews=self._resume(
+                            file_reviews=self._prepare_reviews(
+                                file_reviews=round_reviews
+                            )
+                        )
+                    )
+
+                    pending_reviews = await asyncio.to_thread(
+                        self._open_conversation, file_reviews=scheduled_reviews
+                    )
+
+                    if self._adaptive_concurrency:
+                        await self._run_controlled_async(file_reviews=pending_reviews)
+                    else:
+                        await asyncio.gather(
+                            *(
+                                self.process_review_async(
+                                    review=review, semaphore=semaphore
+                                )
+                                for review in pending_reviews
+                            )
+                        )
+
+                    round_reviews = self._take_resubmitted() or (
+                        await asyncio.to_thread(self._wait_for_other_jobs)
+                    )
+            finally:
+                self._release_leases()
+
+            self._complete_run(file_reviews=file_reviews, started_at=started_at)
+
+        logger.info("File review completed")
+
+        return {review.name: review.llm_review for review in file_reviews}
+
+    async def process_review_async(
+        self, review: FileReview, semaphore: asyncio.Semaphore
+    ):
+        async with semaphore:
+            try:
+                await self._review_async(review=review)
+            except (KeyboardInterrupt, SystemExit, asyncio.CancelledError):
+                raise
+            except BaseException as e:
+                self._add_failed(review=review, error=e)
+
+    async def _run_controlled_async(self, file_reviews: List[FileReview]) -> None:
+        """
+        Starts each review once the adaptive controller has room for it. The
+        slots are taken one at a time, so a single thread waits on the
+        controller however many reviews are left.
+        """
+        controller = self._create_concurrency_controller()
+        tasks = []
+        try:
+            for review in file_reviews:
+                started_at = await asyncio.to_thread(controller.acquire)
+                tasks.append(
+                    asyncio.create_task(
+                        self._process_controlled_async(
+                            review=review, controller=controller, started_at=started_at
+                        )
+                    )
+                )
+
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            self._close_concurrency_controller(controller=controller)
+
+    async def _process_controlled_async(
+        self, review: FileReview, controller, started_at: float
+    ) -> None:
+        try:
+            await self._review_async(review=review)
+        except (KeyboardInterrupt, SystemExit, asyncio.CancelledError):
+            raise
+        except BaseException as e:
+            controller.on_error(started_at=started_at, error=e)
+            self._add_failed(review=review, error=e)
+        else:
+            controller.on_success(started_at=started_at, queue_time=review.queue_time)
+        finally:
+            controller.release()
+
+    async def _review_async(self, review: FileReview) -> None:
+        started_at = time.monotonic()
+        if not review.execution_id:
+            if not self._allows_submission(review=review):
+                return
+            await asyncio.to_thread(self._send_to_ai, review=review)
+        try:
+            await self._find_callback_review_async(review=review)
+        except DeadlineExceededError:
+            self._add_timed_out(review=review)
+            return
+        review.elapsed = time.monotonic() - started_at
+        await asyncio.to_thread(self._store_temp_review, review=review)
+
     def process_review(self, review):
-        self._send_to_ai(review=review)
-        self._find_callback_review(review=review)
+        started_at = time.monotonic()
+        if not review.execution_id:
+            if not self._allows_submission(review=review):
+                return
+            self._send_to_ai(review=review)
+        try:
+            self._find_callback_review(review=review)
+        except DeadlineExceededError:
+            self._add_timed_out(review=review)
+            return
+        review.elapsed = time.monotonic() - started_at
         self._store_temp_review(review=review)
 
+    def get_summary(self) -> ReviewSummary:
+        return self._summary
+
+    def _schedule(self, file_reviews: List[FileReview]) -> List[FileReview]:
+        """
+        Orders the reviews longest first and predicts how long they will take.
+        The rounds run one after the other, so the order of each round is
+        appended to the summary and its prediction added to the makespan.
+        """
+        scheduled_reviews = order_longest_first(
+            file_reviews=file_reviews, history=self._latency_history
+        )
+
+        order = [review.name for review in scheduled_reviews]
+        self._summary.order.extend(order)
+
+        predicted_makespan = predict_makespan_seconds(
+            file_reviews=scheduled_reviews,
+            workers=self._concurrency,
+            history=self._latency_history,
+        )
+        if predicted_makespan is not None:
+            self._summary.predicted_makespan = (
+                self._summary.predicted_makespan or 0.0
+            ) + predicted_makespan
+
+        logger.info(f"Review order: {order}")
+
+        return scheduled_reviews
+
+    def _complete_run(self, file_reviews: List[FileReview], started_at: float):
+        self._summary.makespan = time.monotonic() - started_at
+
+        logger.info(
+            f"Makespan predicted: {self._summary.predicted_makespan}, "
+            f"actual: {self._summary.makespan}"
+        )
+
+        if self._latency_history is None:
+            return
+
+        for review in file_reviews:
+            if review.elapsed is not None:
+                self._latency_history.record(
+                    name=review.name, size=review.get_size(), latency=review.elapsed
+                )
+
+        self._latency_history.save()
+
+    def _resume(self, file_reviews: List[FileReview]) -> List[FileReview]:
+        """
+        Restores the files found on the journal, returning the ones still to
+        be reviewed. Completed files are read from their result, files in
+        flight keep their execution id and go straight to polling.
+        """
+        if self._journal is None:
+            return file_reviews
+
+        pending_reviews = []
+        for review in file_reviews:
+            entry = self._journal.get(review=review)
+            if entry is not None:
+                review.execution_id = entry["execution_id"]
+
+                if entry["status"] == STATUS_COMPLETED and self._restore_result(
+                    review=review, result=entry["result"]
+                ):
+                    continue
+
+            pending_reviews.append(review)
+
+        resumed = len(file_reviews) - len(pending_reviews)
+        logger.info(f"{resumed} files resumed from the journal")
+
+        return pending_reviews
+
+    def _restore_result(self, review: FileReview, result: str) -> bool:
+        try:
+            with open(result, "r", encoding="utf-8") as file:
+                content = file.read()
+        except OSError:
+            logger.warning(f"Result of {review.name} lost, polling it again")
+            return False
+
+        review.llm_review = content.removeprefix(f"File name: {review.name} \n\n")
+        self._complete_review(review=review)
+
+        return True
+
+    def _deduplicate(self, file_reviews: List[FileReview]) -> List[FileReview]:
+        """
+        Keeps the first file of each content, the files with the same content
+        (vendored copies, generated stubs) get its review once it is done.
+        """
+        self._duplicates = {}
+        reviews_by_hash: Dict[str, FileReview] = {}
+
+        for review in file_reviews:
+            original = reviews_by_hash.setdefault(review.file_content_hash, review)
+            if original is not review:
+                self._duplicates.setdefault(original.name, []).append(review)
+                self._summary.duplicates[review.name] = original.name
+
+        logger.info(
+            f"{len(self._summary.duplicates)} files with the same content as "
+            f"another file, {len(reviews_by_hash)} unique contents to review"
+        )
+
+        return list(reviews_by_hash.values())
+
+    def _copy_to_duplicates(self, review: FileReview) -> None:
+        for duplicate in self._duplicates.get(review.name, []):
+            duplicate.llm_review = (
+                f"Same content as {review.name}, reviewed once for both files."
+                f"\n\n{review.llm_review}"
+            )
+            duplicate.execution_id = review.execution_id
+            duplicate.conversation_id = review.conversation_id
+
+            if self._report_writer is not None:
+                self._report_writer.write(review=duplicate)
+
+    def _prepare_reviews(self, file_reviews: List[FileReview]) -> List[FileReview]:
+        return self._pack_small_files(
+            file_reviews=self._split_large_files(
+                file_reviews=self._read_cache(file_reviews=file_reviews)
+            )
+        )
+
+    def _read_cache(self, file_reviews: List[FileReview]) -> List[FileReview]:
+        """
+        Takes the reviews found on the review cache, returning the files still
+        to be reviewed. The files claimed by another job are left to be
+        awaited, the others are claimed when they are submitted.
+        """
+        if self._review_cache is None:
+            return file_reviews
+
+        pending_reviews = []
+        for review in file_reviews:
+            if self._take_from_cache(review=review):
+                continue
+
+            if self._review_cache.is_claimed(
+                content_hash=review.file_content_hash, options=self._get_cache_options()
+            ):
+                self._awaited.append(review)
+            else:
+                pending_reviews.append(review)
+
+        self._summary.cache_misses.update(
+            review.file_content_hash for review in pending_reviews
+        )
+        logger.info(
+            f"{len(self._summary.cache_hits)} files found on the review cache "
+            f"{self._review_cache.get_directory()}, {len(self._awaited)} being "
+            f"reviewed by other jobs"
+        )
+
+        return pending_reviews
+
+    def _take_from_cache(self, review: FileReview) -> bool:
+        llm_review = self._review_cache.get(
+            content_hash=review.file_content_hash, options=self._get_cache_options()
+        )
+        if llm_review is None:
+            return False
+
+        review.llm_review = llm_review
+        self._summary.cache_hits.append(review.name)
+        # Missed on an earlier round, reviewed by another job since
+        self._summary.cache_misses.discard(review.file_content_hash)
+        if self._report_writer is not None:
+            self._report_writer.write(review=review)
+        self._copy_to_duplicates(review=review)
+
+        return True
+
+    def _wait_for_other_jobs(self) -> List[FileReview]:
+        """
+        Waits for the reviews of the files claimed by other jobs. Returns the
+        files whose lease expired, to be reviewed by this job in the next
+        round.
+        """
+        waiting_reviews, self._awaited = self._awaited, []
+        claimed_reviews = []
+
+        if len(waiting_reviews) > 0:
+            logger.info(f"Waiting for {len(waiting_reviews)} files of other jobs")
+
+        while len(waiting_reviews) > 0:
+            still_waiting = []
+            for review in waiting_reviews:
+                if self._take_from_cache(review=review):
+                    self._summary.awaited.append(review.name)
+                elif self._review_cache.is_claimed(
+                    content_hash=review.file_content_hash,
+                    options=self._get_cache_options(),
+                ):
+                    still_waiting.append(review)
+                else:
+                    claimed_reviews.append(review)
+
+            waiting_reviews = still_waiting
+            if len(waiting_reviews) == 0:
+                break
+
+            try:
+                self._sleep(seconds=REVIEW_LEASE_POLL_SECONDS)
+            except DeadlineExceededError:
+                for review in waiting_reviews:
+                    self._add_timed_out(review=review)
+                break
+
+        return claimed_reviews
+
+    def _claim(self, review: FileReview) -> bool:
+        """
+        Claims the content of a review about to be submitted. A file claimed
+        by another job since the cache was read is left to be awaited. The
+        files of packs and chunks are claimed without waiting, the review is
+        already split or joined with others.
+        """
+        if self._review_cache is None:
+            return True
+
+        if review.name in self._packs or review.parent is not None:
+            for claimed in self._packs.get(review.name, [review.parent]):
+                self._review_cache.claim(
+                    content_hash=claimed.file_content_hash,
+                    options=self._get_cache_options(),
+                )
+            return True
+
+        if self._review_cache.claim(
+            content_hash=review.file_content_hash, options=self._get_cache_options()
+        ):
+            return True
+
+        logger.info(f"{review.name} claimed by another job, waiting for its review")
+        self._awaited.append(review)
+        return False
+
+    def _start_lease_renewal(self) -> None:
+        """
+        Renews the leases of this job on the review cache while it runs, so
+        they last as long as the reviews, however throttled the run is.
+        """
+        if self._review_cache is None:
+            return
+
+        self._lease_renewal = threading.Event()
+        threading.Thread(
+            target=self._renew_leases,
+            args=(self._lease_renewal, self._review_cache.get_lease_seconds() / 3),
+            name=f"{APPLICATION_NAME}-leases",
+            daemon=True,
+        ).start()
+
+    def _renew_leases(self, stopped: threading.Event, interval: float) -> None:
+        while not stopped.wait(interval):
+            try:
+                self._review_cache.renew_all()
+            except sqlite3.Error as e:
+                logger.warning(f"Leases of the review cache not renewed: {e}")
+
+    def _release_leases(self) -> None:
+        self._awaited = []
+        if self._lease_renewal is not None:
+            self._lease_renewal.set()
+        if self._review_cache is not None:
+            self._review_cache.release_all()
+
+    def _sleep(self, seconds: float) -> None:
+        if self._deadline is not None:
+            self._deadline.sleep(seconds)
+        else:
+            time.sleep(seconds)
+
+    def _get_cache_options(self) -> Dict:
+        """
+        Options changing what is sent for a file, or the conversation it is
+        reviewed in, part of the cache key.
+        """
+        return {
+            "minimize": self._minimize,
+            "chunk_size": self._chunk_size,
+            "pack_size": self._pack_size,
+            "conversation_mode": self._conversation_mode,
+        }
+
+    def _split_large_files(self, file_reviews: List[FileReview]) -> List[FileReview]:
+        """
+        Replaces each file bigger than the chunk size by a review of each of
+        its chunks, so a big file is reviewed in parallel instead of being
+        the last review of the run.
+        """
+        self._chunks = {}
+        if self._chunk_size <= 0:
+            return file_reviews
+
+        reviews = []
+        for review in file_reviews:
+            chunks = split_content(
+                content=review.content, file_name=review.name, max_size=self._chunk_size
+            )
+            if len(chunks) == 1:
+                reviews.append(review)
+                continue
+
+            chunk_reviews = []
+            for first_line, content in chunks:
+                last_line = first_line + max(0, len(content.splitlines()) - 1)
+                chunk_reviews.append(
+                    FileReview(
+                        name=f"{review.name} (lines {first_line}-{last_line})",
+                        content=content,
+                        parent=review,
+                        first_line=first_line,
+                    )
+                )
+
+            logger.info(f"{review.name} split in {len(chunk_reviews)} chunks")
+            self._chunks[review.name] = chunk_reviews
+            reviews.extend(chunk_reviews)
+
+        return reviews
+
+    def _pack_small_files(self, file_reviews: List[FileReview]) -> List[FileReview]:
+        """
+        Replaces the files smaller than the pack size by packs of files sent
+        in one execution, so the cost of each execution (its creation and
+        the wait for the first callback check) is paid once per pack.
+        """
+        self._packs = {}
+        if self._pack_size <= 0:
+            return file_reviews
+
+        reviews = []
+        small_reviews = []
+        for review in file_reviews:
+            if (
+                review.parent is None
+                and review.get_size() < self._pack_size
+                and review.name not in self._unpackable
+            ):
+                small_reviews.append(review)
+            else:
+                reviews.append(review)
+
+        for members in pack_files(file_reviews=small_reviews, max_size=self._pack_size):
+            if len(members) == 1:
+                reviews.append(members[0])
+                continue
+
+            pack = FileReview(
+                name=f"{members[0].name} and {len(members) - 1} more files",
+                content=join_files(
+                    files=[(member.name, member.content) for member in members]
+                ),
+            )
+            self._packs[pack.name] = members
+            reviews.append(pack)
+
+        packed = sum(len(members) for members in self._packs.values())
+        logger.info(f"{packed} small files packed in {len(self._packs)} executions")
+
+        return reviews
+
+    def _unpack(self, pack: FileReview, members: List[FileReview]) -> None:
+        """
+        Splits the review of a pack by file. When the review has not kept
+        the file headings, its files are submitted again alone, in the next
+        round of the run, so they go through the engine like any other file.
+        """
+        reviews = split_review(
+            review=pack.llm_review, names=[member.name for member in members]
+        )
+
+        if reviews is None:
+            logger.warning(
+                f"Review of {pack.name} could not be split by file, "
+                f"reviewing its files alone"
+            )
+            with self._lock:
+                self._unpackable.update(member.name for member in members)
+                self._resubmitted.extend(members)
+            return
+
+        for member in members:
+            member.llm_review = reviews[member.name]
+            member.execution_id = pack.execution_id
+            member.conversation_id = pack.conversation_id
+            self._complete_review(review=member)
+
+    def _take_resubmitted(self) -> List[FileReview]:
+        with self._lock:
+            resubmitted, self._resubmitted = self._resubmitted, []
+
+        return resubmitted
+
+    def _get_file_names(self, review: FileReview) -> List[str]:
+        return [
+            file_review.name
+            for member in self._packs.get(review.name, [review])
+            for file_review in [member] + self._duplicates.get(member.name, [])
+        ]
+
+    def _join_chunks(self, review: FileReview) -> Optional[FileReview]:
+        """
+        Joins the reviews of the chunks into the review of their file once
+        every chunk is reviewed, the line numbers they mention are moved to
+        their place in the file. None while chunks are missing.
+        """
+        parent = review.parent
+
+        with self._lock:
+            chunks = self._chunks[parent.name]
+            if parent.llm_review or any(not chunk.llm_review for chunk in chunks):
+                return None
+
+            parent.llm_review = "\n\n".join(
+                f"Lines {chunk.first_line}-{chunk.get_last_line()}:\n\n"
+                f"{shift_line_numbers(chunk.llm_review, offset=chunk.first_line - 1)}"
+                for chunk in chunks
+            )
+
+        return parent
+
+    def _open_conversation(self, file_reviews: List[FileReview]) -> List[FileReview]:
+        """
+        Prepares the conversation shared by the reviews, returning the reviews
+        that still have to be processed.
+
+        - independent: every file gets its own conversation, nothing waits.
+        - upfront: the first execution is created and only its conversation id
+          is awaited, every review (including the first) then runs in parallel.
+        - shared: the first file is fully reviewed before the others start.
+
+        Reviews already completed are left out. A review resumed in flight
+        opens the conversation with its execution instead of a new one, and
+        the first submission follows the deadline and the claims like any
+        other.
+        """
+        file_reviews = [review for review in file_reviews if not review.llm_review]
+        if len(file_reviews) == 0:
+            return file_reviews
+
+        opener = file_reviews[0]
+        if self._conversation_mode == CONVERSATION_SHARED:
+            try:
+                self.process_review(review=opener)
+            except (KeyboardInterrupt, SystemExit):
+                raise
+            except BaseException as e:
+                self._add_failed(review=opener, error=e)
+            pending_reviews = file_reviews[1:]
+        elif self._conversation_mode == CONVERSATION_UPFRONT:
+            if not opener.execution_id and not self._allows_submission(review=opener):
+                return file_reviews[1:]
+
+            if not opener.execution_id:
+                try:
+                    self._send_to_ai(review=opener)
+                except (KeyboardInterrupt, SystemExit):
+                    raise
+                except BaseException as e:
+                    self._add_failed(review=opener, error=e)
+                    return file_reviews[1:]
+
+            try:
+                opener.conversation_id = (
+                    self._stk_callback_service.find_conversation_id(
+                        execution_id=opener.execution_id, deadline=self._deadline
+                    )
+                )
+            except DeadlineExceededError:
+                logger.warning("Deadline reached before the conversation was opened")
+                return file_reviews
+            except (KeyboardInterrupt, SystemExit):
+                raise
+            except BaseException as e:
+                # The opener is polled with the others, each in its conversation
+                logger.warning(f"Conversation not opened: {e}")
+                return file_reviews
+            pending_reviews = file_reviews
+        else:
+            return file_reviews
+
+        if not opener.conversation_id:
+            return pending_reviews
+
+        logger.info(f"Sharing conversation {opener.conversation_id}")
+
+        for file_review in file_reviews[1:]:
+            file_review.conversation_id = opener.conversation_id
+
+        return pending_reviews
+
+    def _record_polling(self, review: FileReview, callback_response: dict) -> None:
+        self._summary.record_polling(
+            name=review.name,
+            polls=callback_response.get("polls"),
+            time_to_result=callback_response.get("time_to_result"),
+        )
+
+    def _submit(self, review: FileReview) -> None:
+        if self._allows_submission(review=review):
+            self._send_to_ai(review=review)
+
+    def _allows_submission(self, review: FileReview) -> bool:
+        """
+        New executions stop when the deadline gets close, leaving the rest
+        of it to the executions already in flight. Contents claimed by
+        another job are not submitted either.
+        """
+        if self._deadline is None or self._deadline.allows_submission():
+            return self._claim(review=review)
+
+        logger.warning(f"Deadline is close, skipping {review.name}")
+        self._summary.skipped.extend(self._get_file_names(review=review))
+        return False
+
+    def _add_timed_out(self, review: FileReview) -> None:
+        logger.warning(f"Deadline reached before the review of {review.name}")
+        self._summary.timed_out.extend(self._get_file_names(review=review))
+
+    def _add_not_completed(self, review: FileReview) -> None:
+        """
+        Lists a review missing from a batch of callbacks as timed out when
+        the deadline was reached, as failed otherwise.
+        """
+        if self._deadline is not None and self._deadline.is_expired():
+            self._add_timed_out(review=review)
+            return
+
+        logger.error(f"Review of {review.name} failed")
+        self._summary.failed.extend(self._get_file_names(review=review))
+
+    def _add_failed(self, review: FileReview, error: BaseException) -> None:
+        """
+        Failure policy shared by the engines: the review is listed on the
+        summary and the other files go on.
+        """
+        logger.error(f"Error reviewing {review.name}: {error}")
+        self._add_not_completed(review=review)
+
     def _send_to_ai(self, review: FileReview) -> None:
         logger.info(f"Sending file: {review.name} for processing")
+        review.submitted_at = time.time()
         execution_id = self._stk_execution_service.create(
-            file_content=review.content, conversation_id=review.conversation_id
+            file_content=self._get_upload_content(review=review),
+            conversation_id=review.conversation_id,
         )
         review.execution_id = execution_id
         logger.info(f"Execution created {review.execution_id}")
 
+        if self._journal is not None:
+            self._journal.record_submitted(review=review)
+
+    def _get_upload_content(self, review: FileReview) -> str:
+        """
+        Content sent to STK AI, minimized when enabled. The review keeps the
+        original content, so its hash and the journal are not affected.
+        """
+        members = self._packs.get(review.name)
+        if members is not None:
+            return join_files(
+                files=[
+                    (member.name, self._get_upload_content(review=member))
+                    for member in members
+                ]
+            )
+
+        if not self._minimize:
+            return review.content
+
+        content = minimize(
+            content=review.content, file_name=(review.parent or review).name
+        )
+        self._summary.record_minimization(
+            name=review.name,
+            original=review.get_size(),
+            minimized=len(content.encode("utf-8")),
+        )
+
+        return content
+
     def _find_callback_review(self, review: FileReview) -> None:
         logger.info(f"Fetching response for file: {review.name} completed")
 
-        callback_response: dict = self._stk_callback_service.find(
-            execution_id=review.execution_id
+        if self._stk_callback_poller is not None:
+            callback_response: dict = self._stk_callback_poller.find(
+                execution_id=review.execution_id, deadline=self._deadline
+            )
+        else:
+            callback_response: dict = self._stk_callback_service.find(
+                execution_id=review.execution_id, deadline=self._deadline
+            )
+
+        self._apply_callback(review=review, callback_response=callback_response)
+
+    async def _find_callback_review_async(self, review: FileReview) -> None:
+        logger.info(f"Fetching response for file: {review.name} completed")
+
+        if self._stk_callback_poller is not None:
+            callback_response: dict = await asyncio.wrap_future(
+                self._stk_callback_poller.submit(
+                    execution_id=review.execution_id, deadline=self._deadline
+                )
+            )
+        else:
+            callback_response: dict = await asyncio.to_thread(
+                self._stk_callback_service.find,
+                execution_id=review.execution_id,
+                deadline=self._deadline,
+            )
+
+        self._apply_callback(review=review, callback_response=callback_response)
+
+    def _poll(self, review: FileReview, polling_executor=None) -> Future:
+        """
+        Future of the callback of the review. The poller resolves it without
+        holding a thread per execution, without a poller it is awaited on one
+        of the threads of `polling_executor`.
+        """
+        logger.info(f"Fetching response for file: {review.name} completed")
+
+        if self._stk_callback_poller is not None:
+            return self._stk_callback_poller.submit(
+                execution_id=review.execution_id, deadline=self._deadline
+            )
+
+        return polling_executor.submit(
+            self._stk_callback_service.find,
+            execution_id=review.execution_id,
+            deadline=self._deadline,
         )
 
+    def _create_polling_executor(self) -> Optional[ThreadPoolExecutor]:
+        if self._stk_callback_poller is not None:
+            return None
+
+        return ThreadPoolExecutor(
+            max_workers=self._concurrency,
+            thread_name_prefix=f"{APPLICATION_NAME}-polling",
+        )
+
+    def _apply_callback(self, review: FileReview, callback_response: dict) -> None:
         review.llm_review = callback_response["review"]
         review.conversation_id = callback_response["conversation_id"]
+        self._record_polling(review=review, callback_response=callback_response)
+
+        # Server clock against ours, the adaptive controller compares its rise
+        started_at = callback_response.get("started_at")
+        if started_at is not None and review.submitted_at is not None:
+            review.queue_time = started_at - review.submitted_at
 
         logger.info(f"Execution of file: {review.name} completed")
 
+    def run_queue(self, work_queue: WorkQueue, worker_id: str) -> int:
+        """
+        Reviews the files leased from a work queue shared with other
+        processes until it has nothing left to lease. Returns the number of
+        files reviewed by this process.
+        """
+        logger.info(f"Worker {worker_id} draining the work queue")
+
+        executor = ThreadPoolExecutor(
+            max_workers=self._concurrency, thread_name_prefix=APPLICATION_NAME
+        )
+        self._start_lease_renewal()
+        try:
+            futures = [
+                executor.submit(self._drain_queue, work_queue, f"{worker_id}-{index}")
+                for index in range(self._concurrency)
+            ]
+
+            return sum(future.result() for future in as_completed(futures))
+        finally:
+            executor.shutdown(cancel_futures=True)
+            self._release_leases()
+            logger.info(f"Worker {worker_id} finished")
+
+    def _drain_queue(self, work_queue: WorkQueue, worker_id: str) -> int:
+        reviewed = 0
+
+        while True:
+            review = work_queue.lease(worker_id=worker_id)
+            if review is None:
+                return reviewed
+
+            try:
+                self.process_review(review=review)
+            except (KeyboardInterrupt, SystemExit):
+                raise
+            except BaseException as e:
+                # Another attempt is left to the next lease of the review
+                logger.error(f"Review of {review.name} failed: {e}")
+                work_queue.fail(review=review, worker_id=worker_id, error=e)
+                continue
+
+            if work_queue.complete(review=review, worker_id=worker_id):
+                reviewed += 1
+
     def _run_parallel(self, file_reviews: List[FileReview]):
-        pool = Pool(cpu_count())
+        """
+        Reviews the files on a thread pool. The work is bound by the STK AI
+        network calls, so the number of workers follows the configured
+        concurrency instead of the number of cores, and all workers share the
+        services (and their token cache) of this process.
+
+        The workers only submit the executions and store their results: the
+        poller resolves a future per execution in flight and its completion
+        hands the review back to the pool, so a file waiting for its callback
+        keeps a slot of the concurrency but no worker.
+        """
+        controller = self._create_concurrency_controller()
+        slots = threading.BoundedSemaphore(self._concurrency)
+        executor = ThreadPoolExecutor(
+            max_workers=self._concurrency, thread_name_prefix=APPLICATION_NAME
+        )
+        polling_executor = self._create_polling_executor()
         try:
-            pool.map(self.process_review, [review for review in file_reviews])
+            futures: Dict[Future, FileReview] = {}
+            for review in file_reviews:
+                if controller is not None:
+                    started_at = controller.acquire()
+                else:
+                    slots.acquire()
+                    started_at = None
+
+                done = Future()
+                done.add_done_callback(
+                    partial(
+                        self._release_slot,
+                        controller=controller,
+                        slots=slots,
+                        started_at=started_at,
+                    )
+                )
+                futures[done] = review
+                executor.submit(
+                    self._start_review, review, done, executor, polling_executor
+                )
+
+            for future in as_completed(futures):
+                error = future.exception()
+                if error is None:
+                    continue
 
-        except Exception:
-            logger.exception("Multiprocessing error")
+                if isinstance(error, (KeyboardInterrupt, SystemExit)):
+                    raise error
+
+                self._add_failed(review=futures[future], error=error)
+        except BaseException:
+            logger.exception("Review execution error")
             raise
         finally:
             logger.info("Review execution ended!")
-            pool.close()
+            executor.shutdown(cancel_futures=True)
+            if polling_executor is not None:
+                polling_executor.shutdown(cancel_futures=True)
+            self._close_concurrency_controller(controller=controller)
+
+    def _start_review(
+        self,
+        review: FileReview,
+        done: Future,
+        executor: ThreadPoolExecutor,
+        polling_executor: ThreadPoolExecutor = None,
+    ) -> None:
+        """
+        Submits the review and leaves its callback to the poller, the review
+        is finished on `executor` once the callback arrives.
+        """
+        started_at = time.monotonic()
+        try:
+            if not review.execution_id:
+                if not self._allows_submission(review=review):
+                    done.set_result(None)
+                    return
+                self._send_to_ai(review=review)
+
+            polling = self._poll(review=review, polling_executor=polling_executor)
+        except BaseException as e:
+            done.set_exception(e)
+            return
+
+        polling.add_done_callback(
+            lambda future: executor.submit(
+                self._finish_review, review, future, done, started_at
+            )
+        )
+
+    def _finish_review(
+        self, review: FileReview, polling: Future, done: Future, started_at: float
+    ) -> None:
+        try:
+            self._apply_callback(review=review, callback_response=polling.result())
+            review.elapsed = time.monotonic() - started_at
+            self._store_temp_review(review=review)
+        except DeadlineExceededError:
+            self._add_timed_out(review=review)
+        except BaseException as e:
+            done.set_exception(e)
+            return
+
+        done.set_result(review.queue_time)
+
+    @staticmethod
+    def _release_slot(
+        done: Future, controller=None, slots=None, started_at: float = None
+    ) -> None:
+        if controller is None:
+            slots.release()
+            return
+
+        if done.exception() is None:
+            controller.on_success(started_at=started_at, queue_time=done.result())
+        else:
+            controller.on_error(started_at=started_at, error=done.exception())
+        controller.release()
+
+    def _run_two_phase(self, file_reviews: List[FileReview]):
+        """
+        Submits every file first and only then polls the results, so the
+        server processes all the files at the same time and the run takes
+        about as long as the slowest execution.
+        """
+        if len(file_reviews) == 0:
+            return
+
+        controller = self._create_concurrency_controller()
+        executor = ThreadPoolExecutor(
+            max_workers=self._concurrency, thread_name_prefix=APPLICATION_NAME
+        )
+        try:
+            futures = [
+                executor.submit(self._run_controlled, self._submit, review, controller)
+                for review in file_reviews
+                if not review.execution_id
+            ]
+
+            for future in as_completed(futures):
+                future.result()
+        except BaseException:
+            logger.exception("Review submission error")
+            raise
+        finally:
+            executor.shutdown(cancel_futures=True)
+            self._close_concurrency_controller(controller=controller)
+
+        submitted_reviews = [review for review in file_reviews if review.execution_id]
+        logger.info(f"{len(submitted_reviews)} executions created, fetching responses")
+
+        callbacks = self._find_all(file_reviews=submitted_reviews)
+
+        for review in submitted_reviews:
+            if review.execution_id not in callbacks:
+                self._add_not_completed(review=review)
+                continue
+
+            self._apply_callback(
+                review=review, callback_response=callbacks[review.execution_id]
+            )
+
+            self._store_temp_review(review=review)
+
+        logger.info("Review execution ended!")
+
+    def _find_all(self, file_reviews: List[FileReview]) -> Dict:
+        """
+        Hands every execution to the poller and waits for all of them,
+        leaving out the ones not completed before the deadline.
+        """
+        polling_executor = self._create_polling_executor()
+        try:
+            futures = {
+                self._poll(
+                    review=review, polling_executor=polling_executor
+                ): review.execution_id
+                for review in file_reviews
+            }
+
+            return self._collect_callbacks(futures=futures)
+        finally:
+            if polling_executor is not None:
+                polling_executor.shutdown(cancel_futures=True)
 
     @staticmethod
-    def _store_temp_review(review: FileReview):
+    def _collect_callbacks(futures: Dict[Future, str]) -> Dict:
+        callbacks = {}
+        for future in as_completed(futures):
+            try:
+                callbacks[futures[future]] = future.result()
+            except DeadlineExceededError:
+                logger.warning(f"Deadline reached, {futures[future]} still pending")
+            except (KeyboardInterrupt, SystemExit):
+                raise
+            except BaseException as e:
+                logger.error(f"Error fetching result for {futures[future]}: {e}")
+
+        return callbacks
+
+    def _create_concurrency_controller(self):
+        if not self._adaptive_concurrency:
+            return None
+
+        controller = AdaptiveConcurrencyController(max_limit=self._concurrency)
+        if self._retry_policy is not None:
+            self._retry_policy.add_throttle_listener(controller.on_throttle)
+
+        return controller
+
+    def _run_controlled(self, function, review: FileReview, controller=None):
+        """
+        Runs one step of a review inside a slot of the adaptive controller,
+        feeding it with the latency or the error of the step. An error only
+        fails that review, on a rate limit or server error the controller
+        also backs off for the rest of the run.
+        """
+        started_at = controller.acquire() if controller is not None else None
+        try:
+            function(review=review)
+        except (KeyboardInterrupt, SystemExit):
+            raise
+        except BaseException as e:
+            if controller is not None:
+                controller.on_error(started_at=started_at, error=e)
+            self._add_failed(review=review, error=e)
+        else:
+            if controller is not None:
+                controller.on_success(started_at=started_at)
+        finally:
+            if controller is not None:
+                controller.release()
+
+    def _close_concurrency_controller(self, controller=None):
+        if controller is None:
+            return
+
+        if self._retry_policy is not None:
+            self._retry_policy.remove_throttle_listener(controller.on_throttle)
+
+        logger.info(
+            f"Adaptive concurrency reached {controller.get_max_in_flight()} "
+            f"executions in flight, final limit {controller.get_limit()}, "
+            f"{controller.get_throttled()} rate limits"
+        )
+
+    def _store_temp_review(self, review: FileReview):
         file_name = f"{review.execution_id}"
         llm_review = "".join((f"File name: {review.name} \n\n", review.llm_review))
-        create_file_and_directory(TEMP_PATH, file_name, llm_review)
+        path = create_file_and_directory(TEMP_PATH_REVIEW, file_name, llm_review)
+
+        if self._journal is not None:
+            self._journal.record_completed(review=review, result=path)
+
+        self._complete_review(review=review)
+
+    def _complete_review(self, review: FileReview) -> None:
+        """
+        Hands a finished review to the review cache and the report, once per
+        file: packs are split and chunks joined first, and the review is
+        copied to the files with the same content.
+        """
+        members = self._packs.get(review.name)
+        if members is not None:
+            self._unpack(pack=review, members=members)
+            return
+
+        if review.parent is not None:
+            review = self._join_chunks(review=review)
+
+        if review is None:
+            return
+
+        # Executions that ended without a result are submitted again next run
+        if (
+            self._review_cache is not None
+            and INVALID_STATUS_REVIEW not in review.llm_review
+        ):
+            self._review_cache.put(
+                content_hash=review.file_content_hash,
+                review=review.llm_review,
+                options=self._get_cache_options(),
+            )
+
+        if self._report_writer is not None:
+            self._report_writer.write(review=review)
+
+        self._copy_to_duplicates(review=review)
 
 
 __all__ = ["ReviewerService"]
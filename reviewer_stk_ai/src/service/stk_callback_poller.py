@@ -0,0 +1,220 @@
+import heapq
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Tuple
+
+from reviewer_stk_ai.src.config.env_config import EnvConfig
+from reviewer_stk_ai.src.exceptions.deadline_exceeded_error import (
+    DeadlineExceededError,
+)
+from reviewer_stk_ai.src.service.stk_callback_service import StkCallbackService
+from reviewer_stk_ai.src.utils.constants import APPLICATION_NAME, DEFAULT_CONCURRENCY
+from reviewer_stk_ai.src.utils.deadline import Deadline
+from reviewer_stk_ai.src.utils.poll_strategy import PollStrategy
+
+logger = logging.getLogger(APPLICATION_NAME)
+
+
+class _PendingExecution:
+    def __init__(self, execution_id: str, future: Future, deadline: Deadline = None):
+        self.execution_id = execution_id
+        self.future = future
+        self.deadline = deadline
+        self.started_at = time.monotonic()
+        self.attempt = 0
+
+
+class StkCallbackPoller:
+    """
+    Polls every pending execution from a single scheduler thread.
+
+    The executions wait in a heap ordered by the time of their next check.
+    Due checks run on at most `max_connections` fetch threads sharing the
+    pooled HTTP client of the callback service, so thousands of pending
+    executions cost one thread and a bounded number of sockets. Each
+    execution follows the poll strategy and the polling budget of
+    StkCallbackService.find, and its future is resolved with the same
+    callback.
+
+    Attributes:
+        max_connections (int): Checks in flight and sockets kept open.
+    """
+
+    _stk_callback_service: StkCallbackService
+    _retry_count_callback: int
+    _retry_timeout: int
+    _poll_strategy: PollStrategy
+    _max_connections: int
+    _condition: threading.Condition
+    _heap: List[Tuple[float, int, _PendingExecution]]
+    _in_flight: int
+    _closed: bool
+    _thread: threading.Thread = None
+
+    def __init__(
+        self,
+        env_config: EnvConfig = None,
+        stk_callback_service: StkCallbackService = None,
+        max_connections: int = DEFAULT_CONCURRENCY,
+        poll_strategy: PollStrategy = None,
+    ):
+        self._stk_callback_service = stk_callback_service
+        self._retry_count_callback = int(env_config.get_stk_retry_count_callback())
+        self._retry_timeout = int(env_config.get_stk_retry_timeout())
+        self._poll_strategy = poll_strategy or PollStrategy(
+            max_delay=self._retry_timeout
+        )
+        self._max_connections = max(1, max_connections)
+        self._condition = threading.Condition()
+        self._heap = []
+        self._sequence = itertools.count()
+        self._in_flight = 0
+        self._closed = False
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=self._max_connections,
+            thread_name_prefix=f"{APPLICATION_NAME}-poller",
+        )
+
+    def submit(self, execution_id: str, deadline: Deadline = None) -> Future:
+        """
+        Adds the execution to the poller, the future is resolved with its
+        callback once it completes.
+        """
+        future = Future()
+        self._schedule(
+            execution=_PendingExecution(
+                execution_id=execution_id, future=future, deadline=deadline
+            ),
+            delay=0.0,
+        )
+        self._start()
+
+        return future
+
+    def find(self, execution_id: str, deadline: Deadline = None) -> Dict:
+        """
+        Same contract as StkCallbackService.find.
+        """
+        return self.submit(execution_id=execution_id, deadline=deadline).result()
+
+    def get_pending(self) -> int:
+        with self._condition:
+            return len(self._heap) + self._in_flight
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+        for _, _, execution in self._heap:
+            execution.future.cancel()
+
+    def _start(self) -> None:
+        with self._condition:
+            if self._thread is not None or self._closed:
+                return
+
+            self._thread = threading.Thread(
+                target=self._run, name=f"{APPLICATION_NAME}-scheduler", daemon=True
+            )
+            self._thread.start()
+
+    def _schedule(self, execution: _PendingExecution, delay: float) -> None:
+        with self._condition:
+            heapq.heappush(
+                self._heap,
+                (time.monotonic() + delay, next(self._sequence), execution),
+            )
+            self._condition.notify_all()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                execution = self._next_due()
+                if execution is None:
+                    return
+
+                self._in_flight += 1
+
+            self._executor.submit(self._check, execution)
+
+    def _next_due(self):
+        """
+        Waits for the next execution due with a free connection, None when
+        the poller is closed.
+        """
+        while not self._closed:
+            if len(self._heap) == 0 or self._in_flight >= self._max_connections:
+                self._condition.wait()
+                continue
+
+            wait = self._heap[0][0] - time.monotonic()
+            if wait > 0:
+                self._condition.wait(timeout=wait)
+                continue
+
+            return heapq.heappop(self._heap)[2]
+
+        return None
+
+    def _check(self, execution: _PendingExecution) -> None:
+        try:
+            if execution.deadline is not None and execution.deadline.is_expired():
+                raise DeadlineExceededError("Run deadline reached")
+
+            execution.attempt += 1
+            callback, percentage = self._stk_callback_service.check_progress(
+                execution_id=execution.execution_id
+            )
+
+            if callback is not None:
+                callback["polls"] = execution.attempt
+                callback["time_to_result"] = time.monotonic() - execution.started_at
+                execution.future.set_result(callback)
+                return
+
+            if not self._can_poll(execution=execution):
+                logger.error(
+                    f"Error fetching result for {execution.execution_id}: "
+                    f"attempts exhausted"
+                )
+                raise ValueError("Maximum number of attempts reached")
+
+            self._schedule(
+                execution=execution,
+                delay=self._get_delay(execution=execution, percentage=percentage),
+            )
+        except BaseException as e:
+            execution.future.set_exception(e)
+        finally:
+            with self._condition:
+                self._in_flight -= 1
+                self._condition.notify_all()
+
+    def _get_delay(self, execution: _PendingExecution, percentage) -> float:
+        delay = self._poll_strategy.get_delay(
+            attempt=execution.attempt,
+            elapsed=time.monotonic() - execution.started_at,
+            percentage=percentage,
+        )
+
+        if execution.deadline is not None:
+            delay = min(delay, execution.deadline.get_remaining())
+
+        return delay
+
+    def _can_poll(self, execution: _PendingExecution) -> bool:
+        if execution.attempt < self._retry_count_callback:
+            return True
+
+        budget = self._retry_count_callback * self._retry_timeout
+        return time.monotonic() - execution.started_at < budget
+
+
+__all__ = ["StkCallbackPoller"]
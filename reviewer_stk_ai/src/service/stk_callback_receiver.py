@@ -0,0 +1,315 @@
+import heapq
+import hmac
+import itertools
+import json
+import logging
+import secrets
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Tuple
+
+from reviewer_stk_ai.src.service.stk_callback_poller import StkCallbackPoller
+from reviewer_stk_ai.src.service.stk_callback_service import StkCallbackService
+from reviewer_stk_ai.src.utils.constants import (
+    APPLICATION_NAME,
+    DEFAULT_CALLBACK_RECEIVER_TIMEOUT,
+)
+from reviewer_stk_ai.src.utils.deadline import Deadline
+
+logger = logging.getLogger(APPLICATION_NAME)
+
+CALLBACK_PATH = "/callback"
+# Notifications kept for executions not submitted yet
+MAX_RECEIVED = 1000
+MAX_NOTIFICATION_BYTES = 10 * 1024 * 1024
+
+
+class _Subscription:
+    def __init__(self, future: Future, deadline: Deadline = None):
+        self.future = future
+        self.deadline = deadline
+        self.started_at = time.monotonic()
+
+
+class _NotificationHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        path = self.path.split("?")[0].rstrip("/")
+        if path != CALLBACK_PATH and not path.startswith(CALLBACK_PATH + "/"):
+            self._reply(status=404)
+            return
+
+        token, _, execution_id = path[len(CALLBACK_PATH) + 1 :].partition("/")
+        if not self.server.receiver.is_authorized(token=token):
+            logger.warning("Callback notification with an invalid token rejected")
+            self._reply(status=403)
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            if length > MAX_NOTIFICATION_BYTES:
+                self._reply(status=413)
+                return
+
+            execution_data = json.loads(self.rfile.read(length) or b"{}")
+            execution_id = execution_id or execution_data.get("execution_id")
+            if not execution_id:
+                raise ValueError("Execution id not informed")
+
+            self.server.receiver.notify(
+                execution_id=execution_id, execution_data=execution_data
+            )
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            logger.warning(f"Invalid callback notification: {e}")
+            self._reply(status=400)
+            return
+
+        self._reply(status=204)
+
+    def log_message(self, format, *args):
+        logger.debug(f"Callback receiver: {format % args}")
+
+    def _reply(self, status: int) -> None:
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+
+class StkCallbackReceiver:
+    """
+    Receives the completion of the executions on a local HTTP listener
+    instead of polling for them.
+
+    STK AI posts the execution data, in the format of the callback API, to
+    `<url>/<execution_id>` or to `<url>` with its `execution_id`. The URL
+    ends with a random token of the run, notifications without it are
+    rejected. An execution not notified within `timeout` seconds, or before
+    its deadline, falls back to the poller, so a lost notification only costs
+    the wait. Notifications of executions not submitted yet are kept for
+    `timeout` seconds, up to MAX_RECEIVED of them. Same contract as
+    StkCallbackPoller.submit and find.
+
+    Attributes:
+        host (str): Address the listener binds to.
+        port (int): Port of the listener, 0 picks a free one.
+        timeout (int): Seconds to wait for a notification before polling.
+        public_url (str): URL sent to STK AI, when the listener is reached
+            through a proxy or another host name.
+        token (str): Secret ending the URL, a random one by default.
+    """
+
+    _stk_callback_service: StkCallbackService
+    _fallback: StkCallbackPoller
+    _host: str
+    _port: int
+    _timeout: int
+    _public_url: str
+    _token: str
+    _condition: threading.Condition
+    _pending: Dict[str, _Subscription]
+    # Callbacks by execution id, with the moment they were received
+    _received: Dict[str, Tuple[float, Dict]]
+    _heap: List[Tuple[float, int, str, _Subscription]]
+    _closed: bool
+    _server: ThreadingHTTPServer = None
+
+    def __init__(
+        self,
+        stk_callback_service: StkCallbackService = None,
+        fallback: StkCallbackPoller = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        timeout: int = DEFAULT_CALLBACK_RECEIVER_TIMEOUT,
+        public_url: str = None,
+        token: str = None,
+    ):
+        self._stk_callback_service = stk_callback_service
+        self._fallback = fallback
+        self._host = host
+        self._port = port
+        self._timeout = timeout
+        self._public_url = public_url
+        self._token = token or secrets.token_urlsafe(16)
+        self._condition = threading.Condition()
+        self._pending = {}
+        self._received = {}
+        self._heap = []
+        self._sequence = itertools.count()
+        self._closed = False
+
+    def start(self) -> "StkCallbackReceiver":
+        self._server = ThreadingHTTPServer(
+            (self._host, self._port), _NotificationHandler
+        )
+        self._server.daemon_threads = True
+        self._server.receiver = self
+        self._port = self._server.server_address[1]
+
+        threading.Thread(
+            target=self._server.serve_forever,
+            name=f"{APPLICATION_NAME}-receiver",
+            daemon=True,
+        ).start()
+        threading.Thread(
+            target=self._run, name=f"{APPLICATION_NAME}-receiver-timeout", daemon=True
+        ).start()
+
+        logger.info(f"Listening for execution callbacks on {self.get_url()}")
+        return self
+
+    def get_url(self) -> str:
+        url = self._public_url or f"http://{self._host}:{self._port}{CALLBACK_PATH}"
+        return f"{url.rstrip('/')}/{self._token}"
+
+    def is_authorized(self, token: str) -> bool:
+        return hmac.compare_digest(token.encode(), self._token.encode())
+
+    def submit(self, execution_id: str, deadline: Deadline = None) -> Future:
+        """
+        Waits for the notification of the execution, the future is resolved
+        with its callback.
+        """
+        subscription = _Subscription(future=Future(), deadline=deadline)
+
+        with self._condition:
+            received = self._received.pop(execution_id, None)
+            callback = received[1] if received is not None else None
+
+            if callback is None:
+                expires_at = subscription.started_at + self._timeout
+                if deadline is not None:
+                    expires_at = min(
+                        expires_at, subscription.started_at + deadline.get_remaining()
+                    )
+
+                self._pending[execution_id] = subscription
+                heapq.heappush(
+                    self._heap,
+                    (expires_at, next(self._sequence), execution_id, subscription),
+                )
+                self._condition.notify_all()
+
+        if callback is not None:
+            self._resolve(subscription=subscription, callback=callback)
+
+        return subscription.future
+
+    def find(self, execution_id: str, deadline: Deadline = None) -> Dict:
+        """
+        Same contract as StkCallbackService.find.
+        """
+        return self.submit(execution_id=execution_id, deadline=deadline).result()
+
+    def notify(self, execution_id: str, execution_data: Dict) -> None:
+        """
+        Delivers the data of an execution, notifications of executions still
+        running are ignored.
+        """
+        callback = self._stk_callback_service.parse_callback(
+            execution_id=execution_id, execution_data=execution_data
+        )
+        if callback is None:
+            return
+
+        with self._condition:
+            subscription = self._pending.pop(execution_id, None)
+
+            if subscription is None:
+                # Notified before the execution id was returned to us, or
+                # an execution of another run
+                self._received.pop(execution_id, None)
+                self._evict_received()
+                self._received[execution_id] = (time.monotonic(), callback)
+                return
+
+        self._resolve(subscription=subscription, callback=callback)
+
+    def get_pending(self) -> int:
+        with self._condition:
+            return len(self._pending)
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+        for subscription in self._pending.values():
+            subscription.future.cancel()
+
+    def _evict_received(self) -> None:
+        """
+        Drops the notifications older than the timeout, and the oldest ones
+        beyond MAX_RECEIVED, so unknown executions do not pile up.
+        """
+        expired_at = time.monotonic() - self._timeout
+        for execution_id, (received_at, _) in list(self._received.items()):
+            if received_at > expired_at and len(self._received) < MAX_RECEIVED:
+                break
+            del self._received[execution_id]
+
+    @staticmethod
+    def _resolve(subscription: _Subscription, callback: Dict) -> None:
+        callback["polls"] = 0
+        callback["time_to_result"] = time.monotonic() - subscription.started_at
+        subscription.future.set_result(callback)
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                expired = self._next_expired()
+                if expired is None:
+                    return
+
+            execution_id, subscription = expired
+            logger.warning(
+                f"No callback received for {execution_id}, polling for its result"
+            )
+            self._fall_back(execution_id=execution_id, subscription=subscription)
+
+    def _next_expired(self):
+        """
+        Waits for the next execution not notified in time, None when the
+        receiver is closed.
+        """
+        while not self._closed:
+            if len(self._heap) == 0:
+                self._condition.wait()
+                continue
+
+            expires_at, _, execution_id, subscription = self._heap[0]
+            if self._pending.get(execution_id) is not subscription:
+                # Notified in time
+                heapq.heappop(self._heap)
+                continue
+
+            wait = expires_at - time.monotonic()
+            if wait > 0:
+                self._condition.wait(timeout=wait)
+                continue
+
+            heapq.heappop(self._heap)
+            del self._pending[execution_id]
+            return execution_id, subscription
+
+        return None
+
+    def _fall_back(self, execution_id: str, subscription: _Subscription) -> None:
+        def copy_outcome(fallback_future: Future):
+            if fallback_future.cancelled():
+                subscription.future.cancel()
+            elif fallback_future.exception() is not None:
+                subscription.future.set_exception(fallback_future.exception())
+            else:
+                subscription.future.set_result(fallback_future.result())
+
+        self._fallback.submit(
+            execution_id=execution_id, deadline=subscription.deadline
+        ).add_done_callback(copy_outcome)
+
+
+__all__ = ["StkCallbackReceiver"]
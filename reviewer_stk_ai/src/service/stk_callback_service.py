@@ -1,8 +1,9 @@
 import logging
 import time
+from datetime import datetime
+from typing import Dict, Optional, Tuple
 
 import requests
-from retrying import retry
 
 from reviewer_stk_ai.src.config.env_config import EnvConfig
 from reviewer_stk_ai.src.exceptions.authentication_error import AuthenticationError
@@ -10,12 +11,19 @@ from reviewer_stk_ai.src.exceptions.integration_contract_error import (
     IntegrationContractError,
 )
 from reviewer_stk_ai.src.exceptions.integration_error import IntegrationError
+from reviewer_stk_ai.src.exceptions.rate_limit_error import RateLimitError
 from reviewer_stk_ai.src.exceptions.service_permission_error import (
     ServicePermissionError,
 )
 from reviewer_stk_ai.src.service.stk_token_service import StkTokenService
-from reviewer_stk_ai.src.utils.constants import APPLICATION_NAME
-from reviewer_stk_ai.src.exceptions import retry_if_integration_error
+from reviewer_stk_ai.src.utils.constants import (
+    APPLICATION_NAME,
+    INVALID_STATUS_REVIEW,
+)
+from reviewer_stk_ai.src.utils.deadline import Deadline
+from reviewer_stk_ai.src.utils.http_client import HttpClient
+from reviewer_stk_ai.src.utils.poll_strategy import PollStrategy
+from reviewer_stk_ai.src.utils.rate_limiter import TokenBucketRateLimiter
 
 logger = logging.getLogger(APPLICATION_NAME)
 
@@ -25,102 +33,271 @@ class StkCallbackService:
     _url: str
     _retry_count_callback: int
     _retry_timeout: int
-    _proxies = None
+    _http_client: HttpClient
+    _rate_limiter: TokenBucketRateLimiter
+    _poll_strategy: PollStrategy
 
-    def __init__(self, env_config: EnvConfig = None, stk_token_service=None):
+    def __init__(
+        self,
+        env_config: EnvConfig = None,
+        stk_token_service=None,
+        rate_limiter: TokenBucketRateLimiter = None,
+        poll_strategy: PollStrategy = None,
+        http_client: HttpClient = None,
+    ):
         self._stk_token_service = stk_token_service
+        self._rate_limiter = rate_limiter or TokenBucketRateLimiter(rate=0)
         self._url = (
             env_config.get_host_stk_ai() + "/v1/quick-commands/callback/{execution_id}"
         )
         self._retry_count_callback = int(env_config.get_stk_retry_count_callback())
         self._retry_timeout = int(env_config.get_stk_retry_timeout())
-        self._proxies = env_config.get_proxies()
-
-    @retry(
-        retry_on_exception=retry_if_integration_error,
-        stop_max_attempt_number=3,
-        wait_exponential_multiplier=1000,
-        wait_exponential_max=5000,
-    )
-    def find(self, execution_id: str):
+        self._http_client = http_client or HttpClient(env_config=env_config)
+        self._poll_strategy = poll_strategy or PollStrategy(
+            max_delay=self._retry_timeout
+        )
+
+    def find(self, execution_id: str, deadline: Deadline = None):
+        """
+        Waits for the execution to complete, checking it as often as the
+        poll strategy says, for up to `retry_max_attempts` checks and
+        `retry_max_attempts * retry_timeout` seconds. The callback also
+        holds the number of checks ("polls") and the seconds until the
+        result ("time_to_result"). Raises DeadlineExceededError when the
+        deadline of the run is reached first.
+        """
         logger.info(f"Starting search for STK AI response")
-        url = self._url.format(execution_id=execution_id)
         headers = self._fill_headers()
 
         try:
-            with requests.Session() as client:
-                for attempt in range(self._retry_count_callback, 0, -1):
-                    time.sleep(self._retry_timeout)
+            started_at = time.monotonic()
+            attempt = 0
+            percentage = None
 
-                    response = client.request(
-                        "GET", url=url, headers=headers, proxies=self._proxies
-                    )
-
-                    if response.ok:
-                        execution_data = response.json()
-
-                        if execution_data["progress"]["status"] == "COMPLETED":
-                            logger.info(
-                                f"Execution {execution_id} was successfully completed"
-                            )
-
-                            return {
-                                "execution_id": execution_id,
-                                "conversation_id": execution_data["conversation_id"],
-                                "review": execution_data["result"],
-                            }
-                        elif execution_data["progress"]["status"] == "RUNNING":
-                            execution_percentage = (
-                                int(execution_data["progress"]["execution_percentage"])
-                                * 100
-                            )
-                            logger.info(
-                                f"Processing {execution_id} is {execution_percentage}% complete...."
-                            )
-                            continue
-                        else:
-                            logger.error(
-                                f"Progress status invalid",
-                                extra={"data": execution_data},
-                            )
-                            return {
-                                "execution_id": execution_id,
-                                "conversation_id": execution_data["conversation_id"],
-                                "review": f"Progress status invalid, try another execution later...{execution_id}",
-                            }
-
-                    response.raise_for_status()
-            raise ValueError("Maximum number of attempts reached")
-        except requests.exceptions.HTTPError as e:
-            logger.error("Failed to integrate with STK AI result")
-            response = e.response
-            if e.response.status_code == 400:
-                raise IntegrationContractError(
-                    f"API contract failure for STK AI result: {response.text}"
+            while self._can_poll(attempt=attempt, started_at=started_at):
+                self._sleep(
+                    seconds=self._poll_strategy.get_delay(
+                        attempt=attempt,
+                        elapsed=time.monotonic() - started_at,
+                        percentage=percentage,
+                    ),
+                    deadline=deadline,
                 )
+                attempt += 1
 
-            if e.response.status_code == 401:
-                raise AuthenticationError(
-                    f"Authentication failure with STK AI result API: {response.text}"
+                execution_data = self._request_execution(
+                    execution_id=execution_id, headers=headers
                 )
-
-            if e.response.status_code == 403:
-                raise ServicePermissionError(
-                    f"Permission failure with STK AI result API: {response.text}"
+                callback = self.parse_callback(
+                    execution_id=execution_id, execution_data=execution_data
                 )
 
-            if e.response.status_code >= 500:
-                raise IntegrationError(
-                    f"Failed to integrate with STK AI result API: status_code: {response.status_code}"
-                    f' message: {response.text or "No message"}'
-                )
-            raise
+                if callback is not None:
+                    return self._add_poll_statistics(
+                        callback=callback, polls=attempt, started_at=started_at
+                    )
+
+                percentage = self._get_execution_percentage(execution_data)
+
+            raise ValueError("Maximum number of attempts reached")
+        except requests.exceptions.HTTPError as e:
+            self._raise_integration_error(e)
         except Exception as e:
             logger.error(f"Error fetching result for {execution_id}: {e.args[0]}")
             raise
         finally:
             logger.info("Callback execution ended!")
 
+    def check(self, execution_id: str):
+        """
+        Checks the execution once, returning None while it is still running.
+        """
+        headers = self._fill_headers()
+
+        try:
+            return self._request_callback(execution_id=execution_id, headers=headers)
+        except requests.exceptions.HTTPError as e:
+            self._raise_integration_error(e)
+
+    def check_progress(
+        self, execution_id: str
+    ) -> Tuple[Optional[Dict], Optional[float]]:
+        """
+        Checks the execution once, returning the callback (None while it is
+        running) and the progress reported.
+        """
+        headers = self._fill_headers()
+
+        try:
+            execution_data = self._request_execution(
+                execution_id=execution_id, headers=headers
+            )
+        except requests.exceptions.HTTPError as e:
+            self._raise_integration_error(e)
+
+        return (
+            self.parse_callback(
+                execution_id=execution_id, execution_data=execution_data
+            ),
+            self._get_execution_percentage(execution_data),
+        )
+
+    def find_conversation_id(self, execution_id: str, deadline: Deadline = None) -> str:
+        """
+        Waits only until the execution is bound to a conversation, which
+        happens long before the execution is completed, raising
+        DeadlineExceededError when the deadline of the run is reached first.
+        """
+        logger.info(f"Starting search for conversation of {execution_id}")
+        headers = self._fill_headers()
+
+        try:
+            for attempt in range(self._retry_count_callback, 0, -1):
+                execution_data = self._request_execution(
+                    execution_id=execution_id, headers=headers
+                )
+
+                if execution_data.get("conversation_id"):
+                    return execution_data["conversation_id"]
+
+                self._sleep(self._retry_timeout, deadline=deadline)
+
+            raise ValueError("Maximum number of attempts reached")
+        except requests.exceptions.HTTPError as e:
+            self._raise_integration_error(e)
+
+    def _can_poll(self, attempt: int, started_at: float) -> bool:
+        """
+        Polls at least `retry_max_attempts` times and, as the checks are
+        closer than `retry_timeout` at first, for the same total time as
+        `retry_max_attempts` checks spaced by `retry_timeout`.
+        """
+        if attempt < self._retry_count_callback:
+            return True
+
+        budget = self._retry_count_callback * self._retry_timeout
+        return time.monotonic() - started_at < budget
+
+    @staticmethod
+    def _sleep(seconds: float, deadline: Deadline = None) -> None:
+        if deadline is None:
+            time.sleep(seconds)
+        else:
+            deadline.sleep(seconds)
+
+    @staticmethod
+    def _add_poll_statistics(callback: Dict, polls: int, started_at: float) -> Dict:
+        callback["polls"] = polls
+        callback["time_to_result"] = time.monotonic() - started_at
+
+        logger.info(
+            f"Execution {callback['execution_id']} completed after {polls} polls "
+            f"in {callback['time_to_result']:.1f}s"
+        )
+
+        return callback
+
+    @staticmethod
+    def _get_start_time(execution_data: Dict):
+        try:
+            return datetime.fromisoformat(
+                execution_data["progress"]["start"]
+            ).timestamp()
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _get_execution_percentage(execution_data: Dict):
+        try:
+            return float(execution_data["progress"]["execution_percentage"])
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def _request_execution(self, execution_id: str, headers: dict) -> Dict:
+        url = self._url.format(execution_id=execution_id)
+
+        response = self._http_client.get(
+            url=url, headers=headers, rate_limiter=self._rate_limiter
+        )
+
+        if not response.ok:
+            response.raise_for_status()
+
+        return response.json()
+
+    def _request_callback(self, execution_id: str, headers: dict):
+        execution_data = self._request_execution(
+            execution_id=execution_id, headers=headers
+        )
+
+        return self.parse_callback(
+            execution_id=execution_id, execution_data=execution_data
+        )
+
+    def parse_callback(self, execution_id: str, execution_data: Dict):
+        """
+        Builds the callback of an execution from its data, None while it is
+        still running. A completed callback holds the epoch seconds the
+        execution started at on STK AI ("started_at"), None if not reported.
+        """
+        if execution_data["progress"]["status"] == "COMPLETED":
+            logger.info(f"Execution {execution_id} was successfully completed")
+
+            return {
+                "execution_id": execution_id,
+                "conversation_id": execution_data["conversation_id"],
+                "review": execution_data["result"],
+                "started_at": self._get_start_time(execution_data),
+            }
+        elif execution_data["progress"]["status"] == "RUNNING":
+            execution_percentage = self._get_execution_percentage(execution_data)
+            logger.info(
+                f"Processing {execution_id} is "
+                f"{int((execution_percentage or 0) * 100)}% complete...."
+            )
+            return None
+
+        logger.error(
+            f"Progress status invalid",
+            extra={"data": execution_data},
+        )
+        return {
+            "execution_id": execution_id,
+            "conversation_id": execution_data["conversation_id"],
+            "review": f"{INVALID_STATUS_REVIEW}{execution_id}",
+        }
+
+    @staticmethod
+    def _raise_integration_error(e: requests.exceptions.HTTPError):
+        logger.error("Failed to integrate with STK AI result")
+        response = e.response
+        if e.response.status_code == 400:
+            raise IntegrationContractError(
+                f"API contract failure for STK AI result: {response.text}"
+            )
+
+        if e.response.status_code == 401:
+            raise AuthenticationError(
+                f"Authentication failure with STK AI result API: {response.text}"
+            )
+
+        if e.response.status_code == 403:
+            raise ServicePermissionError(
+                f"Permission failure with STK AI result API: {response.text}"
+            )
+
+        if e.response.status_code == 429:
+            raise RateLimitError(
+                f"Rate limit reached on STK AI result API: {response.text}"
+            )
+
+        if e.response.status_code >= 500:
+            raise IntegrationError(
+                f"Failed to integrate with STK AI result API: status_code: {response.status_code}"
+                f' message: {response.text or "No message"}'
+            )
+        raise e
+
     def _fill_headers(self):
         return {"Authorization": self._stk_token_service.generate_token()}
 
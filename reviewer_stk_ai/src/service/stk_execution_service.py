@@ -1,17 +1,18 @@
 import logging
 
 import requests
-from retrying import retry
 
 from reviewer_stk_ai.src.config.env_config import EnvConfig
-from reviewer_stk_ai.src.exceptions import retry_if_integration_error
 from reviewer_stk_ai.src.exceptions.authentication_error import AuthenticationError
 from reviewer_stk_ai.src.exceptions.integration_contract_error import (
     IntegrationContractError,
 )
 from reviewer_stk_ai.src.exceptions.integration_error import IntegrationError
+from reviewer_stk_ai.src.exceptions.rate_limit_error import RateLimitError
 from reviewer_stk_ai.src.service.stk_token_service import StkTokenService
 from reviewer_stk_ai.src.utils.constants import APPLICATION_NAME
+from reviewer_stk_ai.src.utils.http_client import HttpClient
+from reviewer_stk_ai.src.utils.rate_limiter import TokenBucketRateLimiter
 
 logger = logging.getLogger(APPLICATION_NAME)
 
@@ -20,44 +21,53 @@ class StkExecutionService:
     _stk_token_service: StkTokenService
     _url: str
     _id_quick_command: str
-    _proxies = None
-
-    def __init__(self, env_config: EnvConfig, stk_token_service=None):
+    _http_client: HttpClient
+    _rate_limiter: TokenBucketRateLimiter
+    _callback_url: str
+
+    def __init__(
+        self,
+        env_config: EnvConfig,
+        stk_token_service=None,
+        rate_limiter: TokenBucketRateLimiter = None,
+        callback_url: str = None,
+        http_client: HttpClient = None,
+    ):
         self._stk_token_service = stk_token_service
+        self._http_client = http_client or HttpClient(env_config=env_config)
+        self._callback_url = callback_url
+        self._rate_limiter = rate_limiter or TokenBucketRateLimiter(rate=0)
         self._url = (
             env_config.get_host_stk_ai()
             + "/v1/quick-commands/create-execution/{id_quick_command}"
         )
         self._id_quick_command = env_config.get_stk_id_quick_command()
-        self._proxies = env_config.get_proxies()
-
-    @retry(
-        retry_on_exception=retry_if_integration_error,
-        stop_max_attempt_number=3,
-        wait_exponential_multiplier=1000,
-        wait_exponential_max=5000,
-    )
+
     def create(self, file_content: str, conversation_id: str = None) -> str:
         logger.info("Starting file upload to STK AI")
         url = self._url.format(id_quick_command=self._id_quick_command)
         headers = self._fill_headers(conversation_id=conversation_id)
         file_content = file_content.replace("\n", r"\\n").replace('\\"', r'\\\\"')
+        payload = {"input_data": file_content}
 
-        try:
-            with requests.Session() as client:
-                response = client.request(
-                    "POST",
-                    url=url,
-                    json={"input_data": file_content},
-                    headers=headers,
-                    proxies=self._proxies,
-                )
-
-                if response.ok:
-                    logger.info(f"File successfully uploaded: {conversation_id}")
-                    return response.text.replace('"', "")
+        if self._callback_url:
+            # Completion is pushed to the callback receiver
+            payload["callback_url"] = self._callback_url
 
-                response.raise_for_status()
+        try:
+            response = self._http_client.request(
+                "POST",
+                url=url,
+                json=payload,
+                headers=headers,
+                rate_limiter=self._rate_limiter,
+            )
+
+            if response.ok:
+                logger.info(f"File successfully uploaded: {conversation_id}")
+                return response.text.replace('"', "")
+
+            response.raise_for_status()
         except requests.exceptions.HTTPError as e:
             logger.error("Integration with execution API failed")
             response = e.response
@@ -71,6 +81,11 @@ class StkExecutionService:
                     f"Authentication failure with execution API: {response.text}"
                 )
 
+            if e.response.status_code == 429:
+                raise RateLimitError(
+                    f"Rate limit reached on execution API: {response.text}"
+                )
+
             if e.response.status_code >= 500:
                 raise IntegrationError(
                     f"Integration with execution API failed: status_code: {response.status_code}"
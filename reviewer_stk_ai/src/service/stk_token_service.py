@@ -1,8 +1,8 @@
 import logging
+import threading
 from datetime import datetime, timedelta
 
 import requests
-from retrying import retry
 
 from reviewer_stk_ai.src.config.env_config import EnvConfig
 from reviewer_stk_ai.src.exceptions.authentication_error import AuthenticationError
@@ -10,8 +10,11 @@ from reviewer_stk_ai.src.exceptions.integration_contract_error import (
     IntegrationContractError,
 )
 from reviewer_stk_ai.src.exceptions.integration_error import IntegrationError
-from reviewer_stk_ai.src.utils.constants import APPLICATION_NAME
-from reviewer_stk_ai.src.exceptions import retry_if_integration_error
+from reviewer_stk_ai.src.exceptions.rate_limit_error import RateLimitError
+from reviewer_stk_ai.src.utils.constants import APPLICATION_NAME, TOKEN_REFRESH_RATIO
+from reviewer_stk_ai.src.utils.http_client import HttpClient
+from reviewer_stk_ai.src.utils.rate_limiter import TokenBucketRateLimiter
+from reviewer_stk_ai.src.utils.token_cache import TokenCache
 
 logger = logging.getLogger(APPLICATION_NAME)
 
@@ -23,29 +26,73 @@ class StkTokenService:
     _client_secret: str
     _token_cache: str = None
     _expires_in = None
-    _proxies = None
-
-    def __init__(self, env_config: EnvConfig):
+    _http_client: HttpClient
+    _lock: threading.Lock
+    _rate_limiter: TokenBucketRateLimiter
+    _shared_token_cache: TokenCache = None
+
+    def __init__(
+        self,
+        env_config: EnvConfig,
+        rate_limiter: TokenBucketRateLimiter = None,
+        http_client: HttpClient = None,
+        shared_token_cache: TokenCache = None,
+    ):
+        self._lock = threading.Lock()
+        self._shared_token_cache = shared_token_cache
+        self._http_client = http_client or HttpClient(env_config=env_config)
+        self._rate_limiter = rate_limiter or TokenBucketRateLimiter(rate=0)
         self._client_id = env_config.get_stk_client_id()
         self._client_secret = env_config.get_stk_client_secret()
-        self._proxies = env_config.get_proxies()
         self._realm = env_config.get_stk_realm()
         self._url = (
             f"{env_config.get_host_token_stk_ai()}/{self._realm}/oidc/oauth/token"
         )
 
-    @retry(
-        retry_on_exception=retry_if_integration_error,
-        stop_max_attempt_number=3,
-        wait_exponential_multiplier=1000,
-        wait_exponential_max=5000,
-    )
     def generate_token(self):
         logger.debug(f"Starting token generation for domain: {self._realm}")
 
         if self._token_cache is not None and not self.is_token_expired():
             return self._token_cache
 
+        # Workers share this service, only one of them requests a new token
+        with self._lock:
+            if self._token_cache is not None and not self.is_token_expired():
+                return self._token_cache
+
+            if self._shared_token_cache is None:
+                return self._request_token()
+
+            return self._request_shared_token()
+
+    def _request_shared_token(self):
+        """
+        Takes the token from the cache shared with the other processes and
+        runs, requesting it under the cache lock when it is missing or due
+        for refresh.
+        """
+        with self._shared_token_cache.lock():
+            cached = self._shared_token_cache.get(
+                realm=self._realm, client_id=self._client_id
+            )
+
+            if cached is not None:
+                logger.debug("Token taken from the shared cache")
+                self._token_cache = cached[0]
+                self._expires_in = datetime.fromtimestamp(cached[1])
+                return self._token_cache
+
+            token = self._request_token()
+            self._shared_token_cache.put(
+                realm=self._realm,
+                client_id=self._client_id,
+                token=token,
+                refresh_at=self._expires_in.timestamp(),
+            )
+
+            return token
+
+    def _request_token(self):
         try:
             headers = self._fill_headers()
 
@@ -55,26 +102,28 @@ class StkTokenService:
                 "grant_type": "client_credentials",
             }
 
-            with requests.Session() as client:
-
-                response = client.post(
-                    url=self._url, data=data, headers=headers, proxies=self._proxies
+            response = self._http_client.post(
+                url=self._url,
+                data=data,
+                headers=headers,
+                rate_limiter=self._rate_limiter,
+            )
+
+            if response.ok:
+                token_data = response.json()
+                self._token_cache = (
+                    f'{token_data["token_type"]} {token_data["access_token"]}'
+                )
+                # Refreshed before it expires, not after
+                self._expires_in = self.get_expiration_date(
+                    token_data["expires_in"] * TOKEN_REFRESH_RATIO
                 )
 
-                if response.ok:
-                    token_data = response.json()
-                    self._token_cache = (
-                        f'{token_data["token_type"]} {token_data["access_token"]}'
-                    )
-                    self._expires_in = self.get_expiration_date(
-                        token_data["expires_in"]
-                    )
-
-                    logger.debug("Token Generated")
+                logger.debug("Token Generated")
 
-                    return self._token_cache
+                return self._token_cache
 
-                response.raise_for_status()
+            response.raise_for_status()
         except requests.exceptions.HTTPError as e:
             logger.error("Failed to integrate with token API")
             response = e.response
@@ -88,6 +137,11 @@ class StkTokenService:
                     f"Authentication failure with token API: {response.text}"
                 )
 
+            if e.response.status_code == 429:
+                raise RateLimitError(
+                    f"Rate limit reached on token API: {response.text}"
+                )
+
             if e.response.status_code >= 500:
                 raise IntegrationError(
                     f"Failed to generate access token: status_code: {response.status_code}"
@@ -0,0 +1,128 @@
+import ast
+import os
+import re
+from typing import List, Set, Tuple
+
+_LINE_REFERENCE = re.compile(r"\b(lines?)(\s+)(\d+)(?:(\s*[-–]\s*)(\d+))?", re.I)
+
+
+def split_content(content: str, file_name: str, max_size: int) -> List[Tuple[int, str]]:
+    """
+    Splits the content in chunks of at most `max_size` bytes, returned with
+    the number of their first line. Python files are split between their
+    top level statements, and between the methods of a class too big for
+    one chunk, other files between paragraphs. A block bigger than
+    `max_size` on its own is split between lines.
+    """
+    lines = content.splitlines(keepends=True)
+    if max_size <= 0 or len(content.encode("utf-8")) <= max_size:
+        return [(1, content)]
+
+    boundaries = None
+    if os.path.splitext(file_name)[1] == ".py":
+        boundaries = _find_python_boundaries(content=content, max_size=max_size)
+    if boundaries is None:
+        boundaries = _find_paragraph_boundaries(lines=lines)
+
+    chunks = []
+    chunk_lines: List[str] = []
+    chunk_size = 0
+    first_line = 1
+
+    for block_start, block_end in _get_blocks(boundaries=boundaries, total=len(lines)):
+        block = lines[block_start - 1 : block_end - 1]
+        block_size = sum(len(line.encode("utf-8")) for line in block)
+
+        if chunk_size + block_size > max_size and len(chunk_lines) > 0:
+            chunks.append((first_line, "".join(chunk_lines)))
+            chunk_lines, chunk_size, first_line = [], 0, block_start
+
+        if block_size <= max_size:
+            chunk_lines.extend(block)
+            chunk_size += block_size
+            continue
+
+        # Too big on its own, split between lines
+        for number, line in enumerate(block, start=block_start):
+            line_size = len(line.encode("utf-8"))
+            if chunk_size + line_size > max_size and len(chunk_lines) > 0:
+                chunks.append((first_line, "".join(chunk_lines)))
+                chunk_lines, chunk_size, first_line = [], 0, number
+
+            chunk_lines.append(line)
+            chunk_size += line_size
+
+    if len(chunk_lines) > 0:
+        chunks.append((first_line, "".join(chunk_lines)))
+
+    return chunks
+
+
+def shift_line_numbers(text: str, offset: int) -> str:
+    """
+    Moves the line numbers mentioned in a review of a chunk (`line 12`,
+    `lines 3-5`) to their position in the whole file.
+    """
+    if offset == 0:
+        return text
+
+    def shift(match: re.Match) -> str:
+        word, space, start, separator, end = match.groups()
+        shifted = f"{word}{space}{int(start) + offset}"
+        if end is not None:
+            shifted += f"{separator}{int(end) + offset}"
+        return shifted
+
+    return _LINE_REFERENCE.sub(shift, text)
+
+
+def _find_python_boundaries(content: str, max_size: int) -> Set[int]:
+    """
+    First lines (decorators included) of the top level statements and of
+    the statements of the classes bigger than `max_size`. None when the
+    content is not valid Python.
+    """
+    try:
+        tree = ast.parse(content)
+    except (SyntaxError, ValueError):
+        return None
+
+    boundaries = set()
+    nodes = list(tree.body)
+
+    while len(nodes) > 0:
+        node = nodes.pop()
+        first_line = min(
+            [node.lineno]
+            + [decorator.lineno for decorator in getattr(node, "decorator_list", [])]
+        )
+        boundaries.add(first_line)
+
+        if isinstance(node, ast.ClassDef):
+            segment = ast.get_source_segment(content, node) or ""
+            if len(segment.encode("utf-8")) > max_size:
+                # The first statement stays with the class header
+                nodes.extend(node.body[1:])
+
+    return boundaries
+
+
+def _find_paragraph_boundaries(lines: List[str]) -> Set[int]:
+    return {
+        number
+        for number in range(2, len(lines) + 1)
+        if not lines[number - 2].strip() and lines[number - 1].strip()
+    }
+
+
+def _get_blocks(boundaries: Set[int], total: int) -> List[Tuple[int, int]]:
+    """
+    Line ranges, end excluded, between consecutive boundaries.
+    """
+    starts = sorted({1} | {line for line in boundaries if 1 < line <= total})
+    ends = starts[1:] + [total + 1]
+
+    return list(zip(starts, ends))
+
+
+__all__ = ["split_content", "shift_line_numbers"]
@@ -0,0 +1,231 @@
+import logging
+import threading
+import time
+from typing import Optional
+
+from reviewer_stk_ai.src.exceptions.integration_error import IntegrationError
+from reviewer_stk_ai.src.exceptions.rate_limit_error import RateLimitError
+from reviewer_stk_ai.src.utils.constants import APPLICATION_NAME
+
+logger = logging.getLogger(APPLICATION_NAME)
+
+
+class AdaptiveConcurrencyController:
+    """
+    AIMD limit for the number of executions in flight.
+
+    The limit grows while the executions complete with a stable latency
+    (doubling per window until the first back off, then by one per window)
+    and is cut by `backoff_factor` on rate limits (429), server errors (5xx)
+    or when the latency rises above `latency_tolerance` times the best one
+    seen (and by more than `min_latency_increase` seconds, so the jitter of
+    fast executions is not taken for congestion). It is also cut when the
+    time the executions wait on STK AI before they start rises more than
+    `max_queue_time_increase` seconds above the shortest wait seen. That
+    wait is measured against the clock of the server, so only its rise is
+    compared, never its value. Executions started before the last back off
+    do not cut it again.
+
+    The rate limits and server errors retried by the retry policy reach the
+    controller through `on_throttle`, and a Retry-After holds every new
+    execution until it has passed.
+
+    Attributes:
+        min_limit (int): Lowest limit.
+        max_limit (int): Highest limit, usually the configured concurrency.
+    """
+
+    _condition: threading.Condition
+    _limit: float
+    _min_limit: int
+    _max_limit: int
+    _in_flight: int
+    _max_in_flight: int
+    # Rate limits seen by the retry policy
+    _throttled: int
+    _slow_start: bool
+    _backoff_factor: float
+    _latency_tolerance: float
+    _min_latency_increase: float
+    _max_queue_time_increase: float
+    _baseline_latency: float = None
+    _latency_average: float = None
+    _baseline_queue_time: float = None
+    _queue_time_average: float = None
+    _last_backoff_at: float = 0.0
+    _paused_until: float = 0.0
+
+    def __init__(
+        self,
+        max_limit: int,
+        min_limit: int = 1,
+        initial_limit: int = 2,
+        backoff_factor: float = 0.5,
+        latency_tolerance: float = 2.0,
+        min_latency_increase: float = 1.0,
+        max_queue_time_increase: float = 5.0,
+    ):
+        self._condition = threading.Condition()
+        self._max_limit = max(1, max_limit)
+        self._min_limit = max(1, min(min_limit, self._max_limit))
+        self._limit = float(min(self._max_limit, max(self._min_limit, initial_limit)))
+        self._in_flight = 0
+        self._max_in_flight = 0
+        self._throttled = 0
+        self._slow_start = True
+        self._backoff_factor = backoff_factor
+        self._latency_tolerance = latency_tolerance
+        self._min_latency_increase = min_latency_increase
+        self._max_queue_time_increase = max_queue_time_increase
+
+    def acquire(self) -> float:
+        """
+        Blocks until there is room for one more execution, returning the
+        moment it started, which must be given back to on_success/on_error.
+        """
+        with self._condition:
+            while True:
+                paused = self._paused_until - time.monotonic()
+                if paused > 0:
+                    self._condition.wait(timeout=paused)
+                elif self._in_flight >= int(self._limit):
+                    self._condition.wait()
+                else:
+                    break
+
+            self._in_flight += 1
+            self._max_in_flight = max(self._max_in_flight, self._in_flight)
+
+        return time.monotonic()
+
+    def release(self) -> None:
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+    def on_success(self, started_at: float, queue_time: float = None) -> None:
+        """
+        Feeds the controller with an execution that completed, and with the
+        seconds it waited on STK AI before starting when they are known.
+        """
+        latency = time.monotonic() - started_at
+
+        with self._condition:
+            if self._baseline_latency is None or latency < self._baseline_latency:
+                self._baseline_latency = latency
+
+            if self._latency_average is None:
+                self._latency_average = latency
+            else:
+                self._latency_average = 0.7 * self._latency_average + 0.3 * latency
+
+            if queue_time is not None:
+                self._add_queue_time(queue_time=queue_time)
+
+            congestion = self._get_congestion()
+            if congestion is not None:
+                self._backoff(started_at=started_at, reason=congestion)
+                return
+
+            previous_limit = int(self._limit)
+            increment = 1 if self._slow_start else 1 / self._limit
+            self._limit = min(float(self._max_limit), self._limit + increment)
+
+            if int(self._limit) != previous_limit:
+                logger.info(
+                    f"Concurrency limit raised {previous_limit} -> {int(self._limit)}"
+                )
+                self._condition.notify_all()
+
+    def on_error(self, started_at: float, error: BaseException) -> None:
+        if isinstance(error, RateLimitError):
+            reason = "rate limited by STK AI"
+        elif isinstance(error, IntegrationError):
+            reason = "server error from STK AI"
+        else:
+            return
+
+        with self._condition:
+            self._backoff(started_at=started_at, reason=reason)
+
+    def on_throttle(
+        self, started_at: float, status_code: int, retry_after: Optional[float] = None
+    ) -> None:
+        """
+        Backs off on a rate limit or server error seen by the retry policy,
+        holding new executions for `retry_after` seconds when it is given.
+        """
+        if status_code == 429:
+            reason = "rate limited by STK AI"
+        else:
+            reason = f"server error {status_code} from STK AI"
+
+        with self._condition:
+            if status_code == 429:
+                self._throttled += 1
+            if retry_after is not None and retry_after > 0:
+                self._paused_until = max(
+                    self._paused_until, time.monotonic() + retry_after
+                )
+            self._backoff(started_at=started_at, reason=reason)
+
+    def get_limit(self) -> int:
+        return int(self._limit)
+
+    def get_max_in_flight(self) -> int:
+        return self._max_in_flight
+
+    def get_throttled(self) -> int:
+        return self._throttled
+
+    def _add_queue_time(self, queue_time: float) -> None:
+        if self._baseline_queue_time is None or queue_time < self._baseline_queue_time:
+            self._baseline_queue_time = queue_time
+
+        if self._queue_time_average is None:
+            self._queue_time_average = queue_time
+        else:
+            self._queue_time_average = 0.7 * self._queue_time_average + 0.3 * queue_time
+
+    def _get_congestion(self) -> Optional[str]:
+        if (
+            self._latency_average > self._baseline_latency * self._latency_tolerance
+            and self._latency_average - self._baseline_latency
+            > self._min_latency_increase
+        ):
+            return (
+                f"latency {self._latency_average:.1f}s is above "
+                f"{self._latency_tolerance}x the best {self._baseline_latency:.1f}s"
+            )
+
+        if (
+            self._queue_time_average is not None
+            and self._queue_time_average - self._baseline_queue_time
+            > self._max_queue_time_increase
+        ):
+            return (
+                f"queue time is "
+                f"{self._queue_time_average - self._baseline_queue_time:.1f}s "
+                f"above the shortest one"
+            )
+
+        return None
+
+    def _backoff(self, started_at: float, reason: str) -> None:
+        if started_at < self._last_backoff_at:
+            return
+
+        previous_limit = int(self._limit)
+        self._limit = max(float(self._min_limit), self._limit * self._backoff_factor)
+        self._slow_start = False
+        self._last_backoff_at = time.monotonic()
+        # The latency measured so far belongs to the previous limit
+        self._latency_average = None
+        self._queue_time_average = None
+
+        logger.info(
+            f"Concurrency limit lowered {previous_limit} -> {int(self._limit)}: {reason}"
+        )
+
+
+__all__ = ["AdaptiveConcurrencyController"]
@@ -2,6 +2,7 @@ APPLICATION_NAME = "reviewer_stk_ai"
 
 EXIT_FAIL = 1
 EXIT_SUCCESS = 0
+EXIT_PARTIAL = 2
 
 # Constants for default ignored directories and files
 DEFAULT_IGNORED_DIRECTORIES = {"venv", ".git", "pytest_cache", "__pycache__"}
@@ -16,6 +17,28 @@ DEFAULT_REPORT_FILENAME = "review-code-report.md"
 # Default
 
 DEFAULT_REALM = "zup"
+DEFAULT_CONCURRENCY = 8
+DEFAULT_DEADLINE_GRACE = 30
+DEFAULT_CALLBACK_RECEIVER_TIMEOUT = 60
+# Seconds to connect to STK AI and to wait for each response
+DEFAULT_CONNECT_TIMEOUT = 10
+DEFAULT_READ_TIMEOUT = 60
+
+# Review engines
+ENGINE_THREAD = "thread"
+ENGINE_ASYNCIO = "asyncio"
+ENGINE_TWO_PHASE = "two-phase"
+ENGINES = (ENGINE_THREAD, ENGINE_ASYNCIO, ENGINE_TWO_PHASE)
+
+# Conversation modes
+CONVERSATION_INDEPENDENT = "independent"
+CONVERSATION_UPFRONT = "upfront"
+CONVERSATION_SHARED = "shared"
+CONVERSATION_MODES = (
+    CONVERSATION_INDEPENDENT,
+    CONVERSATION_UPFRONT,
+    CONVERSATION_SHARED,
+)
 
 # MESSAGES
 ERROR_MESSAGE_REALM = (
@@ -34,5 +57,26 @@ ERROR_MESSAGE_CLIENT_ID = (
 
 
 TEMP_PATH = "./tmp"
+
+# Local state kept between runs
+STATE_PATH = "./.reviewer_stk_ai"
+LATENCY_HISTORY_PATH = f"{STATE_PATH}/latency-history.json"
+JOURNAL_PATH = f"{STATE_PATH}/journal.jsonl"
+DEFAULT_QUEUE_PATH = f"{STATE_PATH}/queue.sqlite3"
+DEFAULT_LEASE_SECONDS = 600
+DEFAULT_QUEUE_MAX_ATTEMPTS = 3
+# Reviews kept by content, least recently used evicted above 100 MB or 30 days
+REVIEW_CACHE_FILE_NAME = "reviews.sqlite3"
+DEFAULT_REVIEW_CACHE_MAX_SIZE = 100
+DEFAULT_REVIEW_CACHE_MAX_AGE = 30
+# Leases of the contents in review, renewed by the job while it runs
+REVIEW_LEASE_SECONDS = 60
+# Interval between the checks for a review leased by another job
+REVIEW_LEASE_POLL_SECONDS = 5
+# Review of an execution that ended without a result, never cached
+INVALID_STATUS_REVIEW = "Progress status invalid, try another execution later..."
+# Tokens shared by every run of the user, refreshed at 80% of their lifetime
+TOKEN_CACHE_PATH = f"~/.cache/{APPLICATION_NAME}/tokens.json"
+TOKEN_REFRESH_RATIO = 0.8
 TEMP_PATH_EXEC = f"{TEMP_PATH}/exec"
 TEMP_PATH_REVIEW = f"{TEMP_PATH}/reviews"
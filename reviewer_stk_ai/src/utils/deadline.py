@@ -0,0 +1,48 @@
+import time
+
+from reviewer_stk_ai.src.exceptions.deadline_exceeded_error import (
+    DeadlineExceededError,
+)
+
+
+class Deadline:
+    """
+    Wall-clock budget of a run.
+
+    New executions are only submitted until `grace` seconds before the end,
+    the executions already in flight get that grace period to complete.
+
+    Attributes:
+        seconds (float): Budget of the run, from the creation of the deadline.
+        grace (float): Seconds reserved for the executions in flight.
+    """
+
+    _expires_at: float
+    _submissions_until: float
+
+    def __init__(self, seconds: float, grace: float = 0.0):
+        now = time.monotonic()
+        self._expires_at = now + seconds
+        self._submissions_until = self._expires_at - min(grace, seconds)
+
+    def allows_submission(self) -> bool:
+        return time.monotonic() < self._submissions_until
+
+    def is_expired(self) -> bool:
+        return time.monotonic() >= self._expires_at
+
+    def get_remaining(self) -> float:
+        return max(0.0, self._expires_at - time.monotonic())
+
+    def sleep(self, seconds: float) -> None:
+        """
+        Sleeps up to the end of the deadline, raising DeadlineExceededError
+        when it is reached.
+        """
+        time.sleep(min(seconds, self.get_remaining()))
+
+        if self.is_expired():
+            raise DeadlineExceededError("Run deadline reached")
+
+
+__all__ = ["Deadline"]
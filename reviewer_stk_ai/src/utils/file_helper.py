@@ -84,23 +84,10 @@ def create_file(file_name: str, content: str):
     logger.debug(f"File '{file_name}' created successfully.")
 
 
-def merge_tmp_files(path: str) -> str:
-    separator = "\n\n---\n\n"
-    contents = []
-    for dirpath, dirnames, filenames in os.walk(path):
-        print(dirpath)
-        for file in filenames:
-            with open(f"{os.path.join(dirpath, file)}", "r") as infile:
-                contents.append(infile.read())
-
-    return separator.join(contents)
-
-
 __all__ = [
     "create_file",
     "create_file_and_directory",
     "find_all_files",
     "read_file",
     "create_directory",
-    "merge_tmp_files",
 ]
@@ -1,8 +1,27 @@
-from typing import Set, Dict
+from typing import Set, Dict, Optional
 
 import git
 
 
+def is_included(
+    file: str, extension: str, ignored_directories: Set, ignored_files: Set
+) -> bool:
+    """
+    Whether a path of the repository has the extension and is not ignored.
+    """
+    path = file.split("/")
+    file_name: str = path[-1]
+
+    if not file_name.endswith(extension):
+        return False
+
+    for _ignored_directory in ignored_directories:
+        if _ignored_directory in path:
+            return False
+
+    return file_name not in ignored_files
+
+
 def get_changed_files(
     repository: git.Repo,
     base: str,
@@ -17,22 +36,8 @@ def get_changed_files(
     changed_files = []
     diff = repository.git.diff(f"{base}..{compare}", name_only=True)
     for file in diff.split("\n"):
-        path = file.split("/")
-        file_name: str = path[-1]
-
-        if not file_name.endswith(extension):
-            continue
-
-        is_exist_directory = False
-        for _ignored_directory in ignored_directories:
-            if _ignored_directory in path:
-                is_exist_directory = True
-                break
-
-        if is_exist_directory or (file_name in ignored_files):
-            continue
-
-        changed_files.append(file)
+        if is_included(file, extension, ignored_directories, ignored_files):
+            changed_files.append(file)
 
     return changed_files
 
@@ -52,6 +57,16 @@ def get_file_diffs(repository: git.Repo, base: str, compare: str):
     return file_diffs
 
 
+def get_file_content(repository: git.Repo, ref: str, file: str) -> Optional[str]:
+    """
+    Returns the content of a file on a ref, None when the file does not exist.
+    """
+    try:
+        return repository.git.show(f"{ref}:{file}", strip_newline_in_stdout=False)
+    except git.GitCommandError:
+        return None
+
+
 def find_all_changed_code(
     repository_path: str,
     base: str,
@@ -59,9 +74,12 @@ def find_all_changed_code(
     extension: str,
     ignored_directories: Set,
     ignored_files: Set,
+    full_content: bool = False,
 ) -> Dict[str, str]:
     """
-    Returns a dictionary with the files that changed and the altered code.
+    Returns a dictionary with the files that changed and the altered code,
+    or their whole content on `compare` with `full_content`, leaving out
+    the deleted files.
     """
     repository = git.Repo(repository_path)
 
@@ -71,8 +89,34 @@ def find_all_changed_code(
 
     changed_codes = {}
 
-    if changed_files:
+    if changed_files and full_content:
+        for file in changed_files:
+            content = get_file_content(repository, compare, file)
+            if content is not None:
+                changed_codes[file] = content
+    elif changed_files:
         file_diffs = get_file_diffs(repository, base, compare)
         changed_codes = {file: file_diffs[file] for file in changed_files}
 
     return changed_codes
+
+
+def find_all_code(
+    repository_path: str,
+    ref: str,
+    extension: str,
+    ignored_directories: Set,
+    ignored_files: Set,
+) -> Dict[str, str]:
+    """
+    Returns a dictionary with the files of a ref and their content.
+    """
+    repository = git.Repo(repository_path)
+
+    files = repository.git.ls_tree("-r", "--name-only", ref)
+
+    return {
+        file: get_file_content(repository, ref, file)
+        for file in files.split("\n")
+        if file and is_included(file, extension, ignored_directories, ignored_files)
+    }
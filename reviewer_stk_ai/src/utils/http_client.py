@@ -0,0 +1,134 @@
+import logging
+import threading
+from typing import Dict, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from reviewer_stk_ai.src.config.env_config import EnvConfig
+from reviewer_stk_ai.src.utils.constants import (
+    APPLICATION_NAME,
+    DEFAULT_CONCURRENCY,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_READ_TIMEOUT,
+)
+from reviewer_stk_ai.src.utils.rate_limiter import TokenBucketRateLimiter
+from reviewer_stk_ai.src.utils.retry_policy import RetryPolicy
+
+logger = logging.getLogger(APPLICATION_NAME)
+
+
+class HttpClient:
+    """
+    Pooled HTTP session shared by the STK services.
+
+    Connections are kept alive per host and reused by the following requests,
+    so the TCP and TLS handshakes (twice through a proxy) are paid once per
+    connection instead of once per request. Every worker of the run shares
+    the client and the proxies of the configuration are applied once. A
+    request finding every connection of its host in use waits for one to be
+    released, instead of opening a connection that is dropped afterwards, so
+    the run never holds more than pool_size connections per host. Every
+    request goes through the retry policy, so the retries, their budget and
+    the circuit breaker are shared by the services using the client. A
+    request without its own timeout gets the default one, so a stalled
+    connection fails (and is retried) instead of blocking a worker.
+
+    Attributes:
+        pool_size (int): Connections open per host, the concurrency of the run.
+        retry_policy (RetryPolicy): Retries and circuit breaker of the requests.
+        timeout (Tuple[float, float]): Seconds to connect and to wait for
+            each response.
+    """
+
+    _session: requests.Session
+    _adapter: HTTPAdapter
+    _retry_policy: RetryPolicy
+    _timeout: Tuple[float, float]
+    _lock: threading.Lock
+    _requests: int
+
+    def __init__(
+        self,
+        env_config: EnvConfig = None,
+        pool_size: int = DEFAULT_CONCURRENCY,
+        retry_policy: RetryPolicy = None,
+        timeout: Tuple[float, float] = (DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT),
+    ):
+        self._retry_policy = retry_policy or RetryPolicy()
+        self._timeout = timeout
+        self._adapter = HTTPAdapter(pool_maxsize=max(1, pool_size), pool_block=True)
+        self._session = requests.Session()
+        self._session.mount("https://", self._adapter)
+        self._session.mount("http://", self._adapter)
+        self._lock = threading.Lock()
+        self._requests = 0
+
+        if env_config is not None:
+            self._session.proxies.update(env_config.get_proxies())
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        rate_limiter: TokenBucketRateLimiter = None,
+        **kwargs,
+    ) -> requests.Response:
+        """
+        Sends the request under the retry policy, each attempt takes a token
+        of the rate limiter. POST requests are not idempotent, they are only
+        retried when they did not reach the server.
+        """
+        kwargs.setdefault("timeout", self._timeout)
+
+        def send() -> requests.Response:
+            if rate_limiter is not None:
+                rate_limiter.acquire()
+
+            with self._lock:
+                self._requests += 1
+
+            return self._session.request(method, url=url, **kwargs)
+
+        return self._retry_policy.send(
+            send, idempotent=method.upper() not in ("POST", "PATCH")
+        )
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url=url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url=url, **kwargs)
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Requests made, connections opened for them, requests that reused an
+        open connection and retries.
+        """
+        pools = self._adapter.poolmanager.pools
+        connections = 0
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is not None:
+                connections += pool.num_connections
+
+        with self._lock:
+            requests_made = self._requests
+
+        return {
+            "requests": requests_made,
+            "connections": connections,
+            "reused": max(0, requests_made - connections),
+            **self._retry_policy.get_stats(),
+        }
+
+    def close(self) -> None:
+        stats = self.get_stats()
+        logger.debug(
+            f"Closing HTTP client: {stats['requests']} requests over "
+            f"{stats['connections']} connections"
+        )
+        self._session.close()
+
+
+__all__ = ["HttpClient"]
@@ -0,0 +1,101 @@
+import json
+import logging
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+from reviewer_stk_ai.src.utils.constants import APPLICATION_NAME
+
+logger = logging.getLogger(APPLICATION_NAME)
+
+
+class LatencyHistory:
+    """
+    Review latency of each path in previous runs, stored as JSON.
+
+    Attributes:
+        path (str): File where the history is stored.
+        entries (Dict): Latency in seconds and payload size by file path.
+    """
+
+    _path: str
+    _entries: Dict[str, Dict]
+    _lock: threading.Lock
+
+    def __init__(self, path: str):
+        self._path = path
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def load(self) -> "LatencyHistory":
+        if not os.path.exists(self._path):
+            return self
+
+        try:
+            with open(self._path, "r", encoding="utf-8") as file:
+                self._entries = json.load(file)
+        except (OSError, ValueError):
+            logger.warning(f"Ignoring unreadable latency history {self._path}")
+            self._entries = {}
+
+        return self
+
+    def save(self) -> None:
+        directory = os.path.dirname(self._path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        with self._lock:
+            with open(self._path, "w", encoding="utf-8") as file:
+                json.dump(self._entries, file)
+
+    def record(self, name: str, size: int, latency: float) -> None:
+        with self._lock:
+            self._entries[name] = {"size": size, "latency": latency}
+
+    def get_latency(self, name: str) -> Optional[float]:
+        entry = self._entries.get(name)
+        return entry["latency"] if entry else None
+
+    def get_cost_model(self) -> Optional[Tuple[float, float]]:
+        """
+        Review time of a payload as a fixed time per execution (queueing,
+        model start up, callback) plus a time per byte, fitted by least
+        squares on the history. Returns (seconds per execution, seconds per
+        byte), None without history.
+        """
+        with self._lock:
+            entries = [
+                (entry["size"], entry["latency"]) for entry in self._entries.values()
+            ]
+
+        total_size = sum(size for size, _ in entries)
+        total_latency = sum(latency for _, latency in entries)
+        if total_size == 0:
+            return None
+
+        mean_size = total_size / len(entries)
+        mean_latency = total_latency / len(entries)
+        variance = sum((size - mean_size) ** 2 for size, _ in entries)
+        if variance == 0:
+            return 0.0, total_latency / total_size
+
+        seconds_per_byte = (
+            sum(
+                (size - mean_size) * (latency - mean_latency)
+                for size, latency in entries
+            )
+            / variance
+        )
+        # Latency not growing with the size, every execution costs the same
+        if seconds_per_byte <= 0:
+            return mean_latency, 0.0
+
+        seconds_per_execution = mean_latency - seconds_per_byte * mean_size
+        if seconds_per_execution < 0:
+            return 0.0, total_latency / total_size
+
+        return seconds_per_execution, seconds_per_byte
+
+
+__all__ = ["LatencyHistory"]
@@ -0,0 +1,254 @@
+import ast
+import io
+import logging
+import os
+import tokenize
+from typing import Dict, List, Set, Tuple
+
+from reviewer_stk_ai.src.utils.constants import APPLICATION_NAME
+
+logger = logging.getLogger(APPLICATION_NAME)
+
+# String literals longer than this are replaced by a placeholder
+MAX_STRING_LENGTH = 120
+STRING_PLACEHOLDER = '"..."'
+
+_LAYOUT_TOKENS = {
+    tokenize.NL,
+    tokenize.NEWLINE,
+    tokenize.INDENT,
+    tokenize.DEDENT,
+    tokenize.ENDMARKER,
+    tokenize.COMMENT,
+}
+
+
+def minimize(content: str, file_name: str) -> str:
+    """
+    Reduces the content sent for review without changing its code: comments
+    and license headers, docstrings, long string literals and trailing
+    spaces are removed and the indentation of Python files is normalized to
+    one space per level. Every line keeps its number, so the lines mentioned
+    by the review are the lines of the file: removed lines are left empty.
+    Python files are handled with tokenize, so the code is kept valid, other
+    files only lose their trailing spaces and blank lines at the end.
+    """
+    if os.path.splitext(file_name)[1] == ".py":
+        return minimize_python(content)
+
+    return minimize_text(content)
+
+
+def minimize_text(content: str) -> str:
+    lines = [line.rstrip() for line in content.splitlines()]
+
+    while len(lines) > 0 and not lines[-1]:
+        lines.pop()
+
+    return "\n".join(lines) + ("\n" if len(lines) > 0 else "")
+
+
+def minimize_python(content: str) -> str:
+    """
+    Falls back to minimize_text when the file is not valid Python, and to
+    the original content if the result would not be.
+    """
+    try:
+        tree = ast.parse(content)
+        rows = io.StringIO(content).readlines()
+        tokens = list(tokenize.generate_tokens(io.StringIO(content).readline))
+    except (SyntaxError, ValueError, tokenize.TokenError):
+        return minimize_text(content)
+
+    edits = _get_python_edits(
+        rows=rows, tokens=tokens, docstrings=_find_docstrings(tree)
+    )
+    minimized = _apply_edits(rows=rows, edits=edits)
+
+    try:
+        ast.parse(minimized)
+    except SyntaxError:
+        logger.warning("Minimized content is not valid Python, sending it as is")
+        return content
+
+    return minimized
+
+
+def _find_docstrings(tree: ast.AST) -> Dict[int, bool]:
+    """
+    Rows of the docstrings, mapped to whether the docstring is the only
+    statement of its body.
+    """
+    docstrings = {}
+
+    for node in ast.walk(tree):
+        if not isinstance(
+            node, (ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)
+        ):
+            continue
+
+        if (
+            len(node.body) > 0
+            and isinstance(node.body[0], ast.Expr)
+            and isinstance(node.body[0].value, ast.Constant)
+            and isinstance(node.body[0].value.value, str)
+        ):
+            docstrings[node.body[0].lineno] = len(node.body) == 1
+
+    return docstrings
+
+
+def _get_python_edits(
+    rows: List[str], tokens: List[tokenize.TokenInfo], docstrings: Dict[int, bool]
+) -> List[Tuple[Tuple[int, int], Tuple[int, int], str]]:
+    edits = []
+    code_rows: Set[int] = set()
+    # Rows of the docstrings removed, left empty
+    removed_rows: Set[int] = set()
+    # Rows continuing a token started on a previous row
+    covered_rows: Set[int] = set()
+    # Rows where a token continues on the next row
+    open_rows: Set[int] = set()
+    first_tokens: Dict[int, Tuple[int, int]] = {}
+    last_ends: Dict[int, int] = {}
+
+    depth = 0
+    parentheses = 0
+    logical_line_start = True
+
+    for index, token in enumerate(tokens):
+        (start_row, start_col), (end_row, end_col) = token.start, token.end
+
+        if token.type == tokenize.INDENT:
+            depth += 1
+            continue
+        if token.type == tokenize.DEDENT:
+            depth -= 1
+            continue
+        if token.type in (tokenize.NEWLINE, tokenize.NL):
+            if token.type == tokenize.NEWLINE:
+                logical_line_start = True
+            continue
+        if token.type in _LAYOUT_TOKENS:
+            continue
+
+        code_rows.update(range(start_row, end_row + 1))
+        covered_rows.update(range(start_row + 1, end_row + 1))
+        open_rows.update(range(start_row, end_row))
+        last_ends[end_row] = max(last_ends.get(end_row, 0), end_col)
+        if start_row not in first_tokens:
+            continuation = not logical_line_start or parentheses > 0
+            first_tokens[start_row] = (start_col, depth + (1 if continuation else 0))
+
+        if token.type == tokenize.STRING:
+            next_type = tokens[index + 1].type if index + 1 < len(tokens) else None
+            is_statement = logical_line_start and next_type in (
+                tokenize.NEWLINE,
+                tokenize.COMMENT,
+            )
+            # The rows of the string are kept as empty lines after the
+            # placeholder, which breaks the line only where it is allowed
+            line_breaks = "\n" * (end_row - start_row)
+            breakable = (
+                parentheses > 0
+                or next_type in (tokenize.NEWLINE, tokenize.COMMENT)
+                or end_row == start_row
+            )
+
+            if is_statement and start_row in docstrings:
+                if docstrings[start_row]:
+                    edits.append((token.start, token.end, f"...{line_breaks}"))
+                else:
+                    removed_rows.update(range(start_row, end_row + 1))
+            elif len(token.string) > MAX_STRING_LENGTH and breakable:
+                edits.append(
+                    (token.start, token.end, f"{STRING_PLACEHOLDER}{line_breaks}")
+                )
+
+        if token.type == tokenize.OP and token.string in "([{":
+            parentheses += 1
+        elif token.type == tokenize.OP and token.string in ")]}":
+            parentheses -= 1
+
+        logical_line_start = False
+
+    edits = [
+        edit
+        for edit in edits
+        if edit[0][0] not in removed_rows and edit[1][0] not in removed_rows
+    ]
+
+    blank_rows: List[int] = []
+
+    for row in range(1, len(rows) + 1):
+        line = rows[row - 1].rstrip("\r\n")
+
+        # Blank, comment and removed docstring lines are left empty
+        if row in removed_rows or row not in code_rows:
+            blank_rows.append(row)
+            continue
+
+        for blank_row in blank_rows:
+            edits.append(
+                (
+                    (blank_row, 0),
+                    (blank_row, len(rows[blank_row - 1].rstrip("\r\n"))),
+                    "",
+                )
+            )
+        blank_rows = []
+
+        if row in first_tokens and row not in covered_rows:
+            column, level = first_tokens[row]
+            edits.append(((row, 0), (row, column), " " * level))
+
+        if row not in open_rows and row in last_ends:
+            tail = line[last_ends[row] :]
+            edits.append(
+                (
+                    (row, last_ends[row]),
+                    (row, len(line)),
+                    " \\" if tail.rstrip().endswith("\\") else "",
+                )
+            )
+
+    # Nothing to keep the numbers of after the last line of code
+    for blank_row in blank_rows:
+        edits.append(((blank_row, 0), (blank_row + 1, 0), ""))
+
+    return edits
+
+
+def _apply_edits(
+    rows: List[str], edits: List[Tuple[Tuple[int, int], Tuple[int, int], str]]
+) -> str:
+    offsets = [0]
+    for row in rows:
+        offsets.append(offsets[-1] + len(row))
+    content = "".join(rows)
+
+    def to_offset(position: Tuple[int, int]) -> int:
+        row, column = position
+        if row > len(rows):
+            return len(content)
+        return offsets[row - 1] + column
+
+    parts = []
+    position = 0
+
+    for start, end, text in sorted(edits, key=lambda edit: to_offset(edit[0])):
+        start_offset, end_offset = to_offset(start), to_offset(end)
+        if start_offset < position:
+            # Overlaps an edit already applied
+            continue
+
+        parts.append(content[position:start_offset])
+        parts.append(text)
+        position = end_offset
+
+    parts.append(content[position:])
+
+    return "".join(parts)
+
+
+__all__ = ["minimize", "minimize_python", "minimize_text"]
@@ -0,0 +1,76 @@
+import re
+from typing import Dict, List, Optional, Tuple
+
+from reviewer_stk_ai.src.models.file_review import FileReview
+
+PACK_INSTRUCTIONS = (
+    "The files below are reviewed together. Review each file separately and "
+    "start the review of each one with its `===== FILE: <file name> =====` line.\n\n"
+)
+
+_FILE_HEADING = re.compile(
+    r"^[\s#*>`]*=+\s*FILE:\s*`?(?P<name>.+?)`?\s*=+[\s*`]*$", re.I | re.M
+)
+
+
+def pack_files(file_reviews: List[FileReview], max_size: int) -> List[List[FileReview]]:
+    """
+    Groups the files in packs of at most `max_size` bytes, delimiters
+    included, biggest files first into the first pack with room (first fit
+    decreasing). Files that do not share a pack with any other are returned
+    alone.
+    """
+    packs: List[List[FileReview]] = []
+    sizes: List[int] = []
+
+    for review in sorted(file_reviews, key=lambda item: item.get_size(), reverse=True):
+        start, end = _get_delimiters(name=review.name)
+        size = review.get_size() + len(f"{start}\n\n{end}\n\n".encode("utf-8"))
+
+        for index, pack_size in enumerate(sizes):
+            if pack_size + size <= max_size:
+                packs[index].append(review)
+                sizes[index] += size
+                break
+        else:
+            packs.append([review])
+            sizes.append(len(PACK_INSTRUCTIONS.encode("utf-8")) + size)
+
+    return packs
+
+
+def join_files(files: List[Tuple[str, str]]) -> str:
+    """
+    Content of a pack: the name and content of each file between delimiters.
+    """
+    sections = []
+    for name, content in files:
+        start, end = _get_delimiters(name=name)
+        sections.append(f"{start}\n{content.rstrip()}\n{end}\n")
+
+    return PACK_INSTRUCTIONS + "\n".join(sections)
+
+
+def split_review(review: str, names: List[str]) -> Optional[Dict[str, str]]:
+    """
+    Review of each file of a pack, read from the file headings of the review.
+    None when any file has no heading, or more than one.
+    """
+    headings = list(_FILE_HEADING.finditer(review))
+    found = [heading.group("name").strip() for heading in headings]
+    if sorted(found) != sorted(names):
+        return None
+
+    reviews = {}
+    for index, heading in enumerate(headings):
+        end = headings[index + 1].start() if index + 1 < len(headings) else len(review)
+        reviews[found[index]] = review[heading.end() : end].strip()
+
+    return reviews
+
+
+def _get_delimiters(name: str) -> Tuple[str, str]:
+    return f"===== FILE: {name} =====", f"===== END OF FILE: {name} ====="
+
+
+__all__ = ["pack_files", "join_files", "split_review", "PACK_INSTRUCTIONS"]
@@ -0,0 +1,60 @@
+import random
+from typing import Optional
+
+
+class PollStrategy:
+    """
+    Delays between the checks of an execution.
+
+    The first check is immediate and the next ones back off exponentially
+    from `initial_delay` up to `max_delay`. When the API reports the progress
+    of the execution, the delay follows the time left estimated from it
+    instead. Every delay varies by `jitter` so executions submitted together
+    do not poll at the same time.
+
+    Attributes:
+        max_delay (float): Longest wait between two checks, in seconds.
+        initial_delay (float): Wait before the second check, in seconds.
+        multiplier (float): Growth of the wait after each check.
+        jitter (float): Fraction of the wait added or removed at random.
+    """
+
+    _max_delay: float
+    _initial_delay: float
+    _multiplier: float
+    _jitter: float
+
+    def __init__(
+        self,
+        max_delay: float,
+        initial_delay: float = 1.0,
+        multiplier: float = 2.0,
+        jitter: float = 0.2,
+    ):
+        self._max_delay = max(0.0, max_delay)
+        self._initial_delay = min(initial_delay, self._max_delay)
+        self._multiplier = multiplier
+        self._jitter = jitter
+
+    def get_delay(
+        self, attempt: int, elapsed: float, percentage: Optional[float] = None
+    ) -> float:
+        """
+        Seconds to wait before the check number `attempt` (from 0), given the
+        seconds elapsed since the first check and the last progress reported.
+        """
+        if attempt == 0:
+            return 0.0
+
+        if percentage is not None and 0 < percentage < 1:
+            time_left = elapsed * (1 - percentage) / percentage
+            delay = max(self._initial_delay, time_left)
+        else:
+            delay = self._initial_delay * self._multiplier ** (attempt - 1)
+
+        delay *= random.uniform(1 - self._jitter, 1 + self._jitter)
+
+        return min(self._max_delay, delay)
+
+
+__all__ = ["PollStrategy"]
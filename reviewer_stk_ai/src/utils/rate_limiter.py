@@ -0,0 +1,62 @@
+import logging
+import threading
+import time
+
+from reviewer_stk_ai.src.utils.constants import APPLICATION_NAME
+
+logger = logging.getLogger(APPLICATION_NAME)
+
+
+class TokenBucketRateLimiter:
+    """
+    Token bucket shared by every worker of a run.
+
+    Callers over the budget are not rejected: each one reserves the next
+    free token and sleeps until it is available, so bursts are smoothed
+    into `rate` requests per second instead of failing with 429.
+
+    Attributes:
+        rate (float): Requests per second, 0 or less disables the limiter.
+        capacity (float): Requests allowed in a burst, defaults to one second.
+    """
+
+    _lock: threading.Lock
+    _rate: float
+    _capacity: float
+    _tokens: float
+    _updated_at: float
+
+    def __init__(self, rate: float, capacity: float = None):
+        self._lock = threading.Lock()
+        self._rate = rate
+        self._capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self._capacity
+        self._updated_at = time.monotonic()
+
+    def acquire(self) -> float:
+        """
+        Takes one token, waiting for it if needed. Returns the time waited.
+        """
+        if self._rate <= 0:
+            return 0.0
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self._capacity, self._tokens + (now - self._updated_at) * self._rate
+            )
+            self._updated_at = now
+            self._tokens -= 1
+            wait = 0.0 if self._tokens >= 0 else -self._tokens / self._rate
+
+        if wait > 0:
+            logger.debug(f"Rate limit reached, waiting {wait:.2f}s")
+            time.sleep(wait)
+
+        return wait
+
+    def is_enabled(self) -> bool:
+        return self._rate > 0
+
+
+__all__ = ["TokenBucketRateLimiter"]
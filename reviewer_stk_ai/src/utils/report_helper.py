@@ -1,21 +1,78 @@
 import logging
+import re
+from typing import List, Tuple
 
-from reviewer_stk_ai.src.utils.constants import APPLICATION_NAME, TEMP_PATH
-from reviewer_stk_ai.src.utils.file_helper import (
-    create_file_and_directory,
-    merge_tmp_files,
-)
+from reviewer_stk_ai.src.models.file_review import FileReview
+from reviewer_stk_ai.src.utils.constants import APPLICATION_NAME
+from reviewer_stk_ai.src.utils.report_writer import ReportWriter
 
 logger = logging.getLogger(APPLICATION_NAME)
 
+INDEX_HEADER = "Files reviewed:\n\n"
+NOT_REVIEWED_HEADER = "Files not reviewed:\n\n"
+
+# Only a separator followed by a section header splits the report, so a
+# horizontal rule inside a review stays in it
+SECTION_SEPARATOR = re.compile(
+    r"\n\n---\n\n(?=File name: |" + re.escape(NOT_REVIEWED_HEADER) + ")"
+)
+SECTION = re.compile(r"File name: (.*?) \n\n(.*)", re.DOTALL)
+
+
+def merge_reports(directory: str, file_name: str, shard_files: List[str]) -> str:
+    """
+    Joins the partial reports written by each shard into the final report,
+    in the layout of an unsharded run: the sections of every shard ordered
+    by file name under a single index, and the files not reviewed by any
+    shard listed at the end. Only one shard report is in memory at a time.
+    """
+    if len(shard_files) == 0:
+        raise ValueError(f"No shard reports to merge, at {directory}")
+
+    with ReportWriter(directory=directory, file_name=file_name) as report_writer:
+        for shard_file in shard_files:
+            logger.debug(f"Merging shard report {shard_file}")
+            reviews, not_reviewed = read_report(path=shard_file)
+
+            for review in reviews:
+                report_writer.write(review=review)
+            report_writer.add_not_reviewed(names=not_reviewed)
+
+    return report_writer.get_path()
+
+
+def read_report(path: str) -> Tuple[List[FileReview], List[str]]:
+    """
+    Reads the reviews and the files not reviewed of a report written by
+    ReportWriter.
+    """
+    with open(path, "r", encoding="utf-8") as file:
+        content = file.read()
+
+    # The index is rebuilt by the writer of the merged report
+    if content.startswith(INDEX_HEADER):
+        _, _, content = content.partition("\n\n---\n\n")
+
+    reviews = []
+    not_reviewed = []
+    for section in SECTION_SEPARATOR.split(content):
+        if section.startswith(NOT_REVIEWED_HEADER):
+            not_reviewed.extend(
+                line[2:]
+                for line in section[len(NOT_REVIEWED_HEADER) :].splitlines()
+                if line.startswith("- ")
+            )
+            continue
 
-def generate_report(directory: str, file_name: str) -> None:
-    content = merge_tmp_files(TEMP_PATH)
+        match = SECTION.match(section)
+        if match is None:
+            if len(section.strip()) > 0:
+                logger.warning(f"Ignoring unreadable section of the report {path}")
+            continue
 
-    if len(content.strip()) == 0:
-        raise ValueError(f"No content to generate report, at {TEMP_PATH}")
+        reviews.append(FileReview(name=match.group(1), llm_review=match.group(2)))
 
-    create_file_and_directory(directory=directory, file_name=file_name, content=content)
+    return reviews, not_reviewed
 
 
-__all__ = ["generate_report"]
+__all__ = ["merge_reports", "read_report"]
@@ -0,0 +1,173 @@
+import logging
+import os
+import shutil
+import threading
+from typing import BinaryIO, List, Tuple
+
+from reviewer_stk_ai.src.models.file_review import FileReview
+from reviewer_stk_ai.src.utils.constants import APPLICATION_NAME
+
+logger = logging.getLogger(APPLICATION_NAME)
+
+SEPARATOR = "\n\n---\n\n".encode("utf-8")
+CHUNK_SIZE = 64 * 1024
+
+
+class ReportWriter:
+    """
+    Report written while the reviews finish.
+
+    Every review is appended to the report as soon as it completes, so a
+    killed run still leaves the reviews done so far. The report is created
+    on the first review, a run without reviews keeps the previous one.
+    Closing the writer rewrites the report ordered by file name, with an
+    index of the files, copying one section at a time from the offsets
+    recorded on each write. Files that could not be reviewed are listed at
+    the end of the report. Once every file made it to the report, the
+    results stored for each file while the run went on are removed, an
+    incomplete run keeps them for the journal to resume from.
+
+    Attributes:
+        path (str): Report file.
+        index (bool): Write the index of the files on top of the report.
+        temp_directory (str): Results stored for each file during the run.
+        sections (List): File name, offset and length of each section.
+        not_reviewed (List): Files left out of the report.
+    """
+
+    _directory: str
+    _path: str
+    _index: bool
+    _temp_directory: str = None
+    _lock: threading.Lock
+    _file: BinaryIO = None
+    _sections: List[Tuple[str, int, int]]
+    _not_reviewed: List[str]
+    _closed: bool
+
+    def __init__(
+        self,
+        directory: str,
+        file_name: str,
+        index: bool = True,
+        temp_directory: str = None,
+    ):
+        self._directory = directory
+        self._path = os.path.join(directory, file_name)
+        self._index = index
+        self._temp_directory = temp_directory
+        self._lock = threading.Lock()
+        self._sections = []
+        self._not_reviewed = []
+        self._closed = False
+
+    def __enter__(self) -> "ReportWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close(complete=exc_type is None)
+
+    def write(self, review: FileReview) -> None:
+        section = f"File name: {review.name} \n\n{review.llm_review}".encode("utf-8")
+
+        with self._lock:
+            if self._closed:
+                raise ValueError(f"Report {self._path} already closed")
+
+            if self._file is None:
+                self._open()
+            else:
+                self._file.write(SEPARATOR)
+
+            offset = self._file.tell()
+            self._file.write(section)
+            self._file.flush()
+            self._sections.append((review.name, offset, len(section)))
+
+        logger.debug(f"Review of {review.name} added to the report {self._path}")
+
+    def add_not_reviewed(self, names: List[str]) -> None:
+        with self._lock:
+            self._not_reviewed.extend(names)
+
+    def get_count(self) -> int:
+        return len(self._sections)
+
+    def get_path(self) -> str:
+        return self._path
+
+    def close(self, complete: bool = True) -> str:
+        """
+        Orders the report and writes the index, then removes the results of
+        each file unless the run was interrupted (`complete` False) or left
+        files out. Returns the report path.
+        """
+        with self._lock:
+            if self._closed:
+                return self._path
+
+            self._closed = True
+            if self._file is not None or len(self._not_reviewed) > 0:
+                if self._file is None:
+                    self._open()
+
+                self._file.close()
+                self._sort()
+
+            if complete and len(self._not_reviewed) == 0:
+                self._remove_temp_directory()
+
+        return self._path
+
+    def _remove_temp_directory(self) -> None:
+        if self._temp_directory is None or not os.path.exists(self._temp_directory):
+            return
+
+        shutil.rmtree(self._temp_directory, ignore_errors=True)
+        logger.debug(f"Results of each file removed from {self._temp_directory}")
+
+    def _open(self) -> None:
+        if not os.path.exists(self._directory):
+            os.makedirs(self._directory, exist_ok=True)
+
+        self._file = open(self._path, "wb")
+
+    def _sort(self) -> None:
+        sorted_path = f"{self._path}.sorting"
+        sections = sorted(self._sections)
+
+        with open(self._path, "rb") as source, open(sorted_path, "wb") as target:
+            if self._index:
+                target.write(self._create_index(sections=sections))
+
+            for position, (_, offset, length) in enumerate(sections):
+                if position > 0:
+                    target.write(SEPARATOR)
+
+                source.seek(offset)
+                remaining = length
+                while remaining > 0:
+                    chunk = source.read(min(CHUNK_SIZE, remaining))
+                    target.write(chunk)
+                    remaining -= len(chunk)
+
+            if len(self._not_reviewed) > 0:
+                if len(sections) > 0:
+                    target.write(SEPARATOR)
+                target.write(self._create_not_reviewed_list())
+
+        os.replace(sorted_path, self._path)
+
+        logger.info(f"Report {self._path} ordered with {len(sections)} reviews")
+
+    def _create_not_reviewed_list(self) -> bytes:
+        lines = [f"- {name}" for name in sorted(self._not_reviewed)]
+        return ("Files not reviewed:\n\n" + "\n".join(lines)).encode("utf-8")
+
+    @staticmethod
+    def _create_index(sections: List[Tuple[str, int, int]]) -> bytes:
+        lines = [f"- {name}" for name, _, _ in sections]
+        return ("Files reviewed:\n\n" + "\n".join(lines)).encode("utf-8") + SEPARATOR
+
+
+__all__ = ["ReportWriter"]
@@ -0,0 +1,307 @@
+import logging
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, List, Optional
+
+import requests
+from urllib3.exceptions import NewConnectionError
+
+from reviewer_stk_ai.src.exceptions.circuit_open_error import CircuitOpenError
+from reviewer_stk_ai.src.utils.constants import APPLICATION_NAME
+
+logger = logging.getLogger(APPLICATION_NAME)
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half-open"
+
+
+def get_retry_after(response: requests.Response) -> Optional[float]:
+    """
+    Seconds asked by the Retry-After header, in seconds or as an HTTP date,
+    None when it is missing or invalid.
+    """
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def is_not_sent(error: BaseException) -> bool:
+    """
+    Whether the request failed before reaching the server, the connection
+    was never established, so sending it again cannot repeat its effect.
+    """
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(reason, NewConnectionError)
+
+
+class RetryPolicy:
+    """
+    Retries and circuit breaker shared by every request of a run.
+
+    Rate limits (429), server errors (5xx) and connection failures are tried
+    again up to `max_attempts` times (for requests that are not idempotent,
+    such as a POST creating an execution, only the connection failures
+    happening before the request is sent), waiting for Retry-After when the server
+    sends it, or an exponential backoff with jitter otherwise. The retries of
+    the whole run come from one budget, `min_budget` plus `budget_ratio` of
+    the requests made, so a degraded backend does not multiply the load.
+
+    After `failure_threshold` server errors in a row the circuit opens and
+    every request fails with CircuitOpenError, without reaching the server,
+    for `reset_timeout` seconds. A single trial request then closes the
+    circuit again, or opens it for another period.
+
+    Every rate limit and server error, retried or not, is also reported to
+    the throttle listeners with the moment its attempt started and the
+    Retry-After asked, so the concurrency of the run follows the throttling
+    the retries hide from the callers.
+
+    Attributes:
+        max_attempts (int): Attempts of each request, including the first one.
+        initial_delay (float): Backoff before the first retry, in seconds.
+        max_delay (float): Longest backoff between attempts, in seconds.
+        max_retry_after (float): Longest Retry-After honoured, a longer wait
+            fails the request instead.
+        budget_ratio (float): Retries allowed per request made in the run.
+        min_budget (int): Retries allowed regardless of the requests made.
+        failure_threshold (int): Server errors in a row opening the circuit.
+        reset_timeout (float): Seconds the circuit stays open.
+    """
+
+    _lock: threading.Lock
+    _max_attempts: int
+    _initial_delay: float
+    _max_delay: float
+    _max_retry_after: float
+    _budget_ratio: float
+    _min_budget: int
+    _failure_threshold: int
+    _reset_timeout: float
+    _requests: int
+    _retries: int
+    _failures: int
+    _state: str
+    _opened_at: float = None
+    _trial_in_flight: bool
+    _throttle_listeners: List[Callable[[float, int, Optional[float]], None]]
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        initial_delay: float = 1.0,
+        max_delay: float = 5.0,
+        max_retry_after: float = 60.0,
+        budget_ratio: float = 0.2,
+        min_budget: int = 10,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+    ):
+        self._lock = threading.Lock()
+        self._max_attempts = max(1, max_attempts)
+        self._initial_delay = initial_delay
+        self._max_delay = max_delay
+        self._max_retry_after = max_retry_after
+        self._budget_ratio = budget_ratio
+        self._min_budget = min_budget
+        self._failure_threshold = max(1, failure_threshold)
+        self._reset_timeout = reset_timeout
+        self._requests = 0
+        self._retries = 0
+        self._failures = 0
+        self._state = CIRCUIT_CLOSED
+        self._trial_in_flight = False
+        self._throttle_listeners = []
+
+    def add_throttle_listener(
+        self, listener: Callable[[float, int, Optional[float]], None]
+    ) -> None:
+        """
+        Calls `listener(started_at, status_code, retry_after)` on every rate
+        limit (429) or server error (5xx) received, `started_at` being the
+        time.monotonic() of the attempt.
+        """
+        with self._lock:
+            self._throttle_listeners.append(listener)
+
+    def remove_throttle_listener(
+        self, listener: Callable[[float, int, Optional[float]], None]
+    ) -> None:
+        with self._lock:
+            if listener in self._throttle_listeners:
+                self._throttle_listeners.remove(listener)
+
+    def send(
+        self, request: Callable[[], requests.Response], idempotent: bool = True
+    ) -> requests.Response:
+        """
+        Sends the request, retrying it while the policy allows. Returns the
+        last response, the caller handles its status as usual.
+        """
+        attempt = 0
+
+        while True:
+            self._before_request()
+            attempt += 1
+            started_at = time.monotonic()
+
+            try:
+                response = request()
+            except (
+                requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout,
+            ) as e:
+                self._record_failure()
+                if not idempotent and not is_not_sent(error=e):
+                    # The server may have received it, a retry could repeat it
+                    raise
+                if not self._can_retry(attempt=attempt):
+                    raise
+                delay = self._get_backoff(attempt=attempt)
+                logger.warning(f"Connection failed, retrying in {delay:.1f}s")
+            else:
+                if response.status_code != 429 and response.status_code < 500:
+                    self._record_success()
+                    return response
+
+                if response.status_code >= 500:
+                    self._record_failure()
+                else:
+                    self._release_trial()
+
+                retry_after = get_retry_after(response)
+                self._notify_throttle(
+                    started_at=started_at,
+                    status_code=response.status_code,
+                    retry_after=retry_after,
+                )
+
+                if retry_after is not None and retry_after > self._max_retry_after:
+                    logger.warning(f"Retry-After of {retry_after:.0f}s is too long")
+                    return response
+
+                if not self._can_retry(attempt=attempt):
+                    return response
+
+                delay = (
+                    retry_after
+                    if retry_after is not None
+                    else self._get_backoff(attempt=attempt)
+                )
+                logger.warning(
+                    f"Request failed with status {response.status_code}, "
+                    f"retrying in {delay:.1f}s"
+                )
+
+            time.sleep(delay)
+
+    def get_state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"retries": self._retries}
+
+    def _before_request(self) -> None:
+        with self._lock:
+            self._requests += 1
+
+            if self._state == CIRCUIT_CLOSED:
+                return
+
+            remaining = self._opened_at + self._reset_timeout - time.monotonic()
+            if self._state == CIRCUIT_OPEN and remaining <= 0:
+                logger.info("Circuit half-open, sending a trial request")
+                self._state = CIRCUIT_HALF_OPEN
+
+            if self._state == CIRCUIT_HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+
+        raise CircuitOpenError(
+            f"STK AI is failing, circuit open after {self._failures} server errors "
+            f"in a row: requests are stopped for {max(0.0, remaining):.0f}s"
+        )
+
+    def _record_success(self) -> None:
+        with self._lock:
+            if self._state != CIRCUIT_CLOSED:
+                logger.info("Circuit closed, STK AI is responding again")
+
+            self._failures = 0
+            self._state = CIRCUIT_CLOSED
+            self._trial_in_flight = False
+
+    def _record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+
+            if self._state == CIRCUIT_HALF_OPEN or (
+                self._state == CIRCUIT_CLOSED
+                and self._failures >= self._failure_threshold
+            ):
+                logger.error(
+                    f"Circuit open after {self._failures} server errors in a row, "
+                    f"failing requests for {self._reset_timeout:.0f}s"
+                )
+                self._state = CIRCUIT_OPEN
+                self._opened_at = time.monotonic()
+
+            self._trial_in_flight = False
+
+    def _notify_throttle(
+        self, started_at: float, status_code: int, retry_after: Optional[float]
+    ) -> None:
+        with self._lock:
+            listeners = list(self._throttle_listeners)
+
+        for listener in listeners:
+            listener(started_at, status_code, retry_after)
+
+    def _release_trial(self) -> None:
+        with self._lock:
+            self._trial_in_flight = False
+
+    def _can_retry(self, attempt: int) -> bool:
+        if attempt >= self._max_attempts:
+            return False
+
+        with self._lock:
+            if self._state != CIRCUIT_CLOSED:
+                return False
+
+            if self._retries >= self._min_budget + self._budget_ratio * self._requests:
+                logger.warning("Retry budget of the run exhausted, not retrying")
+                return False
+
+            self._retries += 1
+            return True
+
+    def _get_backoff(self, attempt: int) -> float:
+        delay = min(self._max_delay, self._initial_delay * 2 ** (attempt - 1))
+        return delay * random.uniform(0.8, 1.0)
+
+
+__all__ = ["RetryPolicy", "get_retry_after", "is_not_sent"]
@@ -0,0 +1,243 @@
+import hashlib
+import json
+import logging
+import os
+import socket
+import sqlite3
+import time
+from contextlib import closing
+from typing import Dict, Optional
+
+from reviewer_stk_ai.src.utils.constants import (
+    APPLICATION_NAME,
+    DEFAULT_REVIEW_CACHE_MAX_AGE,
+    DEFAULT_REVIEW_CACHE_MAX_SIZE,
+    REVIEW_CACHE_FILE_NAME,
+    REVIEW_LEASE_SECONDS,
+)
+
+logger = logging.getLogger(APPLICATION_NAME)
+
+
+class ReviewCache:
+    """
+    Reviews stored in SQLite by the hash of the reviewed content, so an
+    unchanged file is never sent again.
+
+    The key also holds the quick command and the options that change what
+    is sent for a file, a review made with another prompt or preprocessing
+    is not reused. The directory can be shared by runs, processes and CI
+    jobs. When the cache is opened, the reviews older than `max_age` are
+    removed and then the least recently used ones until the reviews fit in
+    `max_size`.
+
+    Jobs sharing the directory review each content once: a job claims the
+    content when it submits it, the other jobs see the lease and wait for
+    the review instead of submitting their own. The job renews its leases
+    while it runs, they expire `lease_seconds` after the last renewal, so
+    the content of a crashed job is soon claimed again. A lease is released
+    when the review is stored.
+
+    Attributes:
+        directory (str): Directory of the cache database.
+        namespace (str): Quick command whose reviews are cached.
+        max_size (int): Bytes of reviews kept, 0 keeps every review.
+        max_age (float): Seconds a review is kept, 0 keeps it forever.
+        owner (str): Id of the job on the leases, host and process by default.
+        lease_seconds (float): Time a job owns a content before losing it.
+    """
+
+    _directory: str
+    _path: str
+    _namespace: str
+    _max_size: int
+    _max_age: float
+    _owner: str
+    _lease_seconds: float
+
+    def __init__(
+        self,
+        directory: str,
+        namespace: str = "",
+        max_size: int = DEFAULT_REVIEW_CACHE_MAX_SIZE * 1024 * 1024,
+        max_age: float = DEFAULT_REVIEW_CACHE_MAX_AGE * 24 * 60 * 60,
+        owner: str = None,
+        lease_seconds: float = REVIEW_LEASE_SECONDS,
+    ):
+        self._directory = directory
+        self._path = os.path.join(directory, REVIEW_CACHE_FILE_NAME)
+        self._namespace = namespace
+        self._max_size = max_size
+        self._max_age = max_age
+        self._owner = owner or f"{socket.gethostname()}-{os.getpid()}"
+        self._lease_seconds = lease_seconds
+
+        os.makedirs(self._directory, exist_ok=True)
+
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS reviews ("
+                " key TEXT PRIMARY KEY,"
+                " review TEXT NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " used_at REAL NOT NULL)"
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS leases ("
+                " key TEXT PRIMARY KEY,"
+                " owner TEXT NOT NULL,"
+                " expires_at REAL NOT NULL)"
+            )
+
+        self.prune()
+
+    def get(self, content_hash: str, options: Dict = None) -> Optional[str]:
+        """
+        Review of the content, None when it is not cached or expired.
+        """
+        key = self._get_key(content_hash=content_hash, options=options)
+        now = time.time()
+
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT review, created_at FROM reviews WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None or self._is_expired(created_at=row[1], now=now):
+                return None
+
+            connection.execute(
+                "UPDATE reviews SET used_at = ? WHERE key = ?", (now, key)
+            )
+
+        return row[0]
+
+    def put(self, content_hash: str, review: str, options: Dict = None) -> None:
+        key = self._get_key(content_hash=content_hash, options=options)
+        now = time.time()
+
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO reviews"
+                " (key, review, size, created_at, used_at) VALUES (?, ?, ?, ?, ?)",
+                (key, review, len(review.encode("utf-8")), now, now),
+            )
+            connection.execute(
+                "DELETE FROM leases WHERE key = ? AND owner = ?", (key, self._owner)
+            )
+
+    def claim(self, content_hash: str, options: Dict = None) -> bool:
+        """
+        Takes the lease of the content, False while another job holds it.
+        """
+        key = self._get_key(content_hash=content_hash, options=options)
+        now = time.time()
+
+        with self._connect() as connection:
+            # Locks the database, so two jobs never claim the same content
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                row = connection.execute(
+                    "SELECT owner, expires_at FROM leases WHERE key = ?", (key,)
+                ).fetchone()
+
+                if row is not None and row[0] != self._owner and row[1] > now:
+                    return False
+
+                if row is not None and row[0] != self._owner:
+                    logger.info(f"Lease of {content_hash} held by {row[0]} expired")
+
+                connection.execute(
+                    "INSERT OR REPLACE INTO leases (key, owner, expires_at)"
+                    " VALUES (?, ?, ?)",
+                    (key, self._owner, now + self._lease_seconds),
+                )
+            finally:
+                connection.execute("COMMIT")
+
+        return True
+
+    def is_claimed(self, content_hash: str, options: Dict = None) -> bool:
+        """
+        Whether another job holds an unexpired lease of the content.
+        """
+        key = self._get_key(content_hash=content_hash, options=options)
+
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT 1 FROM leases WHERE key = ? AND owner != ? AND expires_at > ?",
+                (key, self._owner, time.time()),
+            ).fetchone()
+
+        return row is not None
+
+    def renew_all(self) -> int:
+        """
+        Extends the leases of this job, returning how many it holds.
+        """
+        with self._connect() as connection:
+            return connection.execute(
+                "UPDATE leases SET expires_at = ? WHERE owner = ?",
+                (time.time() + self._lease_seconds, self._owner),
+            ).rowcount
+
+    def get_lease_seconds(self) -> float:
+        return self._lease_seconds
+
+    def release_all(self) -> None:
+        """
+        Releases the leases of this job not released by a stored review.
+        """
+        with self._connect() as connection:
+            connection.execute("DELETE FROM leases WHERE owner = ?", (self._owner,))
+
+    def prune(self) -> int:
+        """
+        Removes the expired reviews, then the least recently used ones above
+        the size limit. Returns the number of reviews removed.
+        """
+        removed = 0
+
+        with self._connect() as connection:
+            if self._max_age > 0:
+                removed += connection.execute(
+                    "DELETE FROM reviews WHERE created_at < ?",
+                    (time.time() - self._max_age,),
+                ).rowcount
+
+            if self._max_size > 0:
+                removed += connection.execute(
+                    "DELETE FROM reviews WHERE key IN ("
+                    " SELECT key FROM ("
+                    "  SELECT key, SUM(size) OVER"
+                    "  (ORDER BY used_at DESC, key) AS total FROM reviews)"
+                    " WHERE total > ?)",
+                    (self._max_size,),
+                ).rowcount
+
+        if removed > 0:
+            logger.info(f"{removed} reviews evicted from the cache {self._path}")
+
+        return removed
+
+    def get_count(self) -> int:
+        with self._connect() as connection:
+            return connection.execute("SELECT COUNT(*) FROM reviews").fetchone()[0]
+
+    def get_directory(self) -> str:
+        return self._directory
+
+    def _get_key(self, content_hash: str, options: Dict = None) -> str:
+        key = json.dumps([self._namespace, content_hash, options or {}], sort_keys=True)
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    def _is_expired(self, created_at: float, now: float) -> bool:
+        return self._max_age > 0 and created_at < now - self._max_age
+
+    def _connect(self) -> closing:
+        # Autocommit mode, every statement is committed on its own
+        return closing(sqlite3.connect(self._path, timeout=30, isolation_level=None))
+
+
+__all__ = ["ReviewCache"]
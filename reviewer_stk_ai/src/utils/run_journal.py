@@ -0,0 +1,122 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+from reviewer_stk_ai.src.models.file_review import FileReview
+from reviewer_stk_ai.src.utils.constants import APPLICATION_NAME
+
+logger = logging.getLogger(APPLICATION_NAME)
+
+STATUS_SUBMITTED = "submitted"
+STATUS_COMPLETED = "completed"
+
+
+class RunJournal:
+    """
+    Journal of a run, one JSON line per step of each file, written as the
+    run goes so an interrupted run can be resumed without creating the
+    executions again.
+
+    Attributes:
+        path (str): JSONL file of the journal.
+        entries (Dict): Last entry of each file: hash, execution id, status
+            and location of the result.
+    """
+
+    _path: str
+    _entries: Dict[str, Dict]
+    _lock: threading.Lock
+
+    def __init__(self, path: str):
+        self._path = path
+        self._entries = {}
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(self._path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+
+    def load(self) -> "RunJournal":
+        if not os.path.exists(self._path):
+            return self
+
+        with open(self._path, "r", encoding="utf-8") as file:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # The last line may be cut by the interruption
+                    logger.warning(f"Ignoring unreadable journal line in {self._path}")
+                    continue
+
+                self._entries[entry["name"]] = entry
+
+        logger.info(f"{len(self._entries)} files loaded from journal {self._path}")
+
+        return self
+
+    def reset(self) -> "RunJournal":
+        with self._lock:
+            self._entries = {}
+            open(self._path, "w", encoding="utf-8").close()
+
+        return self
+
+    def get(self, review: FileReview) -> Optional[Dict]:
+        """
+        Last entry of the file, None when the file is unknown or its content
+        changed since it was journaled.
+        """
+        entry = self._entries.get(review.name)
+        if entry is None or entry["hash"] != review.file_content_hash:
+            return None
+
+        return entry
+
+    def record_submitted(self, review: FileReview) -> None:
+        self._append(review=review, status=STATUS_SUBMITTED, result=None)
+
+    def record_completed(self, review: FileReview, result: str) -> None:
+        self._append(review=review, status=STATUS_COMPLETED, result=result)
+
+    def _append(self, review: FileReview, status: str, result: Optional[str]) -> None:
+        entry = {
+            "name": review.name,
+            "hash": review.file_content_hash,
+            "execution_id": review.execution_id,
+            "status": status,
+            "result": result,
+        }
+
+        with self._lock:
+            self._entries[review.name] = entry
+            with open(self._path, "a", encoding="utf-8") as file:
+                file.write(json.dumps(entry) + "\n")
+
+
+def get_journal_path(
+    path: str, command: str, directory: str, shard: Tuple[int, int] = None
+) -> str:
+    """
+    Journal of the runs of a command on a directory and shard. Other runs
+    keep their own journal, so they neither truncate this one nor resume
+    from it.
+    """
+    scope = json.dumps(
+        [command, os.path.abspath(directory), list(shard) if shard else None]
+    )
+    digest = hashlib.sha256(scope.encode("utf-8")).hexdigest()[:12]
+    root, extension = os.path.splitext(path)
+
+    return f"{root}-{digest}{extension}"
+
+
+__all__ = [
+    "RunJournal",
+    "get_journal_path",
+    "STATUS_SUBMITTED",
+    "STATUS_COMPLETED",
+]
@@ -0,0 +1,80 @@
+import heapq
+from typing import List, Optional
+
+from reviewer_stk_ai.src.models.file_review import FileReview
+from reviewer_stk_ai.src.utils.latency_history import LatencyHistory
+
+
+def estimate_cost(review: FileReview, history: LatencyHistory = None) -> float:
+    """
+    Estimated review time in seconds: the latency of the path in previous
+    runs, or the fixed time of an execution plus its size times the time
+    per byte. Without any history the size itself is used, which still
+    orders the files correctly.
+    """
+    if history is not None:
+        latency = history.get_latency(review.name)
+        if latency is not None:
+            return latency
+
+        cost_model = history.get_cost_model()
+        if cost_model is not None:
+            seconds_per_execution, seconds_per_byte = cost_model
+            return seconds_per_execution + review.get_size() * seconds_per_byte
+
+    return float(review.get_size())
+
+
+def order_longest_first(
+    file_reviews: List[FileReview], history: LatencyHistory = None
+) -> List[FileReview]:
+    """
+    Longest processing time first: the big files start early so none of
+    them is left running alone at the end of the run.
+    """
+    return sorted(
+        file_reviews,
+        key=lambda review: estimate_cost(review=review, history=history),
+        reverse=True,
+    )
+
+
+def predict_makespan(costs: List[float], workers: int) -> float:
+    """
+    Duration of the run when the costs are handed, in order, to the first
+    free of `workers` workers.
+    """
+    if len(costs) == 0:
+        return 0.0
+
+    finish_times = [0.0] * max(1, min(workers, len(costs)))
+    for cost in costs:
+        heapq.heappush(finish_times, heapq.heappop(finish_times) + cost)
+
+    return max(finish_times)
+
+
+def predict_makespan_seconds(
+    file_reviews: List[FileReview], workers: int, history: LatencyHistory = None
+) -> Optional[float]:
+    """
+    Predicted makespan in seconds, None while there is no history to
+    convert the file sizes into time.
+    """
+    if history is None or history.get_cost_model() is None:
+        return None
+
+    return predict_makespan(
+        costs=[
+            estimate_cost(review=review, history=history) for review in file_reviews
+        ],
+        workers=workers,
+    )
+
+
+__all__ = [
+    "estimate_cost",
+    "order_longest_first",
+    "predict_makespan",
+    "predict_makespan_seconds",
+]
@@ -0,0 +1,111 @@
+import hashlib
+import os
+import re
+from typing import Dict, List
+
+SHARD_STRATEGY_HASH = "hash"
+SHARD_STRATEGY_SIZE = "size"
+SHARD_STRATEGIES = (SHARD_STRATEGY_HASH, SHARD_STRATEGY_SIZE)
+
+
+def select_shard(
+    files: Dict[str, str],
+    shard_index: int,
+    shard_count: int,
+    strategy: str = SHARD_STRATEGY_HASH,
+) -> Dict[str, str]:
+    """
+    Returns the files of one shard. Every node running the same discovery
+    with a different shard_index gets a disjoint subset, and together they
+    cover all the files.
+
+    - hash: stable hash of the path, a file stays on its shard between runs.
+    - size: files spread by size (largest first to the lightest shard), so
+      every shard has about the same amount of content to review.
+    """
+    if shard_count <= 1:
+        return files
+
+    if strategy == SHARD_STRATEGY_SIZE:
+        shards = _assign_by_size(files=files, shard_count=shard_count)
+    else:
+        shards = {path: _hash_path(path) % shard_count for path in files}
+
+    return {path: files[path] for path in files if shards[path] == shard_index}
+
+
+def get_shard_file_name(file_name: str, shard_index: int, shard_count: int) -> str:
+    """
+    review-code-report.md -> review-code-report.shard-1-of-4.md
+    """
+    stem, extension = os.path.splitext(file_name)
+    return f"{stem}.shard-{shard_index + 1}-of-{shard_count}{extension}"
+
+
+def find_shard_files(directory: str, file_name: str) -> List[str]:
+    """
+    Paths of the shard reports of file_name in directory, in shard order.
+    Raises ValueError when the reports are not every shard of one split:
+    different shard counts, or shards missing.
+    """
+    stem, extension = os.path.splitext(file_name)
+    pattern = re.compile(
+        rf"^{re.escape(stem)}\.shard-(\d+)-of-(\d+){re.escape(extension)}$"
+    )
+
+    shard_files = []
+    shard_counts = set()
+    for name in os.listdir(directory):
+        match = pattern.match(name)
+        if match:
+            shard_files.append((int(match.group(1)), os.path.join(directory, name)))
+            shard_counts.add(int(match.group(2)))
+
+    if len(shard_counts) > 1:
+        raise ValueError(
+            f"Shard reports of {file_name} come from different splits, "
+            f"with {sorted(shard_counts)} shards"
+        )
+
+    if len(shard_counts) == 1:
+        shard_count = shard_counts.pop()
+        missing = sorted(
+            set(range(1, shard_count + 1)) - {index for index, _ in shard_files}
+        )
+        if len(missing) > 0:
+            raise ValueError(
+                f"Shard reports of {file_name} missing: shards {missing} "
+                f"of {shard_count}"
+            )
+
+    return [path for _, path in sorted(shard_files)]
+
+
+def _hash_path(path: str) -> int:
+    normalized_path = path.replace("\\", "/")
+    if normalized_path.startswith("./"):
+        normalized_path = normalized_path[2:]
+
+    return int(hashlib.sha256(normalized_path.encode("utf-8")).hexdigest(), 16)
+
+
+def _assign_by_size(files: Dict[str, str], shard_count: int) -> Dict[str, int]:
+    loads = [0] * shard_count
+    shards = {}
+
+    for path in sorted(files, key=lambda item: (-len(files[item]), item)):
+        shard_index = loads.index(min(loads))
+        shards[path] = shard_index
+        loads[shard_index] += len(files[path])
+
+    return shards
+
+
+__all__ = [
+    "SHARD_STRATEGIES",
+    "SHARD_STRATEGY_HASH",
+    "SHARD_STRATEGY_SIZE",
+    "select_shard",
+    "get_shard_file_name",
+    "find_shard_files",
+]
@@ -0,0 +1,123 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+from reviewer_stk_ai.src.utils.constants import APPLICATION_NAME, TOKEN_CACHE_PATH
+
+logger = logging.getLogger(APPLICATION_NAME)
+
+
+class TokenCache:
+    """
+    Access tokens shared by every process and run of the user.
+
+    The tokens are kept in a JSON file readable only by its owner, keyed by
+    a hash of the realm and client id. A token is handed out until its
+    refresh time, set before it expires, so no caller gets a token about to
+    expire. `lock` serializes the refresh between processes with an
+    exclusive lock on a sibling file, where flock is available, and between
+    threads of the process.
+
+    Attributes:
+        path (str): File of the cache, `~` is expanded.
+    """
+
+    _path: str
+    _lock: threading.Lock
+
+    def __init__(self, path: str = TOKEN_CACHE_PATH):
+        self._path = os.path.expanduser(path)
+        self._lock = threading.Lock()
+
+    def get(self, realm: str, client_id: str) -> Optional[Tuple[str, float]]:
+        """
+        Returns the token and its refresh time (epoch seconds), None when it
+        is missing or due for refresh.
+        """
+        entry = self._load().get(self._get_key(realm=realm, client_id=client_id))
+
+        if entry is None or entry["refresh_at"] <= time.time():
+            return None
+
+        return entry["token"], entry["refresh_at"]
+
+    def put(self, realm: str, client_id: str, token: str, refresh_at: float) -> None:
+        now = time.time()
+        entries = {
+            key: entry
+            for key, entry in self._load().items()
+            if entry["refresh_at"] > now
+        }
+        entries[self._get_key(realm=realm, client_id=client_id)] = {
+            "token": token,
+            "refresh_at": refresh_at,
+        }
+
+        self._write(entries=entries)
+
+    @contextmanager
+    def lock(self):
+        """
+        Held while a token is requested, so concurrent workers wait and read
+        the new token instead of requesting their own.
+        """
+        with self._lock:
+            self._create_directory()
+            descriptor = os.open(f"{self._path}.lock", os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                if fcntl is not None:
+                    fcntl.flock(descriptor, fcntl.LOCK_EX)
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(descriptor, fcntl.LOCK_UN)
+                os.close(descriptor)
+
+    def get_path(self) -> str:
+        return self._path
+
+    @staticmethod
+    def _get_key(realm: str, client_id: str) -> str:
+        return hashlib.sha256(f"{realm}\n{client_id}".encode("utf-8")).hexdigest()
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            with open(self._path, "r", encoding="utf-8") as file:
+                entries = json.load(file)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring token cache {self._path}: {e}")
+            return {}
+
+        return entries if isinstance(entries, dict) else {}
+
+    def _write(self, entries: Dict[str, Dict]) -> None:
+        self._create_directory()
+        temp_path = f"{self._path}.{os.getpid()}.tmp"
+
+        # Created readable by the owner only, then swapped in atomically
+        descriptor = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        os.chmod(temp_path, 0o600)
+        with os.fdopen(descriptor, "w", encoding="utf-8") as file:
+            json.dump(entries, file)
+
+        os.replace(temp_path, self._path)
+
+    def _create_directory(self) -> None:
+        directory = os.path.dirname(self._path)
+        if directory:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+
+
+__all__ = ["TokenCache"]
@@ -0,0 +1,260 @@
+import logging
+import os
+import sqlite3
+import time
+from typing import Dict, List, Optional
+
+from reviewer_stk_ai.src.models.file_review import FileReview
+from reviewer_stk_ai.src.utils.constants import (
+    APPLICATION_NAME,
+    DEFAULT_LEASE_SECONDS,
+    DEFAULT_QUEUE_MAX_ATTEMPTS,
+)
+
+logger = logging.getLogger(APPLICATION_NAME)
+
+STATUS_PENDING = "pending"
+STATUS_LEASED = "leased"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+
+class WorkQueue:
+    """
+    Durable queue of file reviews stored in SQLite, drained by any number of
+    worker processes sharing the database file.
+
+    A worker leases one review at a time. The lease expires after
+    `lease_seconds`, so reviews held by a crashed worker go back to the
+    queue. A review that failed `max_attempts` times, or whose last lease
+    expired, is marked as failed. A review queued again with another content
+    goes back to pending. Only the worker holding the lease completes or
+    fails a review, a worker whose lease was taken over leaves the review to
+    its new owner.
+
+    Attributes:
+        path (str): SQLite database file.
+        lease_seconds (float): Time a worker owns a review before losing it.
+        max_attempts (int): Leases allowed for each review.
+    """
+
+    _path: str
+    _lease_seconds: float
+    _max_attempts: int
+
+    def __init__(
+        self,
+        path: str,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        max_attempts: int = DEFAULT_QUEUE_MAX_ATTEMPTS,
+    ):
+        self._path = path
+        self._lease_seconds = lease_seconds
+        self._max_attempts = max_attempts
+
+        directory = os.path.dirname(self._path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS reviews ("
+                " name TEXT PRIMARY KEY,"
+                " content TEXT NOT NULL,"
+                " status TEXT NOT NULL,"
+                " worker_id TEXT,"
+                " lease_expires_at REAL,"
+                " attempts INTEGER NOT NULL DEFAULT 0,"
+                " execution_id TEXT,"
+                " llm_review TEXT,"
+                " error TEXT)"
+            )
+
+    def enqueue(self, file_reviews: List[FileReview]) -> int:
+        """
+        Adds the reviews not queued yet and resets the ones queued with
+        another content, returning how many were added or reset.
+        """
+        with self._connect() as connection:
+            cursor = connection.executemany(
+                "INSERT INTO reviews (name, content, status) VALUES (?, ?, ?)"
+                " ON CONFLICT (name) DO UPDATE SET content = excluded.content,"
+                " status = excluded.status, worker_id = NULL,"
+                " lease_expires_at = NULL, attempts = 0, execution_id = NULL,"
+                " llm_review = NULL, error = NULL"
+                " WHERE content != excluded.content",
+                [
+                    (review.name, review.content, STATUS_PENDING)
+                    for review in file_reviews
+                ],
+            )
+
+        logger.info(f"{cursor.rowcount} reviews added to the queue {self._path}")
+
+        return cursor.rowcount
+
+    def lease(self, worker_id: str) -> Optional[FileReview]:
+        """
+        Takes the next pending review, or one whose lease expired. Returns
+        None when there is nothing left to lease.
+        """
+        now = time.time()
+
+        with self._connect() as connection:
+            # Locks the database, so two workers never lease the same review
+            connection.execute("BEGIN IMMEDIATE")
+            expired = connection.execute(
+                "UPDATE reviews SET status = ?, lease_expires_at = NULL,"
+                " error = 'Lease expired on the last attempt'"
+                " WHERE status = ? AND lease_expires_at < ? AND attempts >= ?",
+                (STATUS_FAILED, STATUS_LEASED, now, self._max_attempts),
+            ).rowcount
+            if expired > 0:
+                logger.warning(f"{expired} reviews failed, their last lease expired")
+
+            row = connection.execute(
+                "SELECT name, content, attempts, worker_id FROM reviews"
+                " WHERE attempts < ? AND (status = ?"
+                " OR (status = ? AND lease_expires_at < ?))"
+                " ORDER BY rowid LIMIT 1",
+                (self._max_attempts, STATUS_PENDING, STATUS_LEASED, now),
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            name, content, attempts, previous_worker_id = row
+            connection.execute(
+                "UPDATE reviews SET status = ?, worker_id = ?, lease_expires_at = ?,"
+                " attempts = ? WHERE name = ?",
+                (
+                    STATUS_LEASED,
+                    worker_id,
+                    now + self._lease_seconds,
+                    attempts + 1,
+                    name,
+                ),
+            )
+
+        if previous_worker_id:
+            logger.info(f"Lease of {name} held by {previous_worker_id} expired")
+
+        return FileReview(name=name, content=content)
+
+    def complete(self, review: FileReview, worker_id: str) -> bool:
+        """
+        Stores the review leased by the worker. Returns False when the worker
+        lost the lease, the review is then left to the worker holding it.
+        """
+        with self._connect() as connection:
+            cursor = connection.execute(
+                "UPDATE reviews SET status = ?, lease_expires_at = NULL,"
+                " execution_id = ?, llm_review = ?, error = NULL"
+                " WHERE name = ? AND status = ? AND worker_id = ?",
+                (
+                    STATUS_DONE,
+                    review.execution_id,
+                    review.llm_review,
+                    review.name,
+                    STATUS_LEASED,
+                    worker_id,
+                ),
+            )
+
+        return self._is_held(cursor=cursor, review=review, worker_id=worker_id)
+
+    def fail(self, review: FileReview, worker_id: str, error: BaseException) -> bool:
+        """
+        Returns the review leased by the worker to the queue, or marks it as
+        failed when it ran out of attempts. Returns False when the worker
+        lost the lease.
+        """
+        with self._connect() as connection:
+            cursor = connection.execute(
+                "UPDATE reviews SET status = CASE WHEN attempts < ? THEN ? ELSE ? END,"
+                " lease_expires_at = NULL, error = ?"
+                " WHERE name = ? AND status = ? AND worker_id = ?",
+                (
+                    self._max_attempts,
+                    STATUS_PENDING,
+                    STATUS_FAILED,
+                    str(error),
+                    review.name,
+                    STATUS_LEASED,
+                    worker_id,
+                ),
+            )
+
+        return self._is_held(cursor=cursor, review=review, worker_id=worker_id)
+
+    @staticmethod
+    def _is_held(cursor: sqlite3.Cursor, review: FileReview, worker_id: str) -> bool:
+        # A worker leases one review at a time, so its id identifies the lease
+        if cursor.rowcount > 0:
+            return True
+
+        logger.warning(f"Lease of {review.name} held by {worker_id} was lost")
+        return False
+
+    def get_counts(self) -> Dict[str, int]:
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT status, COUNT(*) FROM reviews GROUP BY status"
+            ).fetchall()
+
+        return dict(rows)
+
+    def is_drained(self) -> bool:
+        counts = self.get_counts()
+        return counts.get(STATUS_PENDING, 0) + counts.get(STATUS_LEASED, 0) == 0
+
+    def find_completed(self) -> List[FileReview]:
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT name, execution_id, llm_review FROM reviews"
+                " WHERE status = ? ORDER BY rowid",
+                (STATUS_DONE,),
+            ).fetchall()
+
+        return [
+            FileReview(name=name, execution_id=execution_id, llm_review=llm_review)
+            for name, execution_id, llm_review in rows
+        ]
+
+    def _connect(self) -> "_Connection":
+        # Autocommit mode, transactions are opened explicitly where needed
+        return _Connection(
+            sqlite3.connect(self._path, timeout=30, isolation_level=None)
+        )
+
+
+class _Connection:
+    """
+    Commits (or rolls back) the open transaction and closes the connection
+    at the end of the with block.
+    """
+
+    def __init__(self, connection: sqlite3.Connection):
+        self._connection = connection
+
+    def __enter__(self) -> sqlite3.Connection:
+        return self._connection
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if self._connection.in_transaction:
+                if exc_type is None:
+                    self._connection.execute("COMMIT")
+                else:
+                    self._connection.execute("ROLLBACK")
+        finally:
+            self._connection.close()
+
+
+__all__ = [
+    "WorkQueue",
+    "STATUS_PENDING",
+    "STATUS_LEASED",
+    "STATUS_DONE",
+    "STATUS_FAILED",
+]
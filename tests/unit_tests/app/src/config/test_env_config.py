@@ -28,6 +28,7 @@ class TestEnvConfig(TestCase):
         self.assertEqual("zup", config.get_stk_realm())
         self.assertEqual("10", config.get_stk_retry_count_callback())
         self.assertEqual("10", config.get_stk_retry_timeout())
+        self.assertEqual("8", config.get_concurrency())
         self.assertEqual(
             {},
             config.get_proxies(),
@@ -43,6 +44,7 @@ class TestEnvConfig(TestCase):
             "realm": "zup",
             "retry_max_attempts": "10",
             "retry_timeout": "10",
+            "concurrency": "32",
             "http_proxy": "http://proxy.com",
             "https_proxy": "https://proxy.com",
             "host_stk_ai": "localhost:8080",
@@ -57,6 +59,7 @@ class TestEnvConfig(TestCase):
         self.assertEqual("zup", config.get_stk_realm())
         self.assertEqual("10", config.get_stk_retry_count_callback())
         self.assertEqual("10", config.get_stk_retry_timeout())
+        self.assertEqual("32", config.get_concurrency())
         self.assertEqual(
             {"http://": "http://proxy.com", "https://": "https://proxy.com"},
             config.get_proxies(),
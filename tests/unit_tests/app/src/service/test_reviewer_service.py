@@ -1,4 +1,7 @@
+import shutil
+import tempfile
 import unittest
+from concurrent.futures import Future
 from unittest import TestCase
 from unittest.mock import Mock, patch
 
@@ -24,21 +27,28 @@ def call_direct(func_var, execution_id):
 class TestReviewerService(TestCase):
     _mock_stk_execution_service = None
     _mock_stk_callback_service = None
-    _mock_pool = None
     _service = None
+    _temp_path = None
 
-    @patch("multiprocessing.Pool")
-    def setUp(self, mock_pool):
-        self._mock_pool = mock_pool
+    def setUp(self):
         self._mock_stk_execution_service = Mock()
         self._mock_stk_callback_service = Mock()
+        from src.service import reviewer_service
         from src.service.reviewer_service import ReviewerService
 
+        # Reviews stored by the runs stay out of the repository
+        self._temp_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self._temp_path, ignore_errors=True)
+        patch.object(reviewer_service, "TEMP_PATH_REVIEW", self._temp_path).start()
+
         self._service = ReviewerService(
             stk_execution_service=self._mock_stk_execution_service,
             stk_callback_service=self._mock_stk_callback_service,
         )
 
+    def tearDown(self):
+        patch.stopall()
+
     def test__when_one_review_received__then_return_one_review(self):
         # arrange
         review = FileReview(name=FILE_NAME_1, content=FILE_CONTENT_1)
@@ -66,15 +76,6 @@ class TestReviewerService(TestCase):
     def test__when_two_reviews_received__then_return_two_reviews(self):
 
         # arrange
-
-        mock_pool_instance = self._mock_pool.return_value
-        mock_pool_instance.map.return_value = [
-            {
-                "conversation_id": "02HYRHKFPF9PNNJQ91AKRX98PZ",
-                "review": RESPONSE_2,
-                "execution_id": EXECUTION_ID_2,
-            }
-        ]
         review_1 = FileReview(name=FILE_NAME_1, content=FILE_CONTENT_1)
         review_2 = FileReview(name=FILE_NAME_2, content=FILE_CONTENT_2)
 
@@ -88,7 +89,12 @@ class TestReviewerService(TestCase):
                 "conversation_id": "01HYRHKFPF9PNNJQ91AKRX98PZ",
                 "review": RESPONSE_1,
                 "execution_id": EXECUTION_ID_1,
-            }
+            },
+            {
+                "conversation_id": "01HYRHKFPF9PNNJQ91AKRX98PZ",
+                "review": RESPONSE_2,
+                "execution_id": EXECUTION_ID_2,
+            },
         ]
 
         # act
@@ -105,7 +111,38 @@ class TestReviewerService(TestCase):
         )
 
         self.assertEqual(2, self._mock_stk_execution_service.create.call_count)
-        self.assertEqual(1, self._mock_stk_callback_service.find.call_count)
+        self.assertEqual(2, self._mock_stk_callback_service.find.call_count)
+
+    def test__when_more_reviews_than_concurrency__then_review_all_files(self):
+        # arrange
+        from src.service.reviewer_service import ReviewerService
+
+        service = ReviewerService(
+            stk_execution_service=self._mock_stk_execution_service,
+            stk_callback_service=self._mock_stk_callback_service,
+            concurrency=2,
+        )
+        reviews = [
+            FileReview(name=f"dir/file_{index}.py", content=f"print({index})")
+            for index in range(5)
+        ]
+
+        self._mock_stk_execution_service.create.return_value = EXECUTION_ID_1
+        self._mock_stk_callback_service.find.return_value = {
+            "conversation_id": "01HYRHKFPF9PNNJQ91AKRX98PZ",
+            "review": RESPONSE_2,
+        }
+
+        # act
+        contents_by_name = service.run(file_reviews=reviews)
+
+        # assert
+        self.assertEqual(
+            {f"dir/file_{index}.py": RESPONSE_2 for index in range(5)},
+            contents_by_name,
+        )
+        self.assertEqual(5, self._mock_stk_execution_service.create.call_count)
+        self.assertEqual(5, self._mock_stk_callback_service.find.call_count)
 
     def test__when_no_file_received__then_return_empty_array(self):
         # arrange
@@ -119,6 +156,1244 @@ class TestReviewerService(TestCase):
         self._mock_stk_execution_service.create.assert_not_called()
         self._mock_stk_callback_service.find.assert_not_called()
 
+    def test__when_asyncio_engine__then_return_reviews(self):
+        # arrange
+        from src.service.reviewer_service import ReviewerService
+        from src.utils.constants import ENGINE_ASYNCIO
+
+        service = ReviewerService(
+            stk_execution_service=self._mock_stk_execution_service,
+            stk_callback_service=self._mock_stk_callback_service,
+            concurrency=1,
+            engine=ENGINE_ASYNCIO,
+        )
+        review_1 = FileReview(name=FILE_NAME_1, content=FILE_CONTENT_1)
+        review_2 = FileReview(name=FILE_NAME_2, content=FILE_CONTENT_2)
+
+        self._mock_stk_execution_service.create.side_effect = [
+            EXECUTION_ID_1,
+            EXECUTION_ID_2,
+        ]
+        self._mock_stk_callback_service.find.side_effect = [
+            {
+                "conversation_id": "01HYRHKFPF9PNNJQ91AKRX98PZ",
+                "review": RESPONSE_1,
+            },
+            {
+                "conversation_id": "01HYRHKFPF9PNNJQ91AKRX98PZ",
+                "review": RESPONSE_2,
+            },
+        ]
+
+        # act
+        contents_by_name = service.run(file_reviews=[review_1, review_2])
+
+        # assert
+        self.assertEqual(
+            {FILE_NAME_1: RESPONSE_1, FILE_NAME_2: RESPONSE_2}, contents_by_name
+        )
+        self.assertEqual(2, self._mock_stk_callback_service.find.call_count)
+
+    def test__when_poller__then_complete_reviews_from_its_futures(self):
+        # arrange
+        from src.service.reviewer_service import ReviewerService
+
+        mock_poller = Mock()
+        service = ReviewerService(
+            stk_execution_service=self._mock_stk_execution_service,
+            stk_callback_service=self._mock_stk_callback_service,
+            stk_callback_poller=mock_poller,
+            concurrency=2,
+        )
+        futures = {}
+
+        def submit(execution_id, **_):
+            futures[execution_id] = Future()
+            # Resolved only once both files are in flight
+            if len(futures) == 2:
+                for pending_id, future in futures.items():
+                    future.set_result(
+                        {
+                            "conversation_id": "01HYRHKFPF9PNNJQ91AKRX98PZ",
+                            "review": f"Review of {pending_id}",
+                        }
+                    )
+            return futures[execution_id]
+
+        mock_poller.submit.side_effect = submit
+        self._mock_stk_execution_service.create.side_effect = [
+            EXECUTION_ID_1,
+            EXECUTION_ID_2,
+        ]
+
+        # act
+        contents_by_name = service.run(
+            file_reviews=[
+                FileReview(name=FILE_NAME_1, content=FILE_CONTENT_1),
+                FileReview(name=FILE_NAME_2, content=FILE_CONTENT_2),
+            ]
+        )
+
+        # assert
+        self.assertCountEqual(
+            [f"Review of {EXECUTION_ID_1}", f"Review of {EXECUTION_ID_2}"],
+            contents_by_name.values(),
+        )
+        self.assertEqual(2, mock_poller.submit.call_count)
+        mock_poller.find.assert_not_called()
+
+    def test__when_asyncio_engine_adaptive__then_feed_controller_queue_time(self):
+        # arrange
+        import time
+
+        from src.service.reviewer_service import ReviewerService
+        from reviewer_stk_ai.src.utils.concurrency_controller import (
+            AdaptiveConcurrencyController,
+        )
+        from src.utils.constants import ENGINE_ASYNCIO
+
+        service = ReviewerService(
+            stk_execution_service=self._mock_stk_execution_service,
+            stk_callback_service=self._mock_stk_callback_service,
+            concurrency=2,
+            engine=ENGINE_ASYNCIO,
+            adaptive_concurrency=True,
+        )
+        on_success = patch.object(
+            AdaptiveConcurrencyController, "on_success", autospec=True
+        ).start()
+
+        self._mock_stk_execution_service.create.side_effect = [
+            EXECUTION_ID_1,
+            EXECUTION_ID_2,
+        ]
+        self._mock_stk_callback_service.find.return_value = {
+            "conversation_id": "01HYRHKFPF9PNNJQ91AKRX98PZ",
+            "review": RESPONSE_1,
+            "started_at": time.time() + 60,
+        }
+
+        # act
+        contents_by_name = service.run(
+            file_reviews=[
+                FileReview(name=FILE_NAME_1, content=FILE_CONTENT_1),
+                FileReview(name=FILE_NAME_2, content=FILE_CONTENT_2),
+            ]
+        )
+
+        # assert
+        self.assertEqual(
+            {FILE_NAME_1: RESPONSE_1, FILE_NAME_2: RESPONSE_1}, contents_by_name
+        )
+        self.assertEqual(2, on_success.call_count)
+        for call in on_success.call_args_list:
+            self.assertGreater(call.kwargs["queue_time"], 50)
+
+    def test__when_two_phase_engine__then_submit_all_before_polling(self):
+        # arrange
+        from src.service.reviewer_service import ReviewerService
+        from src.utils.constants import ENGINE_TWO_PHASE
+
+        service = ReviewerService(
+            stk_execution_service=self._mock_stk_execution_service,
+            stk_callback_service=self._mock_stk_callback_service,
+            engine=ENGINE_TWO_PHASE,
+        )
+        review_1 = FileReview(name=FILE_NAME_1, content=FILE_CONTENT_1)
+        review_2 = FileReview(name=FILE_NAME_2, content=FILE_CONTENT_2)
+        review_3 = FileReview(name="dir3/file.py", content="print(3)")
+
+        self._mock_stk_execution_service.create.side_effect = [
+            EXECUTION_ID_1,
+            EXECUTION_ID_2,
+            "03HYRHKFPFAZK1FFF8HVKWYEDQ",
+        ]
+        callbacks = {
+            EXECUTION_ID_1: {
+                "conversation_id": "01HYRHKFPF9PNNJQ91AKRX98PZ",
+                "review": RESPONSE_1,
+            },
+            EXECUTION_ID_2: {
+                "conversation_id": "01HYRHKFPF9PNNJQ91AKRX98PZ",
+                "review": RESPONSE_2,
+            },
+            "03HYRHKFPFAZK1FFF8HVKWYEDQ": {
+                "conversation_id": "01HYRHKFPF9PNNJQ91AKRX98PZ",
+                "review": RESPONSE_1,
+            },
+        }
+        submitted_when_polled = []
+
+        def find(execution_id, **_):
+            submitted_when_polled.append(
+                self._mock_stk_execution_service.create.call_count
+            )
+            return callbacks[execution_id]
+
+        self._mock_stk_callback_service.find.side_effect = find
+
+        # act
+        contents_by_name = service.run(file_reviews=[review_1, review_2, review_3])
+
+        # assert
+        self.assertEqual(
+            {
+                FILE_NAME_1: RESPONSE_1,
+                FILE_NAME_2: RESPONSE_2,
+                "dir3/file.py": RESPONSE_1,
+            },
+            contents_by_name,
+        )
+        self.assertEqual(3, self._mock_stk_execution_service.create.call_count)
+        self.assertEqual([3, 3, 3], submitted_when_polled)
+        self.assertCountEqual(
+            [EXECUTION_ID_1, EXECUTION_ID_2, "03HYRHKFPFAZK1FFF8HVKWYEDQ"],
+            [
+                call.kwargs["execution_id"]
+                for call in self._mock_stk_callback_service.find.call_args_list
+            ],
+        )
+
+    def _fail_review_of_file_2(self, on_submission: bool = False):
+        def create(file_content, **_):
+            if on_submission and file_content == FILE_CONTENT_2:
+                raise ValueError("Maximum number of attempts reached")
+            return EXECUTION_ID_1 if file_content == FILE_CONTENT_1 else EXECUTION_ID_2
+
+        def find(execution_id, **_):
+            if execution_id == EXECUTION_ID_2:
+                raise ValueError("Maximum number of attempts reached")
+            return {
+                "conversation_id": "01HYRHKFPF9PNNJQ91AKRX98PZ",
+                "review": RESPONSE_1,
+            }
+
+        self._mock_stk_execution_service.create.side_effect = create
+        self._mock_stk_callback_service.find.side_effect = find
+
+    def _run_failing_file_2(self, engine: str, on_submission: bool = False):
+        from src.service.reviewer_service import ReviewerService
+
+        service = ReviewerService(
+            stk_execution_service=self._mock_stk_execution_service,
+            stk_callback_service=self._mock_stk_callback_service,
+            engine=engine,
+        )
+        self._fail_review_of_file_2(on_submission=on_submission)
+
+        contents_by_name = service.run(
+            file_reviews=[
+                FileReview(name=FILE_NAME_1, content=FILE_CONTENT_1),
+                FileReview(name=FILE_NAME_2, content=FILE_CONTENT_2),
+            ]
+        )
+
+        return contents_by_name, service.get_summary()
+
+    def test__when_thread_engine_review_fails__then_fail_only_that_file(self):
+        # arrange
+        from src.utils.constants import ENGINE_THREAD
+
+        # act
+        contents_by_name, summary = self._run_failing_file_2(engine=ENGINE_THREAD)
+
+        # assert
+        self.assertEqual(RESPONSE_1, contents_by_name[FILE_NAME_1])
+        self.assertFalse(contents_by_name[FILE_NAME_2])
+        self.assertEqual([FILE_NAME_2], summary.failed)
+
+    def test__when_asyncio_engine_review_fails__then_fail_only_that_file(self):
+        # arrange
+        from src.utils.constants import ENGINE_ASYNCIO
+
+        # act
+        contents_by_name, summary = self._run_failing_file_2(engine=ENGINE_ASYNCIO)
+
+        # assert
+        self.assertEqual(RESPONSE_1, contents_by_name[FILE_NAME_1])
+        self.assertFalse(contents_by_name[FILE_NAME_2])
+        self.assertEqual([FILE_NAME_2], summary.failed)
+
+    def test__when_two_phase_submission_fails__then_fail_only_that_file(self):
+        # arrange
+        from src.utils.constants import ENGINE_TWO_PHASE
+
+        # act
+        contents_by_name, summary = self._run_failing_file_2(
+            engine=ENGINE_TWO_PHASE, on_submission=True
+        )
+
+        # assert
+        self.assertEqual(RESPONSE_1, contents_by_name[FILE_NAME_1])
+        self.assertFalse(contents_by_name[FILE_NAME_2])
+        self.assertEqual([FILE_NAME_2], summary.failed)
+
+    def test__when_two_phase_execution_fails__then_keep_completed_reviews(self):
+        # arrange
+        from src.service.reviewer_service import ReviewerService
+        from src.utils.constants import ENGINE_TWO_PHASE
+
+        service = ReviewerService(
+            stk_execution_service=self._mock_stk_execution_service,
+            stk_callback_service=self._mock_stk_callback_service,
+            engine=ENGINE_TWO_PHASE,
+        )
+        report_writer = Mock()
+
+        self._mock_stk_execution_service.create.side_effect = [
+            EXECUTION_ID_1,
+            EXECUTION_ID_2,
+        ]
+
+        def find(execution_id, **_):
+            if execution_id == EXECUTION_ID_2:
+                raise ValueError("Maximum number of attempts reached")
+            return {
+                "conversation_id": "01HYRHKFPF9PNNJQ91AKRX98PZ",
+                "review": RESPONSE_1,
+            }
+
+        self._mock_stk_callback_service.find.side_effect = find
+
+        # act
+        contents_by_name = service.run(
+            file_reviews=[
+                FileReview(name=FILE_NAME_1, content=FILE_CONTENT_1),
+                FileReview(name=FILE_NAME_2, content=FILE_CONTENT_2),
+            ],
+            report_writer=report_writer,
+        )
+
+        # assert
+        self.assertEqual(RESPONSE_1, contents_by_name[FILE_NAME_1])
+        report_writer.write.assert_called_once()
+        self.assertEqual([FILE_NAME_2], service.get_summary().failed)
+        self.assertEqual([], service.get_summary().timed_out)
+
+    def test__when_shared_conversation__then_first_review_opens_conversation(self):
+        # arrange
+        from src.service.reviewer_service import ReviewerService
+        from src.utils.constants import CONVERSATION_SHARED
+
+        service = ReviewerService(
+            stk_execution_service=self._mock_stk_execution_service,
+            stk_callback_service=self._mock_stk_callback_service,
+            conversation_mode=CONVERSATION_SHARED,
+        )
+        review_1 = FileReview(name=FILE_NAME_1, content=FILE_CONTENT_1)
+        review_2 = FileReview(name=FILE_NAME_2, content=FILE_CONTENT_2)
+
+        self._mock_stk_execution_service.create.side_effect = [
+            EXECUTION_ID_1,
+            EXECUTION_ID_2,
+        ]
+        self._mock_stk_callback_service.find.return_value = {
+            "conversation_id": "01HYRHKFPF9PNNJQ91AKRX98PZ",
+            "review": RESPONSE_1,
+        }
+
+        # act
+        service.run(file_reviews=[review_1, review_2])
+
+        # assert
+        self.assertEqual(
+            [None, "01HYRHKFPF9PNNJQ91AKRX98PZ"],
+            [
+                call.kwargs["conversation_id"] or None
+                for call in self._mock_stk_execution_service.create.call_args_list
+            ],
+        )
+        self._mock_stk_callback_service.find_conversation_id.assert_not_called()
+
+    def test__when_upfront_conversation__then_wait_only_for_conversation_id(self):
+        # arrange
+        from src.service.reviewer_service import ReviewerService
+        from src.utils.constants import CONVERSATION_UPFRONT
+
+        service = ReviewerService(
+            stk_execution_service=self._mock_stk_execution_service,
+            stk_callback_service=self._mock_stk_callback_service,
+            conversation_mode=CONVERSATION_UPFRONT,
+        )
+        review_1 = FileReview(name=FILE_NAME_1, content=FILE_CONTENT_1)
+        review_2 = FileReview(name=FILE_NAME_2, content=FILE_CONTENT_2)
+
+        self._mock_stk_execution_service.create.side_effect = [
+            EXECUTION_ID_1,
+            EXECUTION_ID_2,
+        ]
+        self._mock_stk_callback_service.find_conversation_id.return_value = (
+            "01HYRHKFPF9PNNJQ91AKRX98PZ"
+        )
+        self._mock_stk_callback_service.find.return_value = {
+            "conversation_id": "01HYRHKFPF9PNNJQ91AKRX98PZ",
+            "review": RESPONSE_1,
+        }
+
+        # act
+        service.run(file_reviews=[review_1, review_2])
+
+        # assert
+        self._mock_stk_callback_service.find_conversation_id.assert_called_once_with(
+            execution_id=EXECUTION_ID_1, deadline=None
+        )
+        self.assertEqual(2, self._mock_stk_execution_service.create.call_count)
+        self.assertEqual(
+            "01HYRHKFPF9PNNJQ91AKRX98PZ",
+            self._mock_stk_execution_service.create.call_args_list[1].kwargs[
+                "conversation_id"
+            ],
+        )
+        self.assertEqual(2, self._mock_stk_callback_service.find.call_count)
+
+    def test__when_upfront_conversation_is_resumed__then_open_it_with_execution_in_flight(
+        self,
+    ):
+        # arrange
+        import os
+
+        from src.service.reviewer_service import ReviewerService
+        from src.utils.constants import CONVERSATION_UPFRONT
+        from src.utils.run_journal import RunJournal
+
+        service = ReviewerService(
+            stk_execution_service=self._mock_stk_execution_service,
+            stk_callback_service=self._mock_stk_callback_service,
+            conversation_mode=CONVERSATION_UPFRONT,
+        )
+        journal_path = os.path.join(self._temp_path, "journal.jsonl")
+        review_1 = FileReview(name=FILE_NAME_1, content=FILE_CONTENT_1)
+        review_1.execution_id = EXECUTION_ID_1
+        RunJournal(path=journal_path).reset().record_submitted(review=review_1)
+
+        self._mock_stk_execution_service.create.return_value = EXECUTION_ID_2
+        self._mock_stk_callback_service.find_conversation_id.return_value = (
+            "01HYRHKFPF9PNNJQ91AKRX98PZ"
+        )
+        self._mock_stk_callback_service.find.return_value = {
+            "conversation_id": "01HYRHKFPF9PNNJQ91AKRX98PZ",
+            "review": RESPONSE_1,
+        }
+
+        # act
+        service.run(
+            file_reviews=[
+                FileReview(name=FILE_NAME_1, content=FILE_CONTENT_1),
+                FileReview(name=FILE_NAME_2, content=FILE_CONTENT_2),
+            ],
+            journal=RunJournal(path=journal_path).load(),
+        )
+
+        # assert
+        self._mock_stk_callback_service.find_conversation_id.assert_called_once_with(
+            execution_id=EXECUTION_ID_1, deadline=None
+        )
+        self._mock_stk_execution_service.create.assert_called_once_with(
+            file_content=FILE_CONTENT_2, conversation_id="01HYRHKFPF9PNNJQ91AKRX98PZ"
+        )
+
+    def test__when_upfront_conversation_past_deadline__then_submit_nothing(self):
+        # arrange
+        from src.service.reviewer_service import ReviewerService
+        from src.utils.constants import CONVERSATION_UPFRONT
+        from src.utils.deadline import Deadline
+
+        service = ReviewerService(
+            stk_execution_service=self._mock_stk_execution_service,
+            stk_callback_service=self._mock_stk_callback_service,
+            conversation_mode=CONVERSATION_UPFRONT,
+        )
+
+        # act
+        service.run(
+            file_reviews=[
+                FileReview(name=FILE_NAME_1, content=FILE_CONTENT_1),
+                FileReview(name=FILE_NAME_2, content=FILE_CONTENT_2),
+            ],
+            deadline=Deadline(seconds=600, grace=600),
+        )
+
+        # assert
+        self._mock_stk_execution_service.create.assert_not_called()
+        self._mock_stk_callback_service.find_conversation_id.assert_not_called()
+        self.assertEqual(
+            [FILE_NAME_1, FILE_NAME_2], sorted(service.get_summary().skipped)
+        )
+
+    def test__when_independent_conversation__then_no_conversation_is_shared(self):
+        # arrange
+        review_1 = FileReview(name=FILE_NAME_1, content=FILE_CONTENT_1)
+        review_2 = FileReview(name=FILE_NAME_2, content=FILE_CONTENT_2)
+
+        self._mock_stk_execution_service.create.return_value = EXECUTION_ID_1
+        self._mock_stk_callback_service.find.return_value = {
+            "conversation_id": "01HYRHKFPF9PNNJQ91AKRX98PZ",
+            "review": RESPONSE_1,
+        }
+
+        # act
+        self._service.run(file_reviews=[review_1, review_2])
+
+        # assert
+        for call in self._mock_stk_execution_service.create.call_args_list:
+            self.assertEqual("", call.kwargs["conversation_id"])
+
+    def test__when_adaptive_concurrency__then_review_all_files(self):
+        # arrange
+        from src.service.reviewer_service import ReviewerService
+
+        service = ReviewerService(
+            stk_execution_service=self._mock_stk_execution_service,
+            stk_callback_service=self._mock_stk_callback_service,
+            concurrency=4,
+            adaptive_concurrency=True,
+        )
+        reviews = [
+            FileReview(name=f"dir/file_{index}.py", content=f"print({index})")
+            for index in range(6)
+        ]
+
+        self._mock_stk_execution_service.create.return_value = EXECUTION_ID_1
+        self._mock_stk_callback_service.find.return_value = {
+            "conversation_id": "01HYRHKFPF9PNNJQ91AKRX98PZ",
+            "review": RESPONSE_1,
+        }
+
+        # act
+        contents_by_name = service.run(file_reviews=reviews)
+
+        # assert
+        self.assertEqual(6, len(contents_by_name))
+        self.assertEqual(6, self._mock_stk_callback_service.find.call_count)
+
+    def test__when_adaptive_concurrency_is_rate_limited__then_review_the_rest(self):
+        # arrange
+        from reviewer_stk_ai.src.exceptions.rate_limit_error import RateLimitError
+        from src.service.reviewer_service import ReviewerService
+
+        retry_policy = Mock()
+        service = ReviewerService(
+            stk_execution_service=self._mock_stk_execution_service,
+            stk_callback_service=self._mock_stk_callback_service,
+            concurrency=1,
+            adaptive_concurrency=True,
+            retry_policy=retry_policy,
+        )
+        reviews = [
+            FileReview(name=FILE_NAME_1, content=FILE_CONTENT_1),
+            FileReview(name=FILE_NAME_2, content=FILE_CONTENT_2),
+        ]
+
+        self._mock_stk_execution_service.create.side_effect = [
+            RateLimitError("429"),
+            EXECUTION_ID_2,
+        ]
+        self._mock_stk_callback_service.find.return_value = {
+            "conversation_id": "01HYRHKFPF9PNNJQ91AKRX98PZ",
+            "review": RESPONSE_2,
+        }
+
+        # act
+        contents_by_name = service.run(file_reviews=reviews)
+
+        # assert
+        self.assertEqual([FILE_NAME_1], service.get_summary().failed)
+        self.assertEqual(RESPONSE_2, contents_by_name[FILE_NAME_2])
+        listener = retry_policy.add_throttle_listener.call_args.args[0]
+        retry_policy.remove_throttle_listener.assert_called_once_with(listener)
+
+    def test__when_files_have_different_sizes__then_review_longest_first(self):
+        # arrange
+        from src.service.reviewer_service import ReviewerService
+
+        service = ReviewerService(
+            stk_execution_service=self._mock_stk_execution_service,
+            stk_callback_service=self._mock_stk_callback_service,
+            concurrency=1,
+        )
+        reviews = [
+            FileReview(name="small.py", content="a"),
+            FileReview(name="big.py", content="a" * 100),
+        ]
+
+        self._mock_stk_execution_service.create.return_value = EXECUTION_ID_1
+        self._mock_stk_callback_service.find.return_value = {
+            "conversation_id": "01HYRHKFPF9PNNJQ91AKRX98PZ",
+            "review": RESPONSE_1,
+        }
+
+        # act
+        service.run(file_reviews=reviews)
+
+        # assert
+        self.assertEqual(
+            ["a" * 100, "a"],
+            [
+                call.kwargs["file_content"]
+                for call in self._mock_stk_execution_service.create.call_args_list
+            ],
+        )
+        self.assertEqual(["big.py", "small.py"], service.get_summary().order)
+        self.assertIsNotNone(service.get_summary().makespan)
+
+    def test__when_files_resubmitted__then_schedule_every_round(self):
+        # arrange
+        from src.service import reviewer_service
+        from src.service.reviewer_service import ReviewerService
+
+        patch.object(
+            reviewer_service, "predict_makespan_seconds", return_value=10.0
+        ).start()
+        service = ReviewerService(
+            stk_execution_service=self._mock_stk_execution_service,
+            stk_callback_service=self._mock_stk_callback_service,
+            concurrency=1,
+            pack_size=1000,
+        )
+
+        self._mock_stk_execution_service.create.side_effect = [
+            "PACK",
+            EXECUTION_ID_1,
+            EXECUTION_ID_2,
+        ]
+        self._mock_stk_callback_service.find.side_effect = lambda execution_id, **_: {
+            "conversation_id": "01HYRHKFPF9PNNJQ91AKRX98PZ",
+            "review": f"Review of {execution_id}",
+        }
+
+        # act
+        service.run(
+            file_reviews=[
+                FileReview(name=FILE_NAME_1, content=FILE_CONTENT_1),
+                FileReview(name=FILE_NAME_2, content=FILE_CONTENT_2),
+            ]
+        )
+
+        # assert
+        summary = service.get_summary()
+        self.assertEqual(3, len(summary.order))
+        self.assertCountEqual([FILE_NAME_1, FILE_NAME_2], summary.order[1:])
+        self.assertEqual(20.0, summary.predicted_makespan)
+
+    def test__when_report_writer__then_add_each_review_when_done(self):
+        # arrange
+        review_1 = FileReview(name=FILE_NAME_1, content=FILE_CONTENT_1)
+        review_2 = FileReview(name=FILE_NAME_2, content=FILE_CONTENT_2)
+        report_writer = Mock()
+
+        self._mock_stk_execution_service.create.side_effect = [
+            EXECUTION_ID_1,
+            EXECUTION_ID_2,
+        ]
+        self._mock_stk_callback_service.find.return_value = {
+            "conversation_id": "01HYRHKFPF9PNNJQ91AKRX98PZ",
+            "review": RESPONSE_1,
+        }
+
+        # act
+        self._service.run(
+            file_reviews=[review_1, review_2], report_writer=report_writer
+        )
+
+        # assert
+        self.assertEqual(2, report_writer.write.call_count)
+        self.assertEqual(
+            {FILE_NAME_1, FILE_NAME_2},
+            {call.kwargs["review"].name for call in report_writer.write.call_args_list},
+        )
+
+    def test__when_deadline_close__then_skip_new_submissions(self):
+        # arrange
+        from src.utils.deadline import Deadline
+
+        review = FileReview(name=FILE_NAME_1, content=FILE_CONTENT_1)
+
+        # act
+        self._service.run(
+            file_reviews=[review], deadline=Deadline(seconds=600, grace=600)
+        )
+
+        # assert
+        self._mock_stk_execution_service.create.assert_not_called()
+        self.assertEqual([FILE_NAME_1], self._service.get_summary().skipped)
+        self.assertTrue(self._service.get_summary().is_partial())
+
+    def test__when_deadline_reached_while_polling__then_list_as_timed_out(self):
+        # arrange
+        from reviewer_stk_ai.src.exceptions.deadline_exceeded_error import (
+            DeadlineExceededError,
+        )
+        from src.utils.deadline import Deadline
+
+        review_1 = FileReview(name=FILE_NAME_1, content=FILE_CONTENT_1)
+        review_2 = FileReview(name=FILE_NAME_2, content=FILE_CONTENT_2)
+
+        self._mock_stk_execution_service.create.side_effect = [
+            EXECUTION_ID_1,
+            EXECUTION_ID_2,
+        ]
+
+        def find(execution_id, deadline):
+            if execution_id == EXECUTION_ID_2:
+                raise DeadlineExceededError("Run deadline reached")
+
+            return {"conversation_id": "", "review": RESPONSE_1}
+
+        self._mock_stk_callback_service.find.side_effect = find
+
+        # act
+        reviews_by_name = self._service.run(
+            file_reviews=[review_1, review_2], deadline=Deadline(seconds=600)
+        )
+
+        # assert
+        self.assertEqual(RESPONSE_1, reviews_by_name[FILE_NAME_1])
+        self.assertEqual([FILE_NAME_2], self._service.get_summary().timed_out)
+
+    def test__when_resumed__then_skip_completed_and_poll_in_flight(self):
+        # arrange
+        import os
+
+        from src.utils.run_journal import RunJournal
+
+        result = os.path.join(self._temp_path, EXECUTION_ID_1)
+        with open(result, "w", encoding="utf-8") as file:
+            file.write(f"File name: {FILE_NAME_1} \n\n{RESPONSE_1}")
+
+        review_1 = FileReview(name=FILE_NAME_1, content=FILE_CONTENT_1)
+        review_2 = FileReview(name=FILE_NAME_2, content=FILE_CONTENT_2)
+
+        journal = RunJournal(
+            path=os.path.join(self._temp_path, "journal.jsonl")
+        ).reset()
+        review_1.execution_id = EXECUTION_ID_1
+        journal.record_completed(review=review_1, result=result)
+        review_2.execution_id = EXECUTION_ID_2
+        journal.record_submitted(review=review_2)
+
+        self._mock_stk_callback_service.find.return_value = {
+            "conversation_id": "01HYRHKFPF9PNNJQ91AKRX98PZ",
+            "review": RESPONSE_2,
+        }
+
+        # act
+        reviews_by_name = self._service.run(
+            file_reviews=[
+                FileReview(name=FILE_NAME_1, content=FILE_CONTENT_1),
+                FileReview(name=FILE_NAME_2, content=FILE_CONTENT_2),
+            ],
+            journal=RunJournal(
+                path=os.path.join(self._temp_path, "journal.jsonl")
+            ).load(),
+        )
+
+        # assert
+        self.assertEqual(
+            {FILE_NAME_1: RESPONSE_1, FILE_NAME_2: RESPONSE_2}, reviews_by_name
+        )
+        self._mock_stk_execution_service.create.assert_not_called()
+        self._mock_stk_callback_service.find.assert_called_once()
+        self.assertEqual(
+            EXECUTION_ID_2,
+            self._mock_stk_callback_service.find.call_args.kwargs["execution_id"],
+        )
+
+    def test__when_callback_has_poll_statistics__then_add_to_summary(self):
+        # arrange
+        review = FileReview(name=FILE_NAME_1, content=FILE_CONTENT_1)
+
+        self._mock_stk_execution_service.create.return_value = EXECUTION_ID_1
+        self._mock_stk_callback_service.find.return_value = {
+            "conversation_id": "01HYRHKFPF9PNNJQ91AKRX98PZ",
+            "review": RESPONSE_1,
+            "polls": 3,
+            "time_to_result": 4.5,
+        }
+
+        # act
+        self._service.run(file_reviews=[review])
+
+        # assert
+        summary = self._service.get_summary()
+        self.assertEqual({FILE_NAME_1: 3}, summary.polls)
+        self.assertEqual({FILE_NAME_1: 4.5}, summary.times_to_result)
+        self.assertIn("Polls per execution: average 3.0, max 3", str(summary))
+
+    def test__when_minimize__then_send_minimized_content(self):
+        # arrange
+        from src.service.reviewer_service import ReviewerService
+
+        service = ReviewerService(
+            stk_execution_service=self._mock_stk_execution_service,
+            stk_callback_service=self._mock_stk_callback_service,
+            minimize=True,
+        )
+        content = "# License header\n\n\nimport os  # comment\n"
+        review = FileReview(name=FILE_NAME_1, content=content)
+        file_content_hash = review.file_content_hash
+
+        self._mock_stk_execution_service.create.return_value = EXECUTION_ID_1
+        self._mock_stk_callback_service.find.return_value = {
+            "conversation_id": "01HYRHKFPF9PNNJQ91AKRX98PZ",
+            "review": RESPONSE_1,
+        }
+
+        # act
+        service.run(file_reviews=[review])
+
+        # assert
+        self.assertEqual(
+            "\n\n\nimport os\n",
+            self._mock_stk_execution_service.create.call_args.kwargs["file_content"],
+        )
+        self.assertEqual(content, review.content)
+        self.assertEqual(file_content_hash, review.file_content_hash)
+        summary = service.get_summary()
+        self.assertEqual({FILE_NAME_1: len(content) - 13}, summary.bytes_saved)
+        self.assertIn("Bytes saved by minimization: 27 of 40 (68%)", str(summary))
+
+    def test__when_file_bigger_than_chunk_size__then_join_chunk_reviews(self):
+        # arrange
+        from src.service.reviewer_service import ReviewerService
+
+        service = ReviewerService(
+            stk_execution_service=self._mock_stk_execution_service,
+            stk_callback_service=self._mock_stk_callback_service,
+            chunk_size=20,
+        )
+        report_writer = Mock()
+        review = FileReview(
+            name=FILE_NAME_1, content="def a():\n    pass\n\n\ndef b():\n    pass\n"
+        )
+
+        self._mock_stk_execution_service.create.side_effect = [
+            EXECUTION_ID_1,
+            EXECUTION_ID_2,
+        ]
+        self._mock_stk_callback_service.find.side_effect = lambda execution_id, **_: {
+            "conversation_id": "01HYRHKFPF9PNNJQ91AKRX98PZ",
+            "review": f"Issue on line 2 of {execution_id}",
+        }
+
+        # act
+        contents_by_name = service.run(
+            file_reviews=[review], report_writer=report_writer
+        )
+
+        # assert
+        self.assertEqual(2, self._mock_stk_execution_service.create.call_count)
+        self.assertEqual(
+            {"def a():\n    pass\n\n\n", "def b():\n    pass\n"},
+            {
+                call.kwargs["file_content"]
+                for call in self._mock_stk_execution_service.create.call_args_list
+            },
+        )
+        self.assertTrue(contents_by_name[FILE_NAME_1].startswith("Lines 1-4:\n\n"))
+        self.assertIn("5-6:\n\nIssue on line 6 of", contents_by_name[FILE_NAME_1])
+        report_writer.write.assert_called_once_with(review=review)
+
+    def test__when_small_files__then_review_them_in_one_execution(self):
+        # arrange
+        from src.service.reviewer_service import ReviewerService
+
+        service = ReviewerService(
+            stk_execution_service=self._mock_stk_execution_service,
+            stk_callback_service=self._mock_stk_callback_service,
+            pack_size=1000,
+        )
+        report_writer = Mock()
+        review_1 = FileReview(name=FILE_NAME_1, content=FILE_CONTENT_1)
+        review_2 = FileReview(name=FILE_NAME_2, content=FILE_CONTENT_2)
+
+        self._mock_stk_execution_service.create.return_value = EXECUTION_ID_1
+        self._mock_stk_callback_service.find.return_value = {
+            "conversation_id": "01HYRHKFPF9PNNJQ91AKRX98PZ",
+            "review": f"===== FILE: {FILE_NAME_1} =====\n{RESPONSE_1}\n\n"
+            f"===== FILE: {FILE_NAME_2} =====\n{RESPONSE_2}",
+        }
+
+        # act
+        contents_by_name = service.run(
+            file_reviews=[review_1, review_2], report_writer=report_writer
+        )
+
+        # assert
+        self._mock_stk_execution_service.create.assert_called_once()
+        file_content = self._mock_stk_execution_service.create.call_args.kwargs[
+            "file_content"
+        ]
+        self.assertIn(
+            f"===== FILE: {FILE_NAME_1} =====\n{FILE_CONTENT_1}", file_content
+        )
+        self.assertIn(
+            f"===== FILE: {FILE_NAME_2} =====\n{FILE_CONTENT_2}", file_content
+        )
+        self.assertEqual(
+            {FILE_NAME_1: RESPONSE_1, FILE_NAME_2: RESPONSE_2}, contents_by_name
+        )
+        self.assertEqual(2, report_writer.write.call_count)
+
+    def test__when_files_have_same_content__then_review_content_once(self):
+        # arrange
+        from src.service.reviewer_service import ReviewerService
+
+        service = ReviewerService(
+            stk_execution_service=self._mock_stk_execution_service,
+            stk_callback_service=self._mock_stk_callback_service,
+        )
+        report_writer = Mock()
+        copy_name = f"vendor/{FILE_NAME_1}"
+
+        self._mock_stk_execution_service.create.return_value = EXECUTION_ID_1
+        self._mock_stk_callback_service.find.return_value = {
+            "conversation_id": "01HYRHKFPF9PNNJQ91AKRX98PZ",
+            "review": RESPONSE_1,
+        }
+
+        # act
+        contents_by_name = service.run(
+            file_reviews=[
+                FileReview(name=FILE_NAME_1, content=FILE_CONTENT_1),
+                FileReview(name=copy_name, content=FILE_CONTENT_1),
+            ],
+            report_writer=report_writer,
+        )
+
+        # assert
+        self._mock_stk_execution_service.create.assert_called_once()
+        self.assertEqual(RESPONSE_1, contents_by_name[FILE_NAME_1])
+        self.assertEqual(
+            f"Same content as {FILE_NAME_1}, reviewed once for both files."
+            f"\n\n{RESPONSE_1}",
+            contents_by_name[copy_name],
+        )
+        self.assertEqual(2, report_writer.write.call_count)
+        self.assertEqual({copy_name: FILE_NAME_1}, service.get_summary().duplicates)
+
+    def test__when_pack_review_not_split__then_review_files_alone(self):
+        # arrange
+        from src.service.reviewer_service import ReviewerService
+
+        service = ReviewerService(
+            stk_execution_service=self._mock_stk_execution_service,
+            stk_callback_service=self._mock_stk_callback_service,
+            pack_size=1000,
+        )
+        review_1 = FileReview(name=FILE_NAME_1, content=FILE_CONTENT_1)
+        review_2 = FileReview(name=FILE_NAME_2, content=FILE_CONTENT_2)
+
+        self._mock_stk_execution_service.create.side_effect = [
+            "PACK",
+            EXECUTION_ID_1,
+            EXECUTION_ID_2,
+        ]
+        self._mock_stk_callback_service.find.side_effect = lambda execution_id, **_: {
+            "conversation_id": "01HYRHKFPF9PNNJQ91AKRX98PZ",
+            "review": f"Review of {execution_id}",
+        }
+
+        # act
+        contents_by_name = service.run(file_reviews=[review_1, review_2])
+
+        # assert
+        self.assertEqual(3, self._mock_stk_execution_service.create.call_count)
+        self.assertEqual(
+            {
+                FILE_NAME_1: f"Review of {review_1.execution_id}",
+                FILE_NAME_2: f"Review of {review_2.execution_id}",
+            },
+            contents_by_name,
+        )
+        self.assertNotIn("PACK", [review_1.execution_id, review_2.execution_id])
+
+    def test__when_pack_review_not_split__then_resubmit_files_to_engine(self):
+        # arrange
+        from src.service.reviewer_service import ReviewerService
+        from src.utils.constants import ENGINE_TWO_PHASE
+
+        service = ReviewerService(
+            stk_execution_service=self._mock_stk_execution_service,
+            stk_callback_service=self._mock_stk_callback_service,
+            engine=ENGINE_TWO_PHASE,
+            pack_size=1000,
+        )
+
+        self._mock_stk_execution_service.create.side_effect = [
+            "PACK",
+            EXECUTION_ID_1,
+            EXECUTION_ID_2,
+        ]
+        self._mock_stk_callback_service.find.side_effect = lambda execution_id, **_: {
+            "conversation_id": "01HYRHKFPF9PNNJQ91AKRX98PZ",
+            "review": f"Review of {execution_id}",
+        }
+
+        # act
+        contents_by_name = service.run(
+            file_reviews=[
+                FileReview(name=FILE_NAME_1, content=FILE_CONTENT_1),
+                FileReview(name=FILE_NAME_2, content=FILE_CONTENT_2),
+            ]
+        )
+
+        # assert
+        self.assertEqual(3, self._mock_stk_callback_service.find.call_count)
+        self.assertCountEqual(
+            [f"Review of {EXECUTION_ID_1}", f"Review of {EXECUTION_ID_2}"],
+            contents_by_name.values(),
+        )
+
+    def test__when_files_resubmitted__then_count_each_cache_miss_once(self):
+        # arrange
+        from src.service.reviewer_service import ReviewerService
+        from src.utils.review_cache import ReviewCache
+
+        service = ReviewerService(
+            stk_execution_service=self._mock_stk_execution_service,
+            stk_callback_service=self._mock_stk_callback_service,
+            pack_size=1000,
+            review_cache=ReviewCache(directory=self._temp_path, namespace="qc"),
+        )
+
+        self._mock_stk_execution_service.create.side_effect = [
+            "PACK",
+            EXECUTION_ID_1,
+            EXECUTION_ID_2,
+        ]
+        self._mock_stk_callback_service.find.side_effect = lambda execution_id, **_: {
+            "conversation_id": "01HYRHKFPF9PNNJQ91AKRX98PZ",
+            "review": f"Review of {execution_id}",
+        }
+
+        # act
+        service.run(
+            file_reviews=[
+                FileReview(name=FILE_NAME_1, content=FILE_CONTENT_1),
+                FileReview(name=FILE_NAME_2, content=FILE_CONTENT_2),
+            ]
+        )
+
+        # assert
+        self.assertEqual(3, self._mock_stk_execution_service.create.call_count)
+        self.assertEqual(2, len(service.get_summary().cache_misses))
+        self.assertEqual([], service.get_summary().cache_hits)
+
+    def test__when_review_cached__then_skip_its_execution(self):
+        # arrange
+        from src.service.reviewer_service import ReviewerService
+        from src.utils.review_cache import ReviewCache
+
+        review_cache = ReviewCache(directory=self._temp_path, namespace="qc")
+        service = ReviewerService(
+            stk_execution_service=self._mock_stk_execution_service,
+            stk_callback_service=self._mock_stk_callback_service,
+            review_cache=review_cache,
+        )
+        report_writer = Mock()
+
+        self._mock_stk_execution_service.create.return_value = EXECUTION_ID_1
+        self._mock_stk_callback_service.find.return_value = {
+            "conversation_id": "01HYRHKFPF9PNNJQ91AKRX98PZ",
+            "review": RESPONSE_1,
+        }
+        service.run(file_reviews=[FileReview(name=FILE_NAME_1, content=FILE_CONTENT_1)])
+        self._mock_stk_execution_service.create.reset_mock()
+
+        # act
+        contents_by_name = service.run(
+            file_reviews=[
+                FileReview(name=FILE_NAME_2, content=FILE_CONTENT_1),
+            ],
+            report_writer=report_writer,
+        )
+
+        # assert
+        self._mock_stk_execution_service.create.assert_not_called()
+        self.assertEqual({FILE_NAME_2: RESPONSE_1}, contents_by_name)
+        report_writer.write.assert_called_once()
+        summary = service.get_summary()
+        self.assertEqual([FILE_NAME_2], summary.cache_hits)
+        self.assertIn("Review cache: 1 hits, 0 misses", str(summary))
+
+    def test__when_review_cache__then_claim_content_when_submitted(self):
+        # arrange
+        from src.service.reviewer_service import ReviewerService
+        from src.utils.review_cache import ReviewCache
+
+        other_job = ReviewCache(directory=self._temp_path, owner="other-job")
+        service = ReviewerService(
+            stk_execution_service=self._mock_stk_execution_service,
+            stk_callback_service=self._mock_stk_callback_service,
+            review_cache=ReviewCache(directory=self._temp_path, owner="this-job"),
+        )
+        options = {
+            "minimize": False,
+            "chunk_size": 0,
+            "pack_size": 0,
+            "conversation_mode": "independent",
+        }
+        claimed_on_submission = []
+
+        def create(file_content, conversation_id):
+            claimed_on_submission.append(
+                other_job.is_claimed(
+                    content_hash=FileReview(content=file_content).file_content_hash,
+                    options=options,
+                )
+            )
+            return EXECUTION_ID_1
+
+        self._mock_stk_execution_service.create.side_effect = create
+        self._mock_stk_callback_service.find.return_value = {
+            "conversation_id": "01HYRHKFPF9PNNJQ91AKRX98PZ",
+            "review": RESPONSE_1,
+        }
+
+        # act
+        service.run(file_reviews=[FileReview(name=FILE_NAME_1, content=FILE_CONTENT_1)])
+
+        # assert
+        self.assertEqual([True], claimed_on_submission)
+        self.assertTrue(
+            other_job.claim(
+                content_hash=FileReview(content=FILE_CONTENT_1).file_content_hash,
+                options=options,
+            )
+        )
+
+    def test__when_execution_not_completed__then_do_not_cache_it(self):
+        # arrange
+        from src.service.reviewer_service import ReviewerService
+        from src.utils.constants import INVALID_STATUS_REVIEW
+        from src.utils.review_cache import ReviewCache
+
+        review_cache = ReviewCache(directory=self._temp_path, namespace="qc")
+        service = ReviewerService(
+            stk_execution_service=self._mock_stk_execution_service,
+            stk_callback_service=self._mock_stk_callback_service,
+            review_cache=review_cache,
+        )
+
+        self._mock_stk_execution_service.create.return_value = EXECUTION_ID_1
+        self._mock_stk_callback_service.find.return_value = {
+            "conversation_id": "01HYRHKFPF9PNNJQ91AKRX98PZ",
+            "review": f"{INVALID_STATUS_REVIEW}{EXECUTION_ID_1}",
+        }
+
+        # act
+        service.run(file_reviews=[FileReview(name=FILE_NAME_1, content=FILE_CONTENT_1)])
+
+        # assert
+        self.assertEqual(0, review_cache.get_count())
+
+    @patch("src.service.reviewer_service.REVIEW_LEASE_POLL_SECONDS", 0.01)
+    def test__when_content_claimed_by_other_job__then_wait_for_its_review(self):
+        # arrange
+        import threading
+
+        from src.service.reviewer_service import ReviewerService
+        from src.utils.review_cache import ReviewCache
+
+        other_job = ReviewCache(directory=self._temp_path, owner="other-job")
+        other_job.claim(
+            content_hash=FileReview(content=FILE_CONTENT_1).file_content_hash,
+            options={
+                "minimize": False,
+                "chunk_size": 0,
+                "pack_size": 0,
+                "conversation_mode": "independent",
+            },
+        )
+        service = ReviewerService(
+            stk_execution_service=self._mock_stk_execution_service,
+            stk_callback_service=self._mock_stk_callback_service,
+            review_cache=ReviewCache(directory=self._temp_path, owner="this-job"),
+        )
+
+        self._mock_stk_execution_service.create.return_value = EXECUTION_ID_2
+        self._mock_stk_callback_service.find.return_value = {
+            "conversation_id": "01HYRHKFPF9PNNJQ91AKRX98PZ",
+            "review": RESPONSE_2,
+        }
+        threading.Timer(
+            0.1,
+            other_job.put,
+            kwargs={
+                "content_hash": FileReview(content=FILE_CONTENT_1).file_content_hash,
+                "review": RESPONSE_1,
+                "options": {
+                    "minimize": False,
+                    "chunk_size": 0,
+                    "pack_size": 0,
+                    "conversation_mode": "independent",
+                },
+            },
+        ).start()
+
+        # act
+        contents_by_name = service.run(
+            file_reviews=[
+                FileReview(name=FILE_NAME_1, content=FILE_CONTENT_1),
+                FileReview(name=FILE_NAME_2, content=FILE_CONTENT_2),
+            ]
+        )
+
+        # assert
+        self._mock_stk_execution_service.create.assert_called_once()
+        self.assertEqual(
+            {FILE_NAME_1: RESPONSE_1, FILE_NAME_2: RESPONSE_2}, contents_by_name
+        )
+        self.assertEqual([FILE_NAME_1], service.get_summary().awaited)
+
+    def test__when_work_queue__then_review_every_queued_file(self):
+        # arrange
+        import os
+
+        from src.utils.work_queue import WorkQueue, STATUS_DONE
+
+        work_queue = WorkQueue(path=os.path.join(self._temp_path, "queue.db"))
+        work_queue.enqueue(
+            file_reviews=[
+                FileReview(name=FILE_NAME_1, content=FILE_CONTENT_1),
+                FileReview(name=FILE_NAME_2, content=FILE_CONTENT_2),
+            ]
+        )
+
+        self._mock_stk_execution_service.create.side_effect = [
+            EXECUTION_ID_1,
+            EXECUTION_ID_2,
+        ]
+        self._mock_stk_callback_service.find.return_value = {
+            "conversation_id": "01HYRHKFPF9PNNJQ91AKRX98PZ",
+            "review": RESPONSE_1,
+        }
+
+        # act
+        reviewed = self._service.run_queue(work_queue=work_queue, worker_id="worker")
+
+        # assert
+        self.assertEqual(2, reviewed)
+        self.assertEqual({STATUS_DONE: 2}, work_queue.get_counts())
+        self.assertEqual(2, self._mock_stk_execution_service.create.call_count)
+
+    def test__when_work_queue__then_renew_cache_leases_while_draining(self):
+        # arrange
+        import os
+
+        from src.utils.work_queue import WorkQueue
+
+        work_queue = WorkQueue(path=os.path.join(self._temp_path, "queue.db"))
+        start_renewal = patch.object(self._service, "_start_lease_renewal").start()
+        release_leases = patch.object(self._service, "_release_leases").start()
+
+        # act
+        self._service.run_queue(work_queue=work_queue, worker_id="worker")
+
+        # assert
+        start_renewal.assert_called_once()
+        release_leases.assert_called_once()
+
 
 if __name__ == "__main__":
     unittest.main()
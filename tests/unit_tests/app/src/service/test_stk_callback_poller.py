@@ -0,0 +1,147 @@
+import threading
+import unittest
+from unittest import TestCase
+from unittest.mock import Mock
+
+import requests_mock
+from requests_mock import Mocker
+
+from reviewer_stk_ai.src.exceptions.deadline_exceeded_error import (
+    DeadlineExceededError,
+)
+from reviewer_stk_ai.src.exceptions.integration_error import IntegrationError
+from reviewer_stk_ai.src.service.stk_callback_poller import StkCallbackPoller
+from reviewer_stk_ai.src.service.stk_callback_service import StkCallbackService
+from reviewer_stk_ai.src.utils.deadline import Deadline
+from unit_tests.files.mock import read_json_file
+
+CALLBACK_URL = "http://localhost:8081/v1/quick-commands/callback/{execution_id}"
+
+
+class TestStkCallbackPoller(TestCase):
+    _mock_env_config: Mock = None
+    _mock_stk_token_service = None
+    _poller = None
+
+    def setUp(self):
+        self._mock_env_config = Mock()
+        self._mock_stk_token_service = Mock()
+
+        self._mock_env_config.get_proxies.return_value = {}
+        self._mock_env_config.get_stk_retry_count_callback.return_value = "10"
+        self._mock_env_config.get_stk_retry_timeout.return_value = "0"
+        self._mock_env_config.get_host_stk_ai.return_value = "http://localhost:8081"
+        self._mock_stk_token_service.generate_token.return_value = "bearer token"
+
+        self._poller = StkCallbackPoller(
+            env_config=self._mock_env_config,
+            stk_callback_service=StkCallbackService(
+                env_config=self._mock_env_config,
+                stk_token_service=self._mock_stk_token_service,
+            ),
+            max_connections=2,
+        )
+
+    def tearDown(self):
+        self._poller.close()
+
+    @requests_mock.Mocker()
+    def test__when_many_executions__then_resolve_every_future(
+        self, mock_request: Mocker
+    ):
+        # arrange
+        execution_ids = [f"{index:02d}HYRHKFPFAZK1FFF8HVKWYEDQ" for index in range(20)]
+        for execution_id in execution_ids:
+            mock_request.get(
+                CALLBACK_URL.format(execution_id=execution_id),
+                [
+                    {
+                        "json": read_json_file(
+                            "response/stk_callback_service/success_running.json"
+                        ),
+                        "status_code": 200,
+                    },
+                    {
+                        "json": read_json_file(
+                            "response/stk_callback_service/success_complete.json"
+                        ),
+                        "status_code": 200,
+                    },
+                ],
+            )
+
+        # act
+        futures = [
+            self._poller.submit(execution_id=execution_id)
+            for execution_id in execution_ids
+        ]
+        callbacks = [future.result(timeout=10) for future in futures]
+
+        # assert
+        self.assertEqual(
+            execution_ids, [callback["execution_id"] for callback in callbacks]
+        )
+        self.assertTrue(all(callback["polls"] == 2 for callback in callbacks))
+        self.assertEqual(40, mock_request.call_count)
+        self.assertEqual(0, self._poller.get_pending())
+        pollers = [
+            thread for thread in threading.enumerate() if "-poller_" in thread.name
+        ]
+        self.assertLessEqual(len(pollers), 2)
+
+    @requests_mock.Mocker()
+    def test__when_attempts_exhausted__then_fail_future(self, mock_request: Mocker):
+        # arrange
+        self._mock_env_config.get_stk_retry_count_callback.return_value = "2"
+        poller = StkCallbackPoller(
+            env_config=self._mock_env_config,
+            stk_callback_service=StkCallbackService(
+                env_config=self._mock_env_config,
+                stk_token_service=self._mock_stk_token_service,
+            ),
+        )
+        mock_request.get(
+            CALLBACK_URL.format(execution_id="02HYRHKFPFAZK1FFF8HVKWYEDQ"),
+            status_code=200,
+            json=read_json_file("response/stk_callback_service/success_running.json"),
+        )
+
+        # act
+        with self.assertRaises(ValueError) as ctx:
+            poller.find(execution_id="02HYRHKFPFAZK1FFF8HVKWYEDQ")
+        poller.close()
+
+        # assert
+        self.assertEqual("Maximum number of attempts reached", ctx.exception.args[0])
+        self.assertEqual(2, mock_request.call_count)
+
+    @requests_mock.Mocker()
+    def test__when_server_error__then_retry_before_failing(self, mock_request: Mocker):
+        # arrange
+        mock_request.get(
+            CALLBACK_URL.format(execution_id="02HYRHKFPFAZK1FFF8HVKWYEDQ"),
+            status_code=500,
+            text="error",
+        )
+
+        # act
+        with self.assertRaises(IntegrationError):
+            self._poller.find(execution_id="02HYRHKFPFAZK1FFF8HVKWYEDQ")
+
+        # assert
+        self.assertEqual(3, mock_request.call_count)
+
+    @requests_mock.Mocker()
+    def test__when_deadline_reached__then_fail_future(self, mock_request: Mocker):
+        # act
+        with self.assertRaises(DeadlineExceededError):
+            self._poller.find(
+                execution_id="02HYRHKFPFAZK1FFF8HVKWYEDQ", deadline=Deadline(seconds=0)
+            )
+
+        # assert
+        self.assertEqual(0, mock_request.call_count)
+
+
+if __name__ == "__main__":
+    unittest.main()
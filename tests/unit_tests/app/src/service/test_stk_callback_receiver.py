@@ -0,0 +1,171 @@
+import unittest
+from concurrent.futures import Future
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+import requests
+
+from reviewer_stk_ai.src.service.stk_callback_receiver import StkCallbackReceiver
+from reviewer_stk_ai.src.service.stk_callback_service import StkCallbackService
+from unit_tests.files.mock import read_json_file
+
+EXECUTION_ID = "01HYRHKFPFAZK1FFF8HVKWYEDQ"
+
+
+class TestStkCallbackReceiver(TestCase):
+    _mock_env_config: Mock = None
+    _mock_fallback: Mock = None
+    _receiver = None
+    _client = None
+
+    def setUp(self):
+        self._mock_env_config = Mock()
+        self._mock_env_config.get_proxies.return_value = {}
+        self._mock_env_config.get_stk_retry_count_callback.return_value = "10"
+        self._mock_env_config.get_stk_retry_timeout.return_value = "0"
+        self._mock_env_config.get_host_stk_ai.return_value = "http://localhost:8081"
+        self._mock_fallback = Mock()
+
+        self._receiver = StkCallbackReceiver(
+            stk_callback_service=StkCallbackService(env_config=self._mock_env_config),
+            fallback=self._mock_fallback,
+            timeout=60,
+        ).start()
+
+        # Stand-in for STK AI posting the completions
+        self._client = requests.Session()
+        self._client.trust_env = False
+
+    def tearDown(self):
+        self._client.close()
+        self._receiver.close()
+
+    def test__when_completion_posted__then_resolve_without_polling(self):
+        # arrange
+        future = self._receiver.submit(execution_id=EXECUTION_ID)
+
+        # act
+        response = self._client.post(
+            f"{self._receiver.get_url()}/{EXECUTION_ID}",
+            json=read_json_file("response/stk_callback_service/success_complete.json"),
+        )
+        callback = future.result(timeout=5)
+
+        # assert
+        self.assertEqual(204, response.status_code)
+        self.assertEqual(EXECUTION_ID, callback["execution_id"])
+        self.assertEqual("01HYRHKFPF9PNNJQ91AKRX98PZ", callback["conversation_id"])
+        self.assertEqual(0, callback["polls"])
+        self.assertEqual(0, self._receiver.get_pending())
+        self._mock_fallback.submit.assert_not_called()
+
+    def test__when_completion_posted_before_submit__then_resolve_on_submit(self):
+        # arrange
+        self._client.post(
+            self._receiver.get_url(),
+            json=read_json_file("response/stk_callback_service/success_complete.json"),
+        )
+
+        # act
+        callback = self._receiver.find(execution_id=EXECUTION_ID)
+
+        # assert
+        self.assertEqual(EXECUTION_ID, callback["execution_id"])
+        self._mock_fallback.submit.assert_not_called()
+
+    def test__when_running_posted__then_keep_waiting(self):
+        # arrange
+        future = self._receiver.submit(execution_id=EXECUTION_ID)
+
+        # act
+        response = self._client.post(
+            f"{self._receiver.get_url()}/{EXECUTION_ID}",
+            json=read_json_file("response/stk_callback_service/success_running.json"),
+        )
+
+        # assert
+        self.assertEqual(204, response.status_code)
+        self.assertFalse(future.done())
+        self.assertEqual(1, self._receiver.get_pending())
+
+    def test__when_no_notification__then_fall_back_to_polling(self):
+        # arrange
+        receiver = StkCallbackReceiver(
+            stk_callback_service=StkCallbackService(env_config=self._mock_env_config),
+            fallback=self._mock_fallback,
+            timeout=0,
+        ).start()
+        polled = Future()
+        polled.set_result({"execution_id": EXECUTION_ID, "polls": 3})
+        self._mock_fallback.submit.return_value = polled
+
+        # act
+        callback = receiver.find(execution_id=EXECUTION_ID)
+        receiver.close()
+
+        # assert
+        self.assertEqual(3, callback["polls"])
+        self._mock_fallback.submit.assert_called_once_with(
+            execution_id=EXECUTION_ID, deadline=None
+        )
+
+    def test__when_token_is_wrong__then_reject_notification(self):
+        # arrange
+        future = self._receiver.submit(execution_id=EXECUTION_ID)
+        url = self._receiver.get_url().rpartition("/")[0]
+
+        # act
+        without_token = self._client.post(
+            url,
+            json=read_json_file("response/stk_callback_service/success_complete.json"),
+        )
+        wrong_token = self._client.post(
+            f"{url}/wrong/{EXECUTION_ID}",
+            json=read_json_file("response/stk_callback_service/success_complete.json"),
+        )
+
+        # assert
+        self.assertEqual(403, without_token.status_code)
+        self.assertEqual(403, wrong_token.status_code)
+        self.assertFalse(future.done())
+
+    def test__when_unknown_executions_notified__then_keep_only_recent_ones(self):
+        # arrange
+        from reviewer_stk_ai.src.service import stk_callback_receiver
+
+        execution_data = read_json_file(
+            "response/stk_callback_service/success_complete.json"
+        )
+
+        # act
+        with patch.object(stk_callback_receiver, "MAX_RECEIVED", 2):
+            for index in range(3):
+                self._receiver.notify(
+                    execution_id=f"{index}{EXECUTION_ID[1:]}",
+                    execution_data=execution_data,
+                )
+
+        # assert
+        self.assertEqual(
+            [f"1{EXECUTION_ID[1:]}", f"2{EXECUTION_ID[1:]}"],
+            list(self._receiver._received.keys()),
+        )
+
+    def test__when_invalid_notification__then_reject_it(self):
+        # act
+        not_found = self._client.post(
+            self._receiver.get_url().replace("/callback", "/other"), json={}
+        )
+        without_id = self._client.post(self._receiver.get_url(), json={})
+        invalid = self._client.post(
+            f"{self._receiver.get_url()}/{EXECUTION_ID}", data="not json"
+        )
+
+        # assert
+        self.assertEqual(404, not_found.status_code)
+        self.assertEqual(400, without_id.status_code)
+        self.assertEqual(400, invalid.status_code)
+
+
+if __name__ == "__main__":
+    unittest.main()
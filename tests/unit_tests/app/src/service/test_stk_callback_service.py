@@ -1,11 +1,15 @@
 import unittest
+from datetime import datetime
 from unittest import TestCase
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 import requests_mock
 from requests_mock import Mocker
 
 from reviewer_stk_ai.src.exceptions.authentication_error import AuthenticationError
+from reviewer_stk_ai.src.exceptions.deadline_exceeded_error import (
+    DeadlineExceededError,
+)
 from reviewer_stk_ai.src.exceptions.integration_contract_error import (
     IntegrationContractError,
 )
@@ -14,6 +18,7 @@ from reviewer_stk_ai.src.exceptions.service_permission_error import (
     ServicePermissionError,
 )
 from reviewer_stk_ai.src.service.stk_callback_service import StkCallbackService
+from reviewer_stk_ai.src.utils.deadline import Deadline
 from unit_tests.files.mock import read_json_file
 
 
@@ -65,6 +70,12 @@ class TestStkCallbackService(TestCase):
         response = self._service.find(execution_id="02HYRHKFPFAZK1FFF8HVKWYEDQ")
 
         # assert
+        self.assertEqual(2, response.pop("polls"))
+        self.assertGreaterEqual(response.pop("time_to_result"), 0)
+        self.assertEqual(
+            datetime.fromisoformat("2024-05-25T18:53:25.583723+00:00").timestamp(),
+            response.pop("started_at"),
+        )
         self.assertEqual(
             {
                 "conversation_id": "01HYRHKFPF9PNNJQ91AKRX98PZ",
@@ -77,6 +88,46 @@ class TestStkCallbackService(TestCase):
         )
         self._mock_stk_token_service.generate_token.assert_called_once()
 
+    @requests_mock.Mocker()
+    def test__when_find_conversation_id__then_return_without_waiting_completion(
+        self, mock_request: Mocker
+    ):
+        # arrange
+        self._mock_stk_token_service.generate_token.return_value = "bearer token"
+
+        mock_request.get(
+            url="http://localhost:8081/v1/quick-commands/callback/02HYRHKFPFAZK1FFF8HVKWYEDQ",
+            status_code=200,
+            json=read_json_file("response/stk_callback_service/success_running.json"),
+        )
+        # act
+        conversation_id = self._service.find_conversation_id(
+            execution_id="02HYRHKFPFAZK1FFF8HVKWYEDQ"
+        )
+
+        # assert
+        self.assertEqual("01HYRHKFPF9PNNJQ91AKRX98PZ", conversation_id)
+        self.assertEqual(1, mock_request.call_count)
+
+    @requests_mock.Mocker()
+    def test__when_check_running_execution__then_return_none(
+        self, mock_request: Mocker
+    ):
+        # arrange
+        self._mock_stk_token_service.generate_token.return_value = "bearer token"
+
+        mock_request.get(
+            url="http://localhost:8081/v1/quick-commands/callback/02HYRHKFPFAZK1FFF8HVKWYEDQ",
+            status_code=200,
+            json=read_json_file("response/stk_callback_service/success_running.json"),
+        )
+        # act
+        response = self._service.check(execution_id="02HYRHKFPFAZK1FFF8HVKWYEDQ")
+
+        # assert
+        self.assertIsNone(response)
+        self.assertEqual(1, mock_request.call_count)
+
     @requests_mock.Mocker()
     def test__when_hits_max_number_of_retries__then_return_error(
         self, mock_request: Mocker
@@ -104,6 +155,79 @@ class TestStkCallbackService(TestCase):
         self.assertEqual("Maximum number of attempts reached", ctx.exception.args[0])
         self._mock_stk_token_service.generate_token.assert_called_once()
 
+    @requests_mock.Mocker()
+    def test__when_execution_completes_fast__then_check_without_waiting(
+        self, mock_request: Mocker
+    ):
+        # arrange
+        self._mock_stk_token_service.generate_token.return_value = "bearer token"
+        self._mock_env_config.get_stk_retry_timeout.return_value = "10"
+        service = StkCallbackService(
+            env_config=self._mock_env_config,
+            stk_token_service=self._mock_stk_token_service,
+        )
+
+        mock_request.get(
+            url="http://localhost:8081/v1/quick-commands/callback/02HYRHKFPFAZK1FFF8HVKWYEDQ",
+            status_code=200,
+            json=read_json_file("response/stk_callback_service/success_complete.json"),
+        )
+        # act
+        with patch(
+            "reviewer_stk_ai.src.service.stk_callback_service.time.sleep"
+        ) as sleep:
+            response = service.find(execution_id="02HYRHKFPFAZK1FFF8HVKWYEDQ")
+
+        # assert
+        sleep.assert_called_once_with(0.0)
+        self.assertEqual(1, response["polls"])
+
+    @requests_mock.Mocker()
+    def test__when_deadline_reached__then_stop_polling(self, mock_request: Mocker):
+        # arrange
+        self._mock_stk_token_service.generate_token.return_value = "bearer token"
+
+        mock_request.get(
+            url="http://localhost:8081/v1/quick-commands/callback/02HYRHKFPFAZK1FFF8HVKWYEDQ",
+            status_code=200,
+            json=read_json_file("response/stk_callback_service/success_running.json"),
+        )
+        # act
+        with self.assertRaises(DeadlineExceededError):
+            self._service.find(
+                execution_id="02HYRHKFPFAZK1FFF8HVKWYEDQ",
+                deadline=Deadline(seconds=0),
+            )
+
+        # assert
+        self.assertEqual(0, mock_request.call_count)
+
+    @requests_mock.Mocker()
+    def test__when_deadline_reached_before_conversation__then_stop_waiting(
+        self, mock_request: Mocker
+    ):
+        # arrange
+        self._mock_stk_token_service.generate_token.return_value = "bearer token"
+
+        execution_data = read_json_file(
+            "response/stk_callback_service/success_running.json"
+        )
+        execution_data["conversation_id"] = None
+        mock_request.get(
+            url="http://localhost:8081/v1/quick-commands/callback/02HYRHKFPFAZK1FFF8HVKWYEDQ",
+            status_code=200,
+            json=execution_data,
+        )
+        # act
+        with self.assertRaises(DeadlineExceededError):
+            self._service.find_conversation_id(
+                execution_id="02HYRHKFPFAZK1FFF8HVKWYEDQ",
+                deadline=Deadline(seconds=0),
+            )
+
+        # assert
+        self.assertEqual(1, mock_request.call_count)
+
     @requests_mock.Mocker()
     def test__when_return_execution_fail__then_return_response(
         self, mock_request: Mocker
@@ -122,6 +246,8 @@ class TestStkCallbackService(TestCase):
         response = self._service.find(execution_id="02HYRHKFPFAZK1FFF8HVKWYEDQ")
 
         # assert
+        self.assertEqual(1, response.pop("polls"))
+        self.assertGreaterEqual(response.pop("time_to_result"), 0)
         self.assertEqual(
             {
                 "conversation_id": "01HYRHKFPF9PNNJQ91AKRX98PZ",
@@ -213,7 +339,8 @@ class TestStkCallbackService(TestCase):
         self.assertIn(
             "Failed to integrate with STK AI result API", ctx.exception.args[0]
         )
-        self.assertEqual(3, self._mock_stk_token_service.generate_token.call_count)
+        self.assertEqual(1, self._mock_stk_token_service.generate_token.call_count)
+        self.assertEqual(3, mock_request.call_count)
 
     @requests_mock.Mocker()
     def test__when_generate_token_fails__then_return_error(self, mock_request: Mocker):
@@ -228,7 +355,7 @@ class TestStkCallbackService(TestCase):
 
         # assert
         self.assertEqual("Failed to generate token", ctx.exception.args[0])
-        self.assertEqual(3, self._mock_stk_token_service.generate_token.call_count)
+        self.assertEqual(1, self._mock_stk_token_service.generate_token.call_count)
         self.assertEqual(0, mock_request.call_count)
 
 
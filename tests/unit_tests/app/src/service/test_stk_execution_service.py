@@ -10,6 +10,7 @@ from reviewer_stk_ai.src.exceptions.integration_contract_error import (
     IntegrationContractError,
 )
 from reviewer_stk_ai.src.exceptions.integration_error import IntegrationError
+from reviewer_stk_ai.src.exceptions.rate_limit_error import RateLimitError
 from reviewer_stk_ai.src.service.stk_execution_service import StkExecutionService
 from unit_tests.files.mock import read_json_file
 
@@ -76,6 +77,57 @@ class TestStkExecutionService(TestCase):
         self.assertEqual("01HYRHKFPFAZK1FFF8HVKWYEDN", execution_id)
         self._mock_stk_token_service.generate_token.assert_called_once()
 
+    @requests_mock.Mocker()
+    def test__when_rate_limiter_configured__then_take_a_token_per_request(
+        self, mock_request: Mocker
+    ):
+        # arrange
+        mock_rate_limiter = Mock()
+        service = StkExecutionService(
+            env_config=self._mock_env_config,
+            stk_token_service=self._mock_stk_token_service,
+            rate_limiter=mock_rate_limiter,
+        )
+        self._mock_stk_token_service.generate_token.return_value = "bearer token"
+        mock_request.post(
+            url="http://localhost:8081/v1/quick-commands/create-execution/quick-command-remote",
+            status_code=200,
+            json=read_json_file("response/stk_execution_service/success.json"),
+        )
+        # act
+        service.create(file_content="content")
+
+        # assert
+        mock_rate_limiter.acquire.assert_called_once()
+
+    @requests_mock.Mocker()
+    def test__when_callback_url_configured__then_send_it_with_the_execution(
+        self, mock_request: Mocker
+    ):
+        # arrange
+        service = StkExecutionService(
+            env_config=self._mock_env_config,
+            stk_token_service=self._mock_stk_token_service,
+            callback_url="http://127.0.0.1:8080/callback",
+        )
+        self._mock_stk_token_service.generate_token.return_value = "bearer token"
+        mock_request.post(
+            url="http://localhost:8081/v1/quick-commands/create-execution/quick-command-remote",
+            status_code=200,
+            json=read_json_file("response/stk_execution_service/success.json"),
+        )
+        # act
+        service.create(file_content="content")
+
+        # assert
+        self.assertEqual(
+            {
+                "input_data": "content",
+                "callback_url": "http://127.0.0.1:8080/callback",
+            },
+            mock_request.last_request.json(),
+        )
+
     @requests_mock.Mocker()
     def test__when_required_fields_filled_and_return_400__then_return_error(
         self, mock_request: Mocker
@@ -119,6 +171,25 @@ class TestStkExecutionService(TestCase):
         )
         self._mock_stk_token_service.generate_token.assert_called_once()
 
+    @requests_mock.Mocker()
+    def test__when_required_fields_filled_and_return_429__then_return_error(
+        self, mock_request: Mocker
+    ):
+        # arrange
+        self._mock_stk_token_service.generate_token.return_value = "bearer token"
+
+        mock_request.post(
+            url="http://localhost:8081/v1/quick-commands/create-execution/quick-command-remote",
+            status_code=429,
+        )
+        # act
+        with self.assertRaises(RateLimitError) as ctx:
+            self._service.create(file_content="content")
+
+        # assert
+        self.assertIn("Rate limit reached on execution API", ctx.exception.args[0])
+        self.assertEqual(3, mock_request.call_count)
+
     @requests_mock.Mocker()
     def test__when_required_fields_filled_and_return_500__then_return_error(
         self, mock_request: Mocker
@@ -136,7 +207,8 @@ class TestStkExecutionService(TestCase):
 
         # assert
         self.assertIn("Integration with execution API failed", ctx.exception.args[0])
-        self.assertEqual(3, self._mock_stk_token_service.generate_token.call_count)
+        self.assertEqual(1, self._mock_stk_token_service.generate_token.call_count)
+        self.assertEqual(3, mock_request.call_count)
 
     @requests_mock.Mocker()
     def test__when_token_generation_fails__then_return_error(
@@ -153,7 +225,7 @@ class TestStkExecutionService(TestCase):
 
         # assert
         self.assertEqual("Token generation failure", ctx.exception.args[0])
-        self.assertEqual(3, self._mock_stk_token_service.generate_token.call_count)
+        self.assertEqual(1, self._mock_stk_token_service.generate_token.call_count)
         self.assertEqual(0, mock_request.call_count)
 
 
@@ -1,3 +1,6 @@
+import os
+import tempfile
+import threading
 import time
 import unittest
 from unittest import TestCase
@@ -12,6 +15,7 @@ from reviewer_stk_ai.src.exceptions.integration_contract_error import (
 )
 from reviewer_stk_ai.src.exceptions.integration_error import IntegrationError
 from reviewer_stk_ai.src.service.stk_token_service import StkTokenService
+from reviewer_stk_ai.src.utils.token_cache import TokenCache
 from unit_tests.files.mock import read_json_file
 
 
@@ -107,6 +111,100 @@ class TestStkTokenService(TestCase):
         self.assertEqual("Bearer access_token_value", new_token)
         self.assertEqual(2, mock_request.call_count)
 
+    @requests_mock.Mocker()
+    def test__when_token_issued__then_refresh_before_it_expires(
+        self, mock_request: Mocker
+    ):
+        # arrange
+        mock_request.post(
+            url="http://localhost:8080/realm_value/oidc/oauth/token",
+            status_code=200,
+            json=read_json_file("response/stk_token_service/success.json"),
+        )
+        shared_token_cache = TokenCache(
+            path=os.path.join(tempfile.mkdtemp(), "tokens.json")
+        )
+        service = StkTokenService(
+            env_config=self._mock_env_config, shared_token_cache=shared_token_cache
+        )
+
+        # act
+        service.generate_token()
+
+        # assert
+        _, refresh_at = shared_token_cache.get(
+            realm="realm_value", client_id="client_id_value"
+        )
+        self.assertAlmostEqual(1199 * 0.8, refresh_at - time.time(), delta=5)
+
+    @requests_mock.Mocker()
+    def test__when_shared_cache__then_request_one_token_for_every_process(
+        self, mock_request: Mocker
+    ):
+        # arrange
+        mock_request.post(
+            url="http://localhost:8080/realm_value/oidc/oauth/token",
+            status_code=200,
+            json=read_json_file("response/stk_token_service/success.json"),
+        )
+        path = os.path.join(tempfile.mkdtemp(), "tokens.json")
+        services = [
+            StkTokenService(
+                env_config=self._mock_env_config,
+                shared_token_cache=TokenCache(path=path),
+            )
+            for _ in range(8)
+        ]
+        tokens = []
+
+        # act
+        threads = [
+            threading.Thread(target=lambda s=service: tokens.append(s.generate_token()))
+            for service in services
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # assert
+        self.assertEqual(["Bearer access_token_value"] * 8, tokens)
+        self.assertEqual(1, mock_request.call_count)
+
+    @requests_mock.Mocker()
+    def test__when_shared_token_due_for_refresh__then_request_a_new_one(
+        self, mock_request: Mocker
+    ):
+        # arrange
+        mock_request.post(
+            url="http://localhost:8080/realm_value/oidc/oauth/token",
+            status_code=200,
+            json=read_json_file("response/stk_token_service/success.json"),
+        )
+        shared_token_cache = TokenCache(
+            path=os.path.join(tempfile.mkdtemp(), "tokens.json")
+        )
+        shared_token_cache.put(
+            realm="realm_value",
+            client_id="client_id_value",
+            token="Bearer old_token",
+            refresh_at=time.time() - 1,
+        )
+        service = StkTokenService(
+            env_config=self._mock_env_config, shared_token_cache=shared_token_cache
+        )
+
+        # act
+        token = service.generate_token()
+
+        # assert
+        self.assertEqual("Bearer access_token_value", token)
+        self.assertEqual(
+            "Bearer access_token_value",
+            shared_token_cache.get(realm="realm_value", client_id="client_id_value")[0],
+        )
+        self.assertEqual(1, mock_request.call_count)
+
     @requests_mock.Mocker()
     def test__when_required_fields_filled_and_returns_400__then_return_error(
         self, mock_request: Mocker
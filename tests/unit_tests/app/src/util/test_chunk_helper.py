@@ -0,0 +1,78 @@
+import unittest
+from unittest import TestCase
+
+from reviewer_stk_ai.src.utils.chunk_helper import shift_line_numbers, split_content
+
+PYTHON_CONTENT = """import os
+
+
+def first():
+    return 1
+
+
+@decorator
+def second():
+    return 2
+
+
+class Third:
+    def method_a(self):
+        return "a"
+
+    def method_b(self):
+        return "b"
+"""
+
+
+class TestChunkHelper(TestCase):
+
+    def test__split_content__when_small__then_return_whole_content(self):
+        # act
+        chunks = split_content(content="x = 1\n", file_name="a.py", max_size=100)
+
+        # assert
+        self.assertEqual([(1, "x = 1\n")], chunks)
+
+    def test__split_content__when_python__then_split_between_statements(self):
+        # act
+        chunks = split_content(content=PYTHON_CONTENT, file_name="a.py", max_size=70)
+
+        # assert
+        self.assertEqual([1, 8, 13, 17], [first_line for first_line, _ in chunks])
+        self.assertTrue(chunks[1][1].startswith("@decorator\ndef second():"))
+        self.assertTrue(chunks[2][1].startswith("class Third:\n    def method_a"))
+        self.assertTrue(chunks[3][1].startswith("    def method_b(self):"))
+        self.assertEqual(PYTHON_CONTENT, "".join(content for _, content in chunks))
+
+    def test__split_content__when_not_python__then_split_between_paragraphs(self):
+        # arrange
+        content = "first line\nsecond line\n\nthird line\n"
+
+        # act
+        chunks = split_content(content=content, file_name="a.md", max_size=30)
+
+        # assert
+        self.assertEqual(
+            [(1, "first line\nsecond line\n\n"), (4, "third line\n")], chunks
+        )
+
+    def test__split_content__when_block_too_big__then_split_between_lines(self):
+        # arrange
+        content = "a = 1\nb = 2\nc = 3\n"
+
+        # act
+        chunks = split_content(content=content, file_name="a.txt", max_size=12)
+
+        # assert
+        self.assertEqual([(1, "a = 1\nb = 2\n"), (3, "c = 3\n")], chunks)
+
+    def test__shift_line_numbers__then_move_every_line_reference(self):
+        # act
+        text = shift_line_numbers("Line 3 and lines 5-7 use x.", offset=100)
+
+        # assert
+        self.assertEqual("Line 103 and lines 105-107 use x.", text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+import time
+import unittest
+from unittest import TestCase
+
+from reviewer_stk_ai.src.exceptions.integration_contract_error import (
+    IntegrationContractError,
+)
+from reviewer_stk_ai.src.exceptions.integration_error import IntegrationError
+from reviewer_stk_ai.src.exceptions.rate_limit_error import RateLimitError
+from reviewer_stk_ai.src.utils.concurrency_controller import (
+    AdaptiveConcurrencyController,
+)
+
+
+class TestAdaptiveConcurrencyController(TestCase):
+
+    def test__when_executions_succeed__then_raise_limit_up_to_max(self):
+        controller = AdaptiveConcurrencyController(max_limit=4, initial_limit=1)
+
+        for _ in range(10):
+            started_at = controller.acquire()
+            controller.on_success(started_at=started_at)
+            controller.release()
+
+        self.assertEqual(4, controller.get_limit())
+        self.assertEqual(1, controller.get_max_in_flight())
+
+    def test__when_rate_limited__then_cut_limit_by_half(self):
+        controller = AdaptiveConcurrencyController(max_limit=8, initial_limit=8)
+
+        started_at = controller.acquire()
+        controller.on_error(started_at=started_at, error=RateLimitError("429"))
+        controller.release()
+
+        self.assertEqual(4, controller.get_limit())
+
+    def test__when_server_error__then_cut_limit_once_per_window(self):
+        controller = AdaptiveConcurrencyController(max_limit=8, initial_limit=8)
+
+        first_started_at = controller.acquire()
+        second_started_at = controller.acquire()
+        controller.on_error(started_at=first_started_at, error=IntegrationError("500"))
+        controller.on_error(started_at=second_started_at, error=IntegrationError("500"))
+        controller.release()
+        controller.release()
+
+        self.assertEqual(4, controller.get_limit())
+
+    def test__when_contract_error__then_keep_limit(self):
+        controller = AdaptiveConcurrencyController(max_limit=8, initial_limit=8)
+
+        started_at = controller.acquire()
+        controller.on_error(
+            started_at=started_at, error=IntegrationContractError("400")
+        )
+        controller.release()
+
+        self.assertEqual(8, controller.get_limit())
+
+    def test__when_throttled_by_retry_policy__then_cut_limit_and_wait(self):
+        controller = AdaptiveConcurrencyController(max_limit=8, initial_limit=8)
+
+        started_at = controller.acquire()
+        controller.on_throttle(started_at=started_at, status_code=429, retry_after=0.2)
+        controller.on_throttle(started_at=started_at, status_code=429)
+        controller.release()
+        waited_from = time.monotonic()
+        controller.acquire()
+
+        self.assertEqual(4, controller.get_limit())
+        self.assertEqual(2, controller.get_throttled())
+        self.assertGreaterEqual(time.monotonic() - waited_from, 0.15)
+
+    def test__when_latency_rises__then_cut_limit(self):
+        controller = AdaptiveConcurrencyController(
+            max_limit=8, initial_limit=8, latency_tolerance=2.0
+        )
+
+        controller.on_success(started_at=controller.acquire())
+        controller.release()
+        started_at = controller.acquire()
+        controller.on_success(started_at=started_at - 60)
+        controller.release()
+
+        self.assertEqual(4, controller.get_limit())
+
+    def test__when_latency_jitters_under_min_increase__then_keep_limit(self):
+        controller = AdaptiveConcurrencyController(
+            max_limit=8, initial_limit=8, min_latency_increase=1.0
+        )
+
+        controller.on_success(started_at=controller.acquire())
+        controller.release()
+        started_at = controller.acquire()
+        # Many times the best latency, yet less than a second slower
+        controller.on_success(started_at=started_at - 0.9)
+        controller.release()
+
+        self.assertEqual(8, controller.get_limit())
+
+    def test__when_queue_time_rises__then_cut_limit(self):
+        controller = AdaptiveConcurrencyController(
+            max_limit=8, initial_limit=8, max_queue_time_increase=5.0
+        )
+
+        # Server clock ahead of ours, only the rise of the wait counts
+        controller.on_success(started_at=controller.acquire(), queue_time=120.0)
+        controller.release()
+        controller.on_success(started_at=controller.acquire(), queue_time=122.0)
+        controller.release()
+        limit_with_jitter = controller.get_limit()
+        controller.on_success(started_at=controller.acquire(), queue_time=160.0)
+        controller.release()
+
+        self.assertEqual(8, limit_with_jitter)
+        self.assertEqual(4, controller.get_limit())
+
+    def test__when_limit_is_lowered__then_never_go_below_min(self):
+        controller = AdaptiveConcurrencyController(
+            max_limit=8, min_limit=2, initial_limit=2
+        )
+
+        started_at = controller.acquire()
+        controller.on_error(started_at=started_at, error=RateLimitError("429"))
+        controller.release()
+
+        self.assertEqual(2, controller.get_limit())
+
+
+if __name__ == "__main__":
+    unittest.main()
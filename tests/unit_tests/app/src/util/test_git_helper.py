@@ -195,6 +195,49 @@ class TestGitHelper(unittest.TestCase):
             },
         )
 
+    @patch("git.Repo")
+    def test__find_all_changed_code_when_full_content__skip_deleted_files(
+        self, mock_repo
+    ):
+        import git
+
+        from src.utils.git_helper import find_all_changed_code
+
+        mock_repo().git.diff.return_value = "file1.py\nfile2.py\n"
+        mock_repo().git.show.side_effect = [
+            'print("Hello, world!")\n',
+            git.GitCommandError("show", 128),
+        ]
+
+        changed_code = find_all_changed_code(
+            "/fake/repo/path",
+            "main",
+            "feature-branch",
+            "py",
+            set(),
+            set(),
+            full_content=True,
+        )
+
+        self.assertEqual({"file1.py": 'print("Hello, world!")\n'}, changed_code)
+        mock_repo().git.show.assert_any_call(
+            "feature-branch:file1.py", strip_newline_in_stdout=False
+        )
+
+    @patch("git.Repo")
+    def test__find_all_code__return_content_of_included_files(self, mock_repo):
+        from src.utils.git_helper import find_all_code
+
+        mock_repo().git.ls_tree.return_value = "a.py\nvenv/b.py\nREADME.md"
+        mock_repo().git.show.return_value = "x = 1\n"
+
+        files = find_all_code("/fake/repo/path", "main", "py", {"venv"}, set())
+
+        self.assertEqual({"a.py": "x = 1\n"}, files)
+        mock_repo().git.show.assert_called_once_with(
+            "main:a.py", strip_newline_in_stdout=False
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
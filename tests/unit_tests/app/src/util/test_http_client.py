@@ -0,0 +1,130 @@
+import os
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+import requests_mock
+from requests_mock import Mocker
+
+from reviewer_stk_ai.src.utils.http_client import HttpClient
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    lock = threading.Lock()
+    in_flight = 0
+    max_in_flight = 0
+
+    def do_GET(self):
+        if self.path == "/slow":
+            self._wait()
+
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def _wait(self):
+        cls = type(self)
+        with cls.lock:
+            cls.in_flight += 1
+            cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+        time.sleep(0.1)
+        with cls.lock:
+            cls.in_flight -= 1
+
+    def log_message(self, format, *args):
+        pass
+
+
+@patch.dict(os.environ, {"NO_PROXY": "127.0.0.1"})
+class TestHttpClient(TestCase):
+    _server = None
+    _url = None
+
+    def setUp(self):
+        _KeepAliveHandler.in_flight = 0
+        _KeepAliveHandler.max_in_flight = 0
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+        self._server.daemon_threads = True
+        self._url = f"http://127.0.0.1:{self._server.server_address[1]}/"
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def tearDown(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def test__when_sequential_requests__then_reuse_the_connection(self):
+        client = HttpClient()
+
+        responses = [client.get(url=self._url) for _ in range(5)]
+        stats = client.get_stats()
+        client.close()
+
+        self.assertTrue(all(response.ok for response in responses))
+        self.assertEqual(
+            {"requests": 5, "connections": 1, "reused": 4, "retries": 0}, stats
+        )
+
+    def test__when_concurrent_requests__then_open_up_to_pool_size(self):
+        client = HttpClient(pool_size=2)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            for _ in range(5):
+                list(executor.map(lambda _: client.get(url=self._url), range(2)))
+        stats = client.get_stats()
+        client.close()
+
+        self.assertEqual(10, stats["requests"])
+        self.assertLessEqual(stats["connections"], 2)
+
+    def test__when_requests_exceed_pool_size__then_wait_for_a_connection(self):
+        client = HttpClient(pool_size=2)
+
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            responses = list(
+                executor.map(lambda _: client.get(url=self._url + "slow"), range(6))
+            )
+        stats = client.get_stats()
+        client.close()
+
+        self.assertTrue(all(response.ok for response in responses))
+        self.assertEqual(2, _KeepAliveHandler.max_in_flight)
+        self.assertEqual(2, stats["connections"])
+        self.assertEqual(4, stats["reused"])
+
+    @requests_mock.Mocker()
+    def test__when_proxies_configured__then_send_requests_through_them(
+        self, mock_request: Mocker
+    ):
+        env_config = Mock()
+        env_config.get_proxies.return_value = {"https": "http://proxy:3128"}
+        mock_request.get("https://genai-code-buddy-api.stackspot.com/", text="ok")
+
+        client = HttpClient(env_config=env_config)
+        client.get(url="https://genai-code-buddy-api.stackspot.com/")
+
+        self.assertEqual(
+            "http://proxy:3128", mock_request.last_request.proxies["https"]
+        )
+
+    @requests_mock.Mocker()
+    def test__when_timeout_not_given__then_use_the_default(self, mock_request: Mocker):
+        mock_request.get("https://genai-code-buddy-api.stackspot.com/", text="ok")
+
+        client = HttpClient(timeout=(1, 2))
+        client.get(url="https://genai-code-buddy-api.stackspot.com/")
+        client.get(url="https://genai-code-buddy-api.stackspot.com/", timeout=5)
+
+        self.assertEqual(
+            [(1, 2), 5],
+            [request.timeout for request in mock_request.request_history],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
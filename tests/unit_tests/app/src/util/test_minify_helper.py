@@ -0,0 +1,137 @@
+import ast
+import unittest
+from unittest import TestCase
+
+from reviewer_stk_ai.src.utils.minify_helper import (
+    minimize,
+    minimize_python,
+    minimize_text,
+)
+
+PYTHON_CONTENT = '''# Copyright (c) Example
+# Licensed under the MIT License
+
+
+"""Module docstring."""
+import os
+
+
+class Example:
+    """
+    Class docstring.
+    """
+
+    def run(self, value):  # trailing comment
+        """Only statement of the body."""
+
+    def call(self, value):
+        """Documented."""
+        # comment line
+        return os.path.join(
+            value,
+            "folder",
+        )
+'''
+
+
+class TestMinifyHelper(TestCase):
+
+    def test__minimize_python__then_remove_comments_and_docstrings(self):
+        # act
+        minimized = minimize_python(PYTHON_CONTENT)
+
+        # assert
+        self.assertEqual(
+            "\n\n\n\n\n"
+            "import os\n"
+            "\n\n"
+            "class Example:\n"
+            "\n\n\n\n"
+            " def run(self, value):\n"
+            "  ...\n"
+            "\n"
+            " def call(self, value):\n"
+            "\n\n"
+            "  return os.path.join(\n"
+            "   value,\n"
+            '   "folder",\n'
+            "   )\n",
+            minimized,
+        )
+        ast.parse(minimized)
+
+    def test__minimize_python__then_keep_line_numbers(self):
+        # act
+        minimized = minimize_python(PYTHON_CONTENT)
+
+        # assert
+        original_lines = PYTHON_CONTENT.splitlines()
+        minimized_lines = minimized.splitlines()
+        self.assertEqual(len(original_lines), len(minimized_lines))
+        for original, line in zip(original_lines, minimized_lines):
+            if line.strip() and line.strip() != "...":
+                self.assertEqual(original.split("  #")[0].strip(), line.strip())
+
+    def test__minimize_python__when_long_multiline_string__then_keep_its_lines(self):
+        # arrange
+        text = "a" * 200
+        content = f'TEXT = """{text}\nb"""\nOTHER = """{text}\nb""" + TEXT\nx = 1\n'
+
+        # act
+        minimized = minimize_python(content)
+
+        # assert
+        self.assertEqual(
+            f'TEXT = "..."\n\nOTHER = """{text}\nb""" + TEXT\nx = 1\n', minimized
+        )
+
+    def test__minimize_python__when_long_string__then_replace_it(self):
+        # arrange
+        content = f'TEXT = "{"a" * 200}"\nSHORT = "abc"\n'
+
+        # act
+        minimized = minimize_python(content)
+
+        # assert
+        self.assertEqual('TEXT = "..."\nSHORT = "abc"\n', minimized)
+
+    def test__minimize_python__when_multiline_string__then_keep_its_content(self):
+        # arrange
+        content = 'def query():\n    return """\n    SELECT 1\n    """\n'
+
+        # act
+        minimized = minimize_python(content)
+
+        # assert
+        self.assertEqual(
+            'def query():\n return """\n    SELECT 1\n    """\n', minimized
+        )
+
+    def test__minimize_python__when_invalid_python__then_minimize_as_text(self):
+        # arrange
+        content = "def broken(:\n\n\n    pass   \n"
+
+        # act
+        minimized = minimize_python(content)
+
+        # assert
+        self.assertEqual("def broken(:\n\n\n    pass\n", minimized)
+
+    def test__minimize_text__then_remove_trailing_spaces_and_keep_lines(self):
+        # act
+        minimized = minimize_text("\n\nconst a = 1;   \n\n\n\nconst b = 2;\n\n")
+
+        # assert
+        self.assertEqual("\n\nconst a = 1;\n\n\n\nconst b = 2;\n", minimized)
+
+    def test__minimize__then_choose_by_extension(self):
+        # arrange
+        content = "# comment\nx = 1\n"
+
+        # act / assert
+        self.assertEqual("\nx = 1\n", minimize(content=content, file_name="a.py"))
+        self.assertEqual(content, minimize(content=content, file_name="a.sh"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+from unittest import TestCase
+
+from reviewer_stk_ai.src.models.file_review import FileReview
+from reviewer_stk_ai.src.utils.pack_helper import (
+    PACK_INSTRUCTIONS,
+    join_files,
+    pack_files,
+    split_review,
+)
+
+
+class TestPackHelper(TestCase):
+
+    def test__pack_files__then_fill_first_pack_with_room(self):
+        # arrange
+        reviews = [
+            FileReview(name="a.py", content="a" * 10),
+            FileReview(name="b.py", content="b" * 200),
+            FileReview(name="c.py", content="c" * 40),
+            FileReview(name="d.py", content="d" * 20),
+        ]
+
+        # act
+        packs = pack_files(file_reviews=reviews, max_size=len(PACK_INSTRUCTIONS) + 250)
+
+        # assert
+        self.assertEqual(
+            [["b.py"], ["c.py", "d.py", "a.py"]],
+            [[review.name for review in pack] for pack in packs],
+        )
+
+    def test__join_files__then_delimit_each_file(self):
+        # act
+        content = join_files(files=[("a.py", "x = 1\n"), ("b.py", "y = 2")])
+
+        # assert
+        self.assertEqual(
+            PACK_INSTRUCTIONS + "===== FILE: a.py =====\nx = 1\n"
+            "===== END OF FILE: a.py =====\n\n"
+            "===== FILE: b.py =====\ny = 2\n"
+            "===== END OF FILE: b.py =====\n",
+            content,
+        )
+
+    def test__split_review__then_return_review_of_each_file(self):
+        # arrange
+        review = (
+            "Summary of the files.\n\n"
+            "**===== FILE: b.py =====**\nName y is unclear.\n\n"
+            "===== FILE: `a.py` =====\nNo issues.\n"
+        )
+
+        # act
+        reviews = split_review(review=review, names=["a.py", "b.py"])
+
+        # assert
+        self.assertEqual({"a.py": "No issues.", "b.py": "Name y is unclear."}, reviews)
+
+    def test__split_review__when_file_missing__then_return_none(self):
+        # arrange
+        review = "===== FILE: a.py =====\nNo issues.\n"
+
+        # act
+        reviews = split_review(review=review, names=["a.py", "b.py"])
+
+        # assert
+        self.assertIsNone(reviews)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+from unittest import TestCase
+
+from reviewer_stk_ai.src.utils.poll_strategy import PollStrategy
+
+
+class TestPollStrategy(TestCase):
+
+    def test__when_first_check__then_do_not_wait(self):
+        strategy = PollStrategy(max_delay=10)
+
+        self.assertEqual(0.0, strategy.get_delay(attempt=0, elapsed=0))
+
+    def test__when_no_progress__then_back_off_up_to_max_delay(self):
+        strategy = PollStrategy(max_delay=10, initial_delay=1, jitter=0)
+
+        delays = [
+            strategy.get_delay(attempt=attempt, elapsed=0) for attempt in range(7)
+        ]
+
+        self.assertEqual([0.0, 1, 2, 4, 8, 10, 10], delays)
+
+    def test__when_progress_reported__then_wait_for_time_left(self):
+        strategy = PollStrategy(max_delay=30, initial_delay=1, jitter=0)
+
+        # 25% done after 3s, so about 9s are left
+        delay = strategy.get_delay(attempt=1, elapsed=3, percentage=0.25)
+
+        self.assertAlmostEqual(9.0, delay)
+
+    def test__when_almost_done__then_wait_at_least_initial_delay(self):
+        strategy = PollStrategy(max_delay=30, initial_delay=1, jitter=0)
+
+        delay = strategy.get_delay(attempt=3, elapsed=2, percentage=0.99)
+
+        self.assertEqual(1, delay)
+
+    def test__when_jitter__then_delay_varies_within_bounds(self):
+        strategy = PollStrategy(max_delay=100, initial_delay=10, jitter=0.2)
+
+        delays = {strategy.get_delay(attempt=1, elapsed=0) for _ in range(20)}
+
+        self.assertGreater(len(delays), 1)
+        self.assertTrue(all(8 <= delay <= 12 for delay in delays))
+
+
+if __name__ == "__main__":
+    unittest.main()
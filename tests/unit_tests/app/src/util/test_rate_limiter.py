@@ -0,0 +1,55 @@
+import threading
+import time
+import unittest
+from unittest import TestCase
+from unittest.mock import patch
+
+from reviewer_stk_ai.src.utils.rate_limiter import TokenBucketRateLimiter
+
+
+class TestTokenBucketRateLimiter(TestCase):
+
+    def test__when_rate_is_zero__then_never_wait(self):
+        limiter = TokenBucketRateLimiter(rate=0)
+
+        waits = [limiter.acquire() for _ in range(100)]
+
+        self.assertEqual(0.0, sum(waits))
+        self.assertFalse(limiter.is_enabled())
+
+    @patch("time.sleep")
+    def test__when_within_burst__then_do_not_wait(self, mock_sleep):
+        limiter = TokenBucketRateLimiter(rate=5)
+
+        waits = [limiter.acquire() for _ in range(5)]
+
+        self.assertEqual([0.0] * 5, waits)
+        mock_sleep.assert_not_called()
+
+    @patch("time.sleep")
+    def test__when_over_budget__then_smooth_requests(self, mock_sleep):
+        limiter = TokenBucketRateLimiter(rate=10, capacity=1)
+
+        limiter.acquire()
+        second_wait = limiter.acquire()
+        third_wait = limiter.acquire()
+
+        self.assertAlmostEqual(0.1, second_wait, delta=0.01)
+        self.assertAlmostEqual(0.2, third_wait, delta=0.01)
+        self.assertEqual(2, mock_sleep.call_count)
+
+    def test__when_shared_by_threads__then_respect_rate(self):
+        limiter = TokenBucketRateLimiter(rate=50, capacity=1)
+        started_at = time.monotonic()
+
+        threads = [threading.Thread(target=limiter.acquire) for _ in range(11)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertGreaterEqual(time.monotonic() - started_at, 0.18)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,49 +1,58 @@
-import sys
+import os
+import tempfile
 import unittest
 from unittest import TestCase
-from unittest.mock import patch
 
+from reviewer_stk_ai.src.models.file_review import FileReview
+from reviewer_stk_ai.src.utils.report_writer import ReportWriter
 
-class TestReportHelper(TestCase):
-
-    def setUp(self):
-        if "reviewer_stk_ai.src.utils.report_helper" in sys.modules:
-            sys.modules.pop("reviewer_stk_ai.src.utils.report_helper")
-
-    @patch("reviewer_stk_ai.src.utils.file_helper.merge_tmp_files")
-    @patch("reviewer_stk_ai.src.utils.file_helper.create_file_and_directory")
-    def test__generate_report__when_has_tmp_files__then_create_a_report(
-        self, create_file_and_directory, merge_tmp_files
-    ):
-        merge_tmp_files.return_value = "file_merged\n\n\nfile_merged\n\n\n"
-
-        from reviewer_stk_ai.src.utils.report_helper import generate_report
 
-        generate_report(directory="./", file_name="report.md")
+class TestReportHelper(TestCase):
 
-        create_file_and_directory.assert_called_with(
-            directory="./",
-            file_name="report.md",
-            content="file_merged\n\n\nfile_merged\n\n\n",
+    def test__merge_reports__when_two_shards__then_match_unsharded_report(self):
+        # arrange
+        directory = tempfile.mkdtemp()
+        reviews = [
+            FileReview(name="c.py", llm_review="review c"),
+            FileReview(name="a.py", llm_review="review a\n\n---\n\nmore on a"),
+            FileReview(name="d.py", llm_review="review d"),
+            FileReview(name="b.py", llm_review="review b"),
+        ]
+        with ReportWriter(directory=directory, file_name="unsharded.md") as writer:
+            for review in reviews:
+                writer.write(review=review)
+            writer.add_not_reviewed(names=["f.py", "e.py"])
+
+        shard_files = []
+        for index, names in enumerate((["f.py"], ["e.py"])):
+            with ReportWriter(
+                directory=directory,
+                file_name=f"report.shard-{index + 1}-of-2.md",
+                index=False,
+            ) as writer:
+                for review in reviews[index::2]:
+                    writer.write(review=review)
+                writer.add_not_reviewed(names=names)
+            shard_files.append(writer.get_path())
+
+        from reviewer_stk_ai.src.utils.report_helper import merge_reports
+
+        # act
+        path = merge_reports(
+            directory=directory, file_name="report.md", shard_files=shard_files
         )
 
-    @patch("reviewer_stk_ai.src.utils.file_helper.merge_tmp_files")
-    @patch("reviewer_stk_ai.src.utils.file_helper.create_file_and_directory")
-    def test__generate_report__when_has_not_tmp_files__then_return_exception(
-        self, create_file_and_directory, merge_tmp_files
-    ):
-        merge_tmp_files.return_value = ""
-
-        from reviewer_stk_ai.src.utils.report_helper import generate_report
+        # assert
+        with open(path, "r", encoding="utf-8") as merged, open(
+            os.path.join(directory, "unsharded.md"), "r", encoding="utf-8"
+        ) as unsharded:
+            self.assertEqual(unsharded.read(), merged.read())
 
-        with self.assertRaises(ValueError) as ctx:
-            generate_report(directory="./", file_name="report.md")
-
-        self.assertEqual(
-            "No content to generate report, at ./tmp", ctx.exception.args[0]
-        )
+    def test__merge_reports__when_has_not_shard_reports__then_return_exception(self):
+        from reviewer_stk_ai.src.utils.report_helper import merge_reports
 
-        create_file_and_directory.assert_not_called()
+        with self.assertRaises(ValueError):
+            merge_reports(directory="./", file_name="report.md", shard_files=[])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,140 @@
+import os
+import tempfile
+import unittest
+from unittest import TestCase
+
+from reviewer_stk_ai.src.models.file_review import FileReview
+from reviewer_stk_ai.src.utils.report_writer import ReportWriter
+
+
+def read_report(path):
+    with open(path, "r", encoding="utf-8") as file:
+        return file.read()
+
+
+class TestReportWriter(TestCase):
+
+    def setUp(self):
+        self.directory = os.path.join(tempfile.mkdtemp(), "report")
+
+    def test__write__when_review_done__then_append_to_report_before_close(self):
+        # arrange
+        report_writer = ReportWriter(directory=self.directory, file_name="report.md")
+
+        # act
+        report_writer.write(review=FileReview(name="b.py", llm_review="review b"))
+        report_writer.write(review=FileReview(name="a.py", llm_review="review a"))
+
+        # assert
+        self.assertEqual(
+            "File name: b.py \n\nreview b\n\n---\n\nFile name: a.py \n\nreview a",
+            read_report(report_writer.get_path()),
+        )
+        report_writer.close()
+
+    def test__close__then_order_by_name_and_write_index(self):
+        # arrange
+        with ReportWriter(
+            directory=self.directory, file_name="report.md"
+        ) as report_writer:
+            report_writer.write(review=FileReview(name="b.py", llm_review="review b"))
+            report_writer.write(review=FileReview(name="a.py", llm_review="review á"))
+
+        # act
+        report = read_report(report_writer.get_path())
+
+        # assert
+        self.assertEqual(
+            "Files reviewed:\n\n- a.py\n- b.py\n\n---\n\n"
+            "File name: a.py \n\nreview á\n\n---\n\n"
+            "File name: b.py \n\nreview b",
+            report,
+        )
+        self.assertEqual(2, report_writer.get_count())
+
+    def test__close__when_without_index__then_only_order_by_name(self):
+        # arrange
+        with ReportWriter(
+            directory=self.directory, file_name="report.md", index=False
+        ) as report_writer:
+            report_writer.write(review=FileReview(name="b.py", llm_review="review b"))
+            report_writer.write(review=FileReview(name="a.py", llm_review="review a"))
+
+        # assert
+        self.assertEqual(
+            "File name: a.py \n\nreview a\n\n---\n\nFile name: b.py \n\nreview b",
+            read_report(report_writer.get_path()),
+        )
+
+    def test__close__when_files_not_reviewed__then_list_them_at_the_end(self):
+        # arrange
+        with ReportWriter(
+            directory=self.directory, file_name="report.md", index=False
+        ) as report_writer:
+            report_writer.write(review=FileReview(name="a.py", llm_review="review a"))
+            report_writer.add_not_reviewed(names=["c.py", "b.py"])
+
+        # assert
+        self.assertEqual(
+            "File name: a.py \n\nreview a\n\n---\n\n"
+            "Files not reviewed:\n\n- b.py\n- c.py",
+            read_report(report_writer.get_path()),
+        )
+
+    def test__close__when_no_review__then_keep_previous_report(self):
+        # arrange
+        os.makedirs(self.directory)
+        with open(os.path.join(self.directory, "report.md"), "w") as file:
+            file.write("previous report")
+
+        # act
+        with ReportWriter(directory=self.directory, file_name="report.md") as writer:
+            pass
+
+        # assert
+        self.assertEqual("previous report", read_report(writer.get_path()))
+
+    def test__close__when_every_file_reviewed__then_remove_temp_results(self):
+        # arrange
+        temp_directory = os.path.join(tempfile.mkdtemp(), "reviews")
+        os.makedirs(temp_directory)
+
+        # act
+        with ReportWriter(
+            directory=self.directory,
+            file_name="report.md",
+            temp_directory=temp_directory,
+        ) as report_writer:
+            report_writer.write(review=FileReview(name="a.py", llm_review="review a"))
+
+        # assert
+        self.assertFalse(os.path.exists(temp_directory))
+
+    def test__close__when_files_not_reviewed__then_keep_temp_results(self):
+        # arrange
+        temp_directory = os.path.join(tempfile.mkdtemp(), "reviews")
+        os.makedirs(temp_directory)
+
+        # act
+        with ReportWriter(
+            directory=self.directory,
+            file_name="report.md",
+            temp_directory=temp_directory,
+        ) as report_writer:
+            report_writer.write(review=FileReview(name="a.py", llm_review="review a"))
+            report_writer.add_not_reviewed(names=["b.py"])
+
+        with self.assertRaises(KeyboardInterrupt):
+            with ReportWriter(
+                directory=self.directory,
+                file_name="interrupted.md",
+                temp_directory=temp_directory,
+            ):
+                raise KeyboardInterrupt()
+
+        # assert
+        self.assertTrue(os.path.exists(temp_directory))
+
+
+if __name__ == "__main__":
+    unittest.main()
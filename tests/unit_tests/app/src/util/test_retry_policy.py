@@ -0,0 +1,204 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+import requests
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+from reviewer_stk_ai.src.exceptions.circuit_open_error import CircuitOpenError
+from reviewer_stk_ai.src.utils.retry_policy import RetryPolicy, get_retry_after
+
+
+def response(status_code: int, headers: dict = None):
+    mock_response = Mock()
+    mock_response.status_code = status_code
+    mock_response.headers = headers or {}
+    return mock_response
+
+
+@patch("time.sleep")
+class TestRetryPolicy(TestCase):
+
+    def test__when_success__then_send_once(self, mock_sleep):
+        request = Mock(return_value=response(200))
+
+        result = RetryPolicy().send(request)
+
+        self.assertEqual(200, result.status_code)
+        self.assertEqual(1, request.call_count)
+        mock_sleep.assert_not_called()
+
+    def test__when_client_error__then_do_not_retry(self, mock_sleep):
+        request = Mock(return_value=response(400))
+
+        result = RetryPolicy().send(request)
+
+        self.assertEqual(400, result.status_code)
+        self.assertEqual(1, request.call_count)
+
+    def test__when_server_error__then_retry_with_backoff(self, mock_sleep):
+        request = Mock(side_effect=[response(500), response(502), response(200)])
+
+        result = RetryPolicy(initial_delay=1, max_delay=5).send(request)
+
+        self.assertEqual(200, result.status_code)
+        delays = [call.args[0] for call in mock_sleep.call_args_list]
+        self.assertTrue(0.8 <= delays[0] <= 1.0)
+        self.assertTrue(1.6 <= delays[1] <= 2.0)
+
+    def test__when_attempts_exhausted__then_return_last_response(self, mock_sleep):
+        request = Mock(return_value=response(503))
+
+        result = RetryPolicy(max_attempts=3).send(request)
+
+        self.assertEqual(503, result.status_code)
+        self.assertEqual(3, request.call_count)
+
+    def test__when_retry_after__then_wait_for_it(self, mock_sleep):
+        request = Mock(side_effect=[response(429, {"Retry-After": "7"}), response(200)])
+
+        RetryPolicy().send(request)
+
+        mock_sleep.assert_called_once_with(7.0)
+
+    def test__when_throttled__then_notify_listeners(self, mock_sleep):
+        request = Mock(
+            side_effect=[
+                response(429, {"Retry-After": "7"}),
+                response(503),
+                response(200),
+            ]
+        )
+        listener = Mock()
+        policy = RetryPolicy()
+        policy.add_throttle_listener(listener)
+
+        policy.send(request)
+        policy.remove_throttle_listener(listener)
+        policy.send(Mock(return_value=response(429)))
+
+        self.assertEqual(
+            [(429, 7.0), (503, None)],
+            [call.args[1:] for call in listener.call_args_list],
+        )
+
+    def test__when_retry_after_too_long__then_fail_at_once(self, mock_sleep):
+        request = Mock(return_value=response(429, {"Retry-After": "3600"}))
+
+        result = RetryPolicy(max_retry_after=60).send(request)
+
+        self.assertEqual(429, result.status_code)
+        self.assertEqual(1, request.call_count)
+        mock_sleep.assert_not_called()
+
+    def test__when_connection_fails__then_retry_and_raise(self, mock_sleep):
+        request = Mock(side_effect=requests.exceptions.ConnectionError("refused"))
+
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            RetryPolicy(max_attempts=2).send(request)
+
+        self.assertEqual(2, request.call_count)
+
+    def test__when_not_idempotent_and_response_lost__then_do_not_retry(
+        self, mock_sleep
+    ):
+        request = Mock(side_effect=requests.exceptions.ReadTimeout("read timed out"))
+
+        with self.assertRaises(requests.exceptions.ReadTimeout):
+            RetryPolicy(max_attempts=3).send(request, idempotent=False)
+
+        self.assertEqual(1, request.call_count)
+
+    def test__when_not_idempotent_and_not_connected__then_retry(self, mock_sleep):
+        refused = requests.exceptions.ConnectionError(
+            MaxRetryError(
+                pool=None, url="/", reason=NewConnectionError(None, "refused")
+            )
+        )
+        request = Mock(
+            side_effect=[
+                requests.exceptions.ConnectTimeout("connect timed out"),
+                refused,
+                response(200),
+            ]
+        )
+
+        result = RetryPolicy(max_attempts=3).send(request, idempotent=False)
+
+        self.assertEqual(200, result.status_code)
+        self.assertEqual(3, request.call_count)
+
+    def test__when_budget_exhausted__then_stop_retrying(self, mock_sleep):
+        policy = RetryPolicy(
+            max_attempts=3, min_budget=2, budget_ratio=0, failure_threshold=100
+        )
+        request = Mock(return_value=response(500))
+
+        policy.send(request)
+        policy.send(request)
+
+        self.assertEqual(3 + 1, request.call_count)
+        self.assertEqual({"retries": 2}, policy.get_stats())
+
+    def test__when_server_errors_in_a_row__then_open_the_circuit(self, mock_sleep):
+        policy = RetryPolicy(max_attempts=1, failure_threshold=3, reset_timeout=30)
+        request = Mock(return_value=response(500))
+
+        for _ in range(3):
+            policy.send(request)
+
+        with self.assertRaises(CircuitOpenError):
+            policy.send(request)
+
+        self.assertEqual("open", policy.get_state())
+        self.assertEqual(3, request.call_count)
+
+    def test__when_circuit_opens__then_stop_the_retries_in_flight(self, mock_sleep):
+        policy = RetryPolicy(max_attempts=5, failure_threshold=2)
+        request = Mock(return_value=response(500))
+
+        result = policy.send(request)
+
+        self.assertEqual(500, result.status_code)
+        self.assertEqual(2, request.call_count)
+
+    def test__when_reset_timeout_passed__then_close_after_a_trial(self, mock_sleep):
+        policy = RetryPolicy(max_attempts=1, failure_threshold=1, reset_timeout=30)
+        policy.send(Mock(return_value=response(500)))
+
+        with patch("time.monotonic", return_value=10**9):
+            result = policy.send(Mock(return_value=response(200)))
+
+        self.assertEqual(200, result.status_code)
+        self.assertEqual("closed", policy.get_state())
+
+    def test__when_trial_fails__then_open_again(self, mock_sleep):
+        policy = RetryPolicy(max_attempts=1, failure_threshold=1, reset_timeout=30)
+        policy.send(Mock(return_value=response(500)))
+
+        with patch("time.monotonic", return_value=10**9):
+            policy.send(Mock(return_value=response(500)))
+            with self.assertRaises(CircuitOpenError):
+                policy.send(Mock(return_value=response(200)))
+
+
+class TestGetRetryAfter(TestCase):
+
+    def test__when_seconds__then_return_them(self):
+        self.assertEqual(12.0, get_retry_after(response(429, {"Retry-After": "12"})))
+
+    def test__when_http_date__then_return_seconds_until_it(self):
+        retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+        headers = {"Retry-After": format_datetime(retry_at, usegmt=True)}
+
+        self.assertAlmostEqual(30, get_retry_after(response(429, headers)), delta=2)
+
+    def test__when_missing_or_invalid__then_return_none(self):
+        self.assertIsNone(get_retry_after(response(429)))
+        self.assertIsNone(get_retry_after(response(429, {"Retry-After": "soon"})))
+
+
+if __name__ == "__main__":
+    unittest.main()
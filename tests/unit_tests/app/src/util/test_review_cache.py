@@ -0,0 +1,137 @@
+import os
+import tempfile
+import unittest
+from unittest import TestCase
+from unittest.mock import patch
+
+from reviewer_stk_ai.src.utils.review_cache import ReviewCache
+
+
+class TestReviewCache(TestCase):
+
+    def setUp(self):
+        self.directory = os.path.join(tempfile.mkdtemp(), "cache")
+
+    def test__get__when_put_before__then_return_review(self):
+        # arrange
+        ReviewCache(directory=self.directory, namespace="qc").put(
+            content_hash="hash", review="No issues.", options={"minimize": False}
+        )
+
+        # act
+        review = ReviewCache(directory=self.directory, namespace="qc").get(
+            content_hash="hash", options={"minimize": False}
+        )
+
+        # assert
+        self.assertEqual("No issues.", review)
+
+    def test__get__when_other_quick_command_or_options__then_return_none(self):
+        # arrange
+        cache = ReviewCache(directory=self.directory, namespace="qc")
+        cache.put(content_hash="hash", review="No issues.", options={"minimize": False})
+
+        # act / assert
+        self.assertIsNone(cache.get(content_hash="hash", options={"minimize": True}))
+        self.assertIsNone(
+            ReviewCache(directory=self.directory, namespace="other").get(
+                content_hash="hash", options={"minimize": False}
+            )
+        )
+
+    def test__get__when_older_than_max_age__then_return_none(self):
+        # arrange
+        cache = ReviewCache(directory=self.directory, max_age=60)
+        with patch("time.time", return_value=1000.0):
+            cache.put(content_hash="hash", review="No issues.")
+
+        # act
+        with patch("time.time", return_value=1061.0):
+            review = cache.get(content_hash="hash")
+
+        # assert
+        self.assertIsNone(review)
+
+    def test__prune__when_above_max_size__then_evict_least_recently_used(self):
+        # arrange
+        cache = ReviewCache(directory=self.directory, max_size=20, max_age=0)
+        for now, content_hash in enumerate(["a", "b", "c"]):
+            with patch("time.time", return_value=1000.0 + now):
+                cache.put(content_hash=content_hash, review="x" * 8)
+        with patch("time.time", return_value=1010.0):
+            cache.get(content_hash="a")
+
+        # act
+        removed = cache.prune()
+
+        # assert
+        self.assertEqual(1, removed)
+        self.assertEqual("x" * 8, cache.get(content_hash="a"))
+        self.assertIsNone(cache.get(content_hash="b"))
+        self.assertEqual("x" * 8, cache.get(content_hash="c"))
+
+    def test__claim__when_claimed_by_other_job__then_return_false(self):
+        # arrange
+        first_job = ReviewCache(directory=self.directory, owner="job-1")
+        second_job = ReviewCache(directory=self.directory, owner="job-2")
+
+        # act
+        first_claim = first_job.claim(content_hash="hash")
+        second_claim = second_job.claim(content_hash="hash")
+
+        # assert
+        self.assertTrue(first_claim)
+        self.assertFalse(second_claim)
+
+    def test__claim__when_review_stored__then_release_the_lease(self):
+        # arrange
+        first_job = ReviewCache(directory=self.directory, owner="job-1")
+        second_job = ReviewCache(directory=self.directory, owner="job-2")
+        first_job.claim(content_hash="hash")
+
+        # act
+        first_job.put(content_hash="hash", review="No issues.")
+
+        # assert
+        self.assertTrue(second_job.claim(content_hash="hash"))
+
+    def test__claim__when_lease_expired__then_take_it_over(self):
+        # arrange
+        first_job = ReviewCache(
+            directory=self.directory, owner="job-1", lease_seconds=60
+        )
+        second_job = ReviewCache(directory=self.directory, owner="job-2")
+        with patch("time.time", return_value=1000.0):
+            first_job.claim(content_hash="hash")
+
+        # act
+        with patch("time.time", return_value=1061.0):
+            claimed = second_job.claim(content_hash="hash")
+
+        # assert
+        self.assertTrue(claimed)
+        with patch("time.time", return_value=1062.0):
+            self.assertFalse(first_job.claim(content_hash="hash"))
+
+    def test__renew_all__when_lease_renewed__then_keep_it_past_its_expiry(self):
+        # arrange
+        first_job = ReviewCache(
+            directory=self.directory, owner="job-1", lease_seconds=60
+        )
+        second_job = ReviewCache(directory=self.directory, owner="job-2")
+        with patch("time.time", return_value=1000.0):
+            first_job.claim(content_hash="hash")
+
+        # act
+        with patch("time.time", return_value=1050.0):
+            renewed = first_job.renew_all()
+
+        # assert
+        self.assertEqual(1, renewed)
+        with patch("time.time", return_value=1070.0):
+            self.assertTrue(second_job.is_claimed(content_hash="hash"))
+            self.assertFalse(second_job.claim(content_hash="hash"))
+
+
+if __name__ == "__main__":
+    unittest.main()
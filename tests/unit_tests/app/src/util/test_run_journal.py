@@ -0,0 +1,138 @@
+import os
+import tempfile
+import unittest
+from unittest import TestCase
+
+from reviewer_stk_ai.src.models.file_review import FileReview
+from reviewer_stk_ai.src.utils.run_journal import (
+    STATUS_COMPLETED,
+    STATUS_SUBMITTED,
+    RunJournal,
+    get_journal_path,
+)
+
+
+class TestRunJournal(TestCase):
+
+    def setUp(self):
+        self.path = os.path.join(tempfile.mkdtemp(), "state", "journal.jsonl")
+
+    def test__get_journal_path__then_key_on_command_directory_and_shard(self):
+        # act
+        path = get_journal_path(
+            path=self.path, command="review-dir", directory=".", shard=(0, 2)
+        )
+
+        # assert
+        self.assertEqual(
+            path,
+            get_journal_path(
+                path=self.path,
+                command="review-dir",
+                directory=os.path.abspath("."),
+                shard=(0, 2),
+            ),
+        )
+        self.assertTrue(path.endswith(".jsonl"))
+        self.assertEqual(
+            4,
+            len(
+                {
+                    path,
+                    get_journal_path(
+                        path=self.path, command="diff", directory=".", shard=(0, 2)
+                    ),
+                    get_journal_path(
+                        path=self.path,
+                        command="review-dir",
+                        directory="..",
+                        shard=(0, 2),
+                    ),
+                    get_journal_path(
+                        path=self.path,
+                        command="review-dir",
+                        directory=".",
+                        shard=(1, 2),
+                    ),
+                }
+            ),
+        )
+
+    def test__load__then_keep_last_entry_of_each_file(self):
+        # arrange
+        review_1 = FileReview(name="a.py", content="a", execution_id="exec-a")
+        review_2 = FileReview(name="b.py", content="b", execution_id="exec-b")
+        journal = RunJournal(path=self.path).reset()
+        journal.record_submitted(review=review_1)
+        journal.record_submitted(review=review_2)
+        journal.record_completed(review=review_1, result="./tmp/exec-a")
+
+        # act
+        loaded_journal = RunJournal(path=self.path).load()
+
+        # assert
+        self.assertEqual(
+            STATUS_COMPLETED, loaded_journal.get(review=review_1)["status"]
+        )
+        self.assertEqual("./tmp/exec-a", loaded_journal.get(review=review_1)["result"])
+        self.assertEqual(
+            STATUS_SUBMITTED, loaded_journal.get(review=review_2)["status"]
+        )
+        self.assertEqual("exec-b", loaded_journal.get(review=review_2)["execution_id"])
+
+    def test__get__when_content_changed__then_return_none(self):
+        # arrange
+        journal = RunJournal(path=self.path).reset()
+        journal.record_submitted(
+            review=FileReview(name="a.py", content="a", execution_id="exec-a")
+        )
+
+        # act
+        entry = (
+            RunJournal(path=self.path)
+            .load()
+            .get(review=FileReview(name="a.py", content="changed"))
+        )
+
+        # assert
+        self.assertIsNone(entry)
+
+    def test__load__when_last_line_cut__then_ignore_it(self):
+        # arrange
+        journal = RunJournal(path=self.path).reset()
+        journal.record_submitted(
+            review=FileReview(name="a.py", content="a", execution_id="exec-a")
+        )
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write('{"name": "b.py", "ha')
+
+        # act
+        loaded_journal = RunJournal(path=self.path).load()
+
+        # assert
+        self.assertIsNotNone(
+            loaded_journal.get(review=FileReview(name="a.py", content="a"))
+        )
+        self.assertIsNone(
+            loaded_journal.get(review=FileReview(name="b.py", content="b"))
+        )
+
+    def test__reset__then_forget_previous_run(self):
+        # arrange
+        RunJournal(path=self.path).reset().record_submitted(
+            review=FileReview(name="a.py", content="a", execution_id="exec-a")
+        )
+
+        # act
+        RunJournal(path=self.path).reset()
+
+        # assert
+        self.assertIsNone(
+            RunJournal(path=self.path)
+            .load()
+            .get(review=FileReview(name="a.py", content="a"))
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import os
+import tempfile
+import unittest
+from unittest import TestCase
+
+from reviewer_stk_ai.src.models.file_review import FileReview
+from reviewer_stk_ai.src.utils.latency_history import LatencyHistory
+from reviewer_stk_ai.src.utils.schedule_helper import (
+    order_longest_first,
+    predict_makespan,
+    predict_makespan_seconds,
+)
+
+
+class TestScheduleHelper(TestCase):
+
+    def test__order_longest_first__without_history__then_order_by_size(self):
+        reviews = [
+            FileReview(name="small.py", content="a"),
+            FileReview(name="big.py", content="a" * 100),
+            FileReview(name="medium.py", content="a" * 10),
+        ]
+
+        ordered = order_longest_first(file_reviews=reviews)
+
+        self.assertEqual(
+            ["big.py", "medium.py", "small.py"], [review.name for review in ordered]
+        )
+
+    def test__order_longest_first__with_history__then_prefer_known_latency(self):
+        history = LatencyHistory(path="unused.json")
+        history.record(name="small.py", size=1, latency=300.0)
+        history.record(name="big.py", size=100, latency=10.0)
+        reviews = [
+            FileReview(name="big.py", content="a" * 100),
+            FileReview(name="small.py", content="a"),
+            FileReview(name="new.py", content="a" * 50),
+        ]
+
+        ordered = order_longest_first(file_reviews=reviews, history=history)
+
+        self.assertEqual(
+            ["small.py", "new.py", "big.py"], [review.name for review in ordered]
+        )
+
+    def test__latency_history__then_fit_time_per_execution_and_per_byte(self):
+        history = LatencyHistory(path="unused.json")
+        history.record(name="small.py", size=100, latency=12.0)
+        history.record(name="medium.py", size=1000, latency=21.0)
+        history.record(name="big.py", size=10000, latency=111.0)
+
+        seconds_per_execution, seconds_per_byte = history.get_cost_model()
+
+        self.assertAlmostEqual(11.0, seconds_per_execution)
+        self.assertAlmostEqual(0.01, seconds_per_byte)
+
+    def test__predict_makespan_seconds__then_count_time_per_execution(self):
+        history = LatencyHistory(path="unused.json")
+        history.record(name="small.py", size=100, latency=12.0)
+        history.record(name="big.py", size=10000, latency=111.0)
+        reviews = [
+            FileReview(name="new_1.py", content="a" * 100),
+            FileReview(name="new_2.py", content="a" * 100),
+        ]
+
+        predicted = predict_makespan_seconds(
+            file_reviews=reviews, workers=1, history=history
+        )
+
+        self.assertAlmostEqual(24.0, predicted)
+
+    def test__predict_makespan__then_simulate_workers(self):
+        self.assertEqual(10.0, predict_makespan(costs=[10, 6, 4], workers=2))
+        self.assertEqual(20.0, predict_makespan(costs=[10, 6, 4], workers=1))
+        self.assertEqual(0.0, predict_makespan(costs=[], workers=4))
+
+    def test__predict_makespan_seconds__without_history__then_return_none(self):
+        reviews = [FileReview(name="small.py", content="a")]
+
+        self.assertIsNone(predict_makespan_seconds(file_reviews=reviews, workers=2))
+
+    def test__latency_history__when_saved__then_load_the_same_entries(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "state", "latency-history.json")
+            history = LatencyHistory(path=path)
+            history.record(name="file.py", size=10, latency=5.0)
+            history.save()
+
+            loaded = LatencyHistory(path=path).load()
+
+            self.assertEqual(5.0, loaded.get_latency("file.py"))
+            self.assertEqual((0.0, 0.5), loaded.get_cost_model())
+
+
+if __name__ == "__main__":
+    unittest.main()
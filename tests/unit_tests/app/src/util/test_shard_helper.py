@@ -0,0 +1,117 @@
+import os
+import tempfile
+import unittest
+from unittest import TestCase
+
+from reviewer_stk_ai.src.utils.shard_helper import (
+    SHARD_STRATEGY_SIZE,
+    find_shard_files,
+    get_shard_file_name,
+    select_shard,
+)
+
+
+class TestShardHelper(TestCase):
+
+    def setUp(self):
+        self.files = {f"./src/module_{i}.py": "a" * (i + 1) for i in range(20)}
+
+    def test__select_shard__when_hash__then_shards_are_disjoint_and_complete(self):
+        # act
+        shards = [
+            select_shard(files=self.files, shard_index=index, shard_count=3)
+            for index in range(3)
+        ]
+
+        # assert
+        names = [name for shard in shards for name in shard]
+        self.assertEqual(len(self.files), len(names))
+        self.assertEqual(set(self.files), set(names))
+
+    def test__select_shard__when_hash__then_ignore_path_separator(self):
+        # arrange
+        windows_files = {
+            name.replace("/", "\\"): content for name, content in self.files.items()
+        }
+
+        # act
+        shard = select_shard(files=self.files, shard_index=1, shard_count=4)
+        windows_shard = select_shard(files=windows_files, shard_index=1, shard_count=4)
+
+        # assert
+        self.assertEqual(
+            sorted(shard), sorted(name.replace("\\", "/") for name in windows_shard)
+        )
+
+    def test__select_shard__when_size__then_balance_content(self):
+        # act
+        shards = [
+            select_shard(
+                files=self.files,
+                shard_index=index,
+                shard_count=2,
+                strategy=SHARD_STRATEGY_SIZE,
+            )
+            for index in range(2)
+        ]
+
+        # assert
+        sizes = [sum(len(content) for content in shard.values()) for shard in shards]
+        self.assertEqual(
+            sum(len(content) for content in self.files.values()), sum(sizes)
+        )
+        self.assertLessEqual(abs(sizes[0] - sizes[1]), 1)
+
+    def test__select_shard__when_one_shard__then_return_all_files(self):
+        self.assertEqual(
+            self.files, select_shard(files=self.files, shard_index=0, shard_count=1)
+        )
+
+    def test__find_shard_files__then_return_in_shard_order(self):
+        # arrange
+        directory = self._write_shards(
+            shards=[(10, 10)] + [(i, 10) for i in range(1, 10)]
+        )
+        with open(os.path.join(directory, "report.md"), "w") as file:
+            file.write("final")
+
+        # act
+        shard_files = find_shard_files(directory=directory, file_name="report.md")
+
+        # assert
+        self.assertEqual(
+            [f"report.shard-{index}-of-10.md" for index in range(1, 11)],
+            [os.path.basename(path) for path in shard_files],
+        )
+
+    def test__find_shard_files__when_shard_counts_differ__then_raise(self):
+        # arrange
+        directory = self._write_shards(shards=[(1, 3), (2, 2), (3, 3)])
+
+        # act / assert
+        with self.assertRaisesRegex(ValueError, "different splits"):
+            find_shard_files(directory=directory, file_name="report.md")
+
+    def test__find_shard_files__when_shard_missing__then_raise(self):
+        # arrange
+        directory = self._write_shards(shards=[(1, 3), (3, 3)])
+
+        # act / assert
+        with self.assertRaisesRegex(ValueError, r"missing: shards \[2\] of 3"):
+            find_shard_files(directory=directory, file_name="report.md")
+
+    @staticmethod
+    def _write_shards(shards):
+        directory = tempfile.mkdtemp()
+        for index, count in shards:
+            name = get_shard_file_name(
+                file_name="report.md", shard_index=index - 1, shard_count=count
+            )
+            with open(os.path.join(directory, name), "w") as file:
+                file.write(str(index))
+
+        return directory
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import os
+import stat
+import tempfile
+import threading
+import time
+import unittest
+from unittest import TestCase
+
+from reviewer_stk_ai.src.utils.token_cache import TokenCache
+
+
+class TestTokenCache(TestCase):
+    _path = None
+
+    def setUp(self):
+        self._path = os.path.join(tempfile.mkdtemp(), "cache", "tokens.json")
+
+    def test__when_token_stored__then_share_it_with_other_instances(self):
+        TokenCache(path=self._path).put(
+            realm="zup",
+            client_id="client",
+            token="Bearer token",
+            refresh_at=time.time() + 60,
+        )
+
+        cached = TokenCache(path=self._path).get(realm="zup", client_id="client")
+
+        self.assertEqual("Bearer token", cached[0])
+        self.assertIsNone(
+            TokenCache(path=self._path).get(realm="zup", client_id="other")
+        )
+        self.assertIsNone(
+            TokenCache(path=self._path).get(realm="other", client_id="client")
+        )
+
+    def test__when_refresh_time_reached__then_return_none(self):
+        cache = TokenCache(path=self._path)
+        cache.put(
+            realm="zup", client_id="client", token="Bearer old", refresh_at=time.time()
+        )
+
+        self.assertIsNone(cache.get(realm="zup", client_id="client"))
+
+    def test__when_stored__then_only_the_owner_can_read_it(self):
+        TokenCache(path=self._path).put(
+            realm="zup",
+            client_id="client",
+            token="Bearer token",
+            refresh_at=time.time() + 60,
+        )
+
+        self.assertEqual(0o600, stat.S_IMODE(os.stat(self._path).st_mode))
+        with open(self._path, "r") as file:
+            self.assertNotIn("client", file.read().replace("client_id", ""))
+
+    def test__when_file_corrupted__then_ignore_it(self):
+        os.makedirs(os.path.dirname(self._path))
+        with open(self._path, "w") as file:
+            file.write("{not json")
+
+        self.assertIsNone(TokenCache(path=self._path).get(realm="zup", client_id="c"))
+
+    def test__when_locked__then_other_holders_wait(self):
+        first, second = TokenCache(path=self._path), TokenCache(path=self._path)
+        events = []
+
+        def hold(cache, name):
+            with cache.lock():
+                events.append(f"{name}-in")
+                time.sleep(0.1)
+                events.append(f"{name}-out")
+
+        threads = [
+            threading.Thread(target=hold, args=(first, "first")),
+            threading.Thread(target=hold, args=(second, "second")),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertIn(
+            events,
+            [
+                ["first-in", "first-out", "second-in", "second-out"],
+                ["second-in", "second-out", "first-in", "first-out"],
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,157 @@
+import os
+import tempfile
+import unittest
+from unittest import TestCase
+
+from reviewer_stk_ai.src.models.file_review import FileReview
+from reviewer_stk_ai.src.utils.work_queue import (
+    STATUS_DONE,
+    STATUS_FAILED,
+    STATUS_LEASED,
+    STATUS_PENDING,
+    WorkQueue,
+)
+
+
+class TestWorkQueue(TestCase):
+
+    def setUp(self):
+        self.path = os.path.join(tempfile.mkdtemp(), "state", "queue.sqlite3")
+        self.reviews = [
+            FileReview(name="a.py", content="print('a')"),
+            FileReview(name="b.py", content="print('b')"),
+        ]
+
+    def test__enqueue__when_already_queued__then_add_only_new_reviews(self):
+        # arrange
+        work_queue = WorkQueue(path=self.path)
+        work_queue.enqueue(file_reviews=self.reviews[:1])
+
+        # act
+        added = WorkQueue(path=self.path).enqueue(file_reviews=self.reviews)
+
+        # assert
+        self.assertEqual(1, added)
+        self.assertEqual({STATUS_PENDING: 2}, work_queue.get_counts())
+
+    def test__lease__when_two_workers__then_each_one_gets_a_different_review(self):
+        # arrange
+        WorkQueue(path=self.path).enqueue(file_reviews=self.reviews)
+
+        # act
+        review_1 = WorkQueue(path=self.path).lease(worker_id="worker-1")
+        review_2 = WorkQueue(path=self.path).lease(worker_id="worker-2")
+        review_3 = WorkQueue(path=self.path).lease(worker_id="worker-3")
+
+        # assert
+        self.assertEqual("a.py", review_1.name)
+        self.assertEqual("print('a')", review_1.content)
+        self.assertEqual("b.py", review_2.name)
+        self.assertIsNone(review_3)
+        self.assertEqual({STATUS_LEASED: 2}, WorkQueue(path=self.path).get_counts())
+
+    def test__lease__when_lease_expired__then_lease_again(self):
+        # arrange
+        work_queue = WorkQueue(path=self.path, lease_seconds=-1)
+        work_queue.enqueue(file_reviews=self.reviews[:1])
+        work_queue.lease(worker_id="crashed-worker")
+
+        # act
+        review = work_queue.lease(worker_id="worker")
+
+        # assert
+        self.assertEqual("a.py", review.name)
+
+    def test__complete__when_all_reviews_done__then_queue_is_drained(self):
+        # arrange
+        work_queue = WorkQueue(path=self.path)
+        work_queue.enqueue(file_reviews=self.reviews)
+
+        # act
+        while (review := work_queue.lease(worker_id="worker")) is not None:
+            review.execution_id = f"exec-{review.name}"
+            review.llm_review = f"review of {review.name}"
+            work_queue.complete(review=review, worker_id="worker")
+
+        # assert
+        self.assertTrue(work_queue.is_drained())
+        self.assertEqual({STATUS_DONE: 2}, work_queue.get_counts())
+        self.assertEqual(
+            ["review of a.py", "review of b.py"],
+            [review.llm_review for review in work_queue.find_completed()],
+        )
+
+    def test__fail__when_attempts_exhausted__then_mark_as_failed(self):
+        # arrange
+        work_queue = WorkQueue(path=self.path, max_attempts=2)
+        work_queue.enqueue(file_reviews=self.reviews[:1])
+
+        # act
+        for _ in range(3):
+            review = work_queue.lease(worker_id="worker")
+            if review is not None:
+                work_queue.fail(
+                    review=review, worker_id="worker", error=ValueError("error 500")
+                )
+
+        # assert
+        self.assertEqual({STATUS_FAILED: 1}, work_queue.get_counts())
+        self.assertTrue(work_queue.is_drained())
+
+    def test__lease__when_last_lease_expired__then_mark_as_failed(self):
+        # arrange
+        work_queue = WorkQueue(path=self.path, lease_seconds=-1, max_attempts=1)
+        work_queue.enqueue(file_reviews=self.reviews[:1])
+        work_queue.lease(worker_id="crashed-worker")
+
+        # act
+        review = work_queue.lease(worker_id="worker")
+
+        # assert
+        self.assertIsNone(review)
+        self.assertEqual({STATUS_FAILED: 1}, work_queue.get_counts())
+        self.assertTrue(work_queue.is_drained())
+
+    def test__complete__when_lease_taken_over__then_keep_the_new_lease(self):
+        # arrange
+        work_queue = WorkQueue(path=self.path, lease_seconds=-1)
+        work_queue.enqueue(file_reviews=self.reviews[:1])
+        review = work_queue.lease(worker_id="slow-worker")
+        work_queue.lease(worker_id="worker")
+        review.llm_review = "late review of a.py"
+
+        # act
+        completed = work_queue.complete(review=review, worker_id="slow-worker")
+        failed = work_queue.fail(
+            review=review, worker_id="slow-worker", error=ValueError("error 500")
+        )
+
+        # assert
+        self.assertFalse(completed)
+        self.assertFalse(failed)
+        self.assertEqual({STATUS_LEASED: 1}, work_queue.get_counts())
+        self.assertEqual([], work_queue.find_completed())
+
+    def test__enqueue__when_content_changed__then_review_it_again(self):
+        # arrange
+        work_queue = WorkQueue(path=self.path)
+        work_queue.enqueue(file_reviews=self.reviews[:1])
+        review = work_queue.lease(worker_id="worker")
+        review.llm_review = "review of a.py"
+        work_queue.complete(review=review, worker_id="worker")
+
+        # act
+        added = work_queue.enqueue(
+            file_reviews=[FileReview(name="a.py", content="print('changed')")]
+        )
+
+        # assert
+        self.assertEqual(1, added)
+        self.assertEqual({STATUS_PENDING: 1}, work_queue.get_counts())
+        self.assertEqual(
+            "print('changed')", work_queue.lease(worker_id="worker").content
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,5 @@
+import os
+import tempfile
 import unittest
 from unittest import TestCase
 from unittest.mock import patch
@@ -8,8 +10,26 @@ from reviewer_stk_ai.src.exceptions.integration_error import IntegrationError
 from reviewer_stk_ai.src.utils.constants import (
     EXIT_SUCCESS,
     EXIT_FAIL,
+    EXIT_PARTIAL,
 )
-from src.utils.constants import DEFAULT_REPORT_FILENAME, DEFAULT_REPORT_DIRECTORY
+from src.models.file_review import FileReview
+from src.models.review_summary import ReviewSummary
+from src.utils.constants import DEFAULT_REPORT_FILENAME
+
+
+def write_reviews(reviews_by_name):
+    def run(file_reviews, report_writer, **kwargs):
+        for name, llm_review in reviews_by_name.items():
+            report_writer.write(review=FileReview(name=name, llm_review=llm_review))
+
+        return reviews_by_name
+
+    return run
+
+
+def read_report(directory, file_name=DEFAULT_REPORT_FILENAME):
+    with open(os.path.join(directory, file_name), "r", encoding="utf-8") as file:
+        return file.read()
 
 
 class TestCli(TestCase):
@@ -32,6 +52,7 @@ class TestCli(TestCase):
         self._mock_review_service = patch(
             "reviewer_stk_ai.src.service.reviewer_service.ReviewerService"
         ).start()()
+        self._mock_review_service.get_summary.return_value = ReviewSummary()
 
         self._mock_find_all_files = patch(
             "reviewer_stk_ai.src.utils.file_helper.find_all_files"
@@ -46,6 +67,9 @@ class TestCli(TestCase):
         import cli
 
         self._cli = cli
+        patch.object(
+            cli, "JOURNAL_PATH", os.path.join(tempfile.mkdtemp(), "journal.jsonl")
+        ).start()
 
         self.runner = CliRunner()
 
@@ -58,10 +82,13 @@ class TestCli(TestCase):
             "/root/dir2/file_3.py": "file content",
         }
 
-        self._mock_review_service.run.return_value = {
-            "b/file1.py": "Points found:\n"
-            "I am not able to perform the code review of this file",
-        }
+        self._mock_review_service.run.side_effect = write_reviews(
+            {
+                "b/file1.py": "Points found:\n"
+                "I am not able to perform the code review of this file",
+            }
+        )
+        report_directory = tempfile.mkdtemp()
 
         result = self.runner.invoke(
             self._cli.cli,
@@ -72,6 +99,8 @@ class TestCli(TestCase):
                 "test_client-id",
                 "--client-secret",
                 "test_client-secret",
+                "--report-directory",
+                report_directory,
                 "review-dir",
             ],
             prog_name="reviewer_stk_ai",
@@ -95,10 +124,11 @@ class TestCli(TestCase):
             },
             ignored_files={"__init__.py", "manage.py", "setup.py"},
         )
-        self._mock_create_file_and_directory.assert_called_once_with(
-            directory=DEFAULT_REPORT_DIRECTORY,
-            file_name=DEFAULT_REPORT_FILENAME,
-            content="# File name: b/file1.py \n\n Points found:\nI am not able to perform the code review of this file",
+        self.assertEqual(
+            "Files reviewed:\n\n- b/file1.py\n\n---\n\n"
+            "File name: b/file1.py \n\nPoints found:\n"
+            "I am not able to perform the code review of this file",
+            read_report(directory=report_directory),
         )
 
     def test__review_dir__when_no_files__then_return_success(self):
@@ -210,6 +240,203 @@ class TestCli(TestCase):
         self._mock_review_service.run.assert_called_once()
         self._mock_create_file_and_directory.assert_not_called()
 
+    def test__review_dir__when_sharded__then_write_shard_report(self):
+        self._mock_find_all_files.return_value = {
+            f"/root/dir2/file_{i}.py": "file content" for i in range(10)
+        }
+        self._mock_review_service.run.side_effect = write_reviews(
+            {"/root/dir2/file_1.py": "Points found:\nnone"}
+        )
+        report_directory = tempfile.mkdtemp()
+
+        result = self.runner.invoke(
+            self._cli.cli,
+            [
+                "--quick-command-id",
+                "test_command",
+                "--client-id",
+                "test_client-id",
+                "--client-secret",
+                "test_client-secret",
+                "--report-directory",
+                report_directory,
+                "review-dir",
+                "--shard-index",
+                "1",
+                "--shard-count",
+                "2",
+            ],
+            prog_name="reviewer_stk_ai",
+        )
+
+        self.assertEqual(EXIT_SUCCESS, result.exit_code)
+
+        file_reviews = self._mock_review_service.run.call_args.kwargs["file_reviews"]
+        self.assertLess(len(file_reviews), 10)
+        self.assertEqual(
+            "File name: /root/dir2/file_1.py \n\nPoints found:\nnone",
+            read_report(
+                directory=report_directory,
+                file_name="review-code-report.shard-2-of-2.md",
+            ),
+        )
+
+    def test__review_dir__when_invalid_shard__then_return_fail(self):
+        self._mock_find_all_files.return_value = {
+            "/root/dir2/file_3.py": "file content",
+        }
+
+        result = self.runner.invoke(
+            self._cli.cli,
+            [
+                "--quick-command-id",
+                "test_command",
+                "--client-id",
+                "test_client-id",
+                "--client-secret",
+                "test_client-secret",
+                "review-dir",
+                "--shard-index",
+                "2",
+                "--shard-count",
+                "2",
+            ],
+            prog_name="reviewer_stk_ai",
+        )
+
+        self.assertNotEqual(EXIT_SUCCESS, result.exit_code)
+        self._mock_review_service.run.assert_not_called()
+
+    def test__review_dir__when_invalid_callback_receiver__then_return_fail(self):
+        self._mock_find_all_files.return_value = {
+            "/root/dir2/file_3.py": "file content",
+        }
+
+        result = self.runner.invoke(
+            self._cli.cli,
+            [
+                "--quick-command-id",
+                "test_command",
+                "--client-id",
+                "test_client-id",
+                "--client-secret",
+                "test_client-secret",
+                "--callback-receiver",
+                "localhost",
+                "review-dir",
+            ],
+            prog_name="reviewer_stk_ai",
+        )
+
+        self.assertNotEqual(EXIT_SUCCESS, result.exit_code)
+        self.assertIn("--callback-receiver", result.output)
+        self._mock_review_service.run.assert_not_called()
+
+    def test__review_dir__when_callback_receiver__then_close_it_at_the_end(self):
+        self._mock_find_all_files.return_value = {
+            "/root/dir2/file_3.py": "file content",
+        }
+        self._mock_review_service.run.side_effect = write_reviews(
+            {"/root/dir2/file_3.py": "Points found:\nnone"}
+        )
+
+        with patch(
+            "reviewer_stk_ai.src.service.stk_callback_receiver.StkCallbackReceiver"
+        ) as mock_receiver:
+            result = self.runner.invoke(
+                self._cli.cli,
+                [
+                    "--quick-command-id",
+                    "test_command",
+                    "--client-id",
+                    "test_client-id",
+                    "--client-secret",
+                    "test_client-secret",
+                    "--callback-receiver",
+                    "127.0.0.1:0",
+                    "--report-directory",
+                    tempfile.mkdtemp(),
+                    "review-dir",
+                ],
+                prog_name="reviewer_stk_ai",
+            )
+
+        self.assertEqual(EXIT_SUCCESS, result.exit_code)
+        mock_receiver.return_value.start.return_value.close.assert_called_once()
+
+    def test__review_dir__when_finished__then_close_poller_and_http_client(self):
+        self._mock_find_all_files.return_value = {
+            "/root/dir2/file_3.py": "file content",
+        }
+        self._mock_review_service.run.side_effect = write_reviews(
+            {"/root/dir2/file_3.py": "Points found:\nnone"}
+        )
+
+        with patch(
+            "reviewer_stk_ai.src.service.stk_callback_poller.StkCallbackPoller"
+        ) as mock_poller, patch(
+            "reviewer_stk_ai.src.utils.http_client.HttpClient"
+        ) as mock_http_client:
+            mock_http_client.return_value.get_stats.return_value = {"requests": 0}
+            result = self.runner.invoke(
+                self._cli.cli,
+                [
+                    "--quick-command-id",
+                    "test_command",
+                    "--client-id",
+                    "test_client-id",
+                    "--client-secret",
+                    "test_client-secret",
+                    "--report-directory",
+                    tempfile.mkdtemp(),
+                    "review-dir",
+                ],
+                prog_name="reviewer_stk_ai",
+            )
+
+        self.assertEqual(EXIT_SUCCESS, result.exit_code)
+        mock_poller.return_value.close.assert_called_once()
+        mock_http_client.return_value.close.assert_called_once()
+
+    def test__review_dir__when_deadline_reached__then_return_partial(self):
+        self._mock_find_all_files.return_value = {
+            "/root/dir2/file_1.py": "file content",
+            "/root/dir2/file_2.py": "file content",
+        }
+        self._mock_review_service.run.side_effect = write_reviews(
+            {"/root/dir2/file_1.py": "Points found:\nnone"}
+        )
+        summary = ReviewSummary()
+        summary.timed_out = ["/root/dir2/file_2.py"]
+        self._mock_review_service.get_summary.return_value = summary
+        report_directory = tempfile.mkdtemp()
+
+        result = self.runner.invoke(
+            self._cli.cli,
+            [
+                "--quick-command-id",
+                "test_command",
+                "--client-id",
+                "test_client-id",
+                "--client-secret",
+                "test_client-secret",
+                "--report-directory",
+                report_directory,
+                "review-dir",
+                "--deadline",
+                "600",
+            ],
+            prog_name="reviewer_stk_ai",
+        )
+
+        self.assertEqual(EXIT_PARTIAL, result.exit_code)
+        self.assertIsNotNone(self._mock_review_service.run.call_args.kwargs["deadline"])
+        self.assertTrue(
+            read_report(directory=report_directory).endswith(
+                "Files not reviewed:\n\n- /root/dir2/file_2.py"
+            )
+        )
+
     def test__diff__when_has_changes__then_return_success(self):
         self._mock_find_all_changed_code.return_value = {
             "file1.py": (
@@ -222,10 +449,13 @@ class TestCli(TestCase):
             )
         }
 
-        self._mock_review_service.run.return_value = {
-            "b/file1.py": "Points found:\n"
-            "I am not able to perform the code review of this file",
-        }
+        self._mock_review_service.run.side_effect = write_reviews(
+            {
+                "b/file1.py": "Points found:\n"
+                "I am not able to perform the code review of this file",
+            }
+        )
+        report_directory = tempfile.mkdtemp()
 
         result = self.runner.invoke(
             self._cli.cli,
@@ -236,6 +466,8 @@ class TestCli(TestCase):
                 "test_client-id",
                 "--client-secret",
                 "test_client-secret",
+                "--report-directory",
+                report_directory,
                 "diff",
             ],
             prog_name="reviewer_stk_ai",
@@ -259,12 +491,14 @@ class TestCli(TestCase):
                 "setup.py",
             },
             ignored_files={"manage.py", "__init__.py", "setup.py"},
+            full_content=False,
         )
         self._mock_find_all_files.assert_not_called()
-        self._mock_create_file_and_directory.assert_called_once_with(
-            directory=DEFAULT_REPORT_DIRECTORY,
-            file_name=DEFAULT_REPORT_FILENAME,
-            content="# File name: b/file1.py \n\n Points found:\nI am not able to perform the code review of this file",
+        self.assertEqual(
+            "Files reviewed:\n\n- b/file1.py\n\n---\n\n"
+            "File name: b/file1.py \n\nPoints found:\n"
+            "I am not able to perform the code review of this file",
+            read_report(directory=report_directory),
         )
 
     def test__diff__when_no_changes__then_return_success(self):
@@ -301,6 +535,7 @@ class TestCli(TestCase):
                 "venv",
             },
             ignored_files={"__init__.py", "manage.py", "setup.py"},
+            full_content=False,
         )
         self._mock_review_service.run.assert_not_called()
         self._mock_create_file_and_directory.assert_not_called()
@@ -328,6 +563,120 @@ class TestCli(TestCase):
         self._mock_review_service.run.assert_not_called()
         self._mock_create_file_and_directory.assert_not_called()
 
+    def test__warm_cache__when_has_files__then_review_them_into_cache(self):
+        mock_find_all_code = patch.object(self._cli, "find_all_code").start()
+        mock_find_all_code.return_value = {"dir/file1.py": "print('x')\n"}
+        cache_directory = tempfile.mkdtemp()
+
+        result = self.runner.invoke(
+            self._cli.cli,
+            [
+                "--quick-command-id",
+                "test_command",
+                "--client-id",
+                "test_client-id",
+                "--client-secret",
+                "test_client-secret",
+                "--review-cache-dir",
+                cache_directory,
+                "warm-cache",
+                "--ref",
+                "origin/main",
+            ],
+            prog_name="reviewer_stk_ai",
+        )
+
+        self.assertEqual(EXIT_SUCCESS, result.exit_code)
+        self.assertEqual("origin/main", mock_find_all_code.call_args.kwargs["ref"])
+        self._mock_review_service.run.assert_called_once()
+        self.assertEqual(
+            ["dir/file1.py"],
+            [
+                review.name
+                for review in self._mock_review_service.run.call_args.kwargs[
+                    "file_reviews"
+                ]
+            ],
+        )
+        self.assertIn(f"Review cache {cache_directory} holds 0 reviews.", result.output)
+
+    def test__warm_cache__when_without_cache_directory__then_return_fail(self):
+        result = self.runner.invoke(
+            self._cli.cli,
+            [
+                "--quick-command-id",
+                "test_command",
+                "--client-id",
+                "test_client-id",
+                "--client-secret",
+                "test_client-secret",
+                "warm-cache",
+            ],
+            prog_name="reviewer_stk_ai",
+        )
+
+        self.assertNotEqual(EXIT_SUCCESS, result.exit_code)
+        self.assertIn("--review-cache-dir", result.output)
+        self._mock_review_service.run.assert_not_called()
+
+    def test__review_dir__when_without_credentials__then_return_fail(self):
+        result = self.runner.invoke(
+            self._cli.cli, ["review-dir"], prog_name="reviewer_stk_ai"
+        )
+
+        self.assertNotEqual(EXIT_SUCCESS, result.exit_code)
+        self.assertIn("Missing option '--quick-command-id'", result.output)
+        self._mock_review_service.run.assert_not_called()
+
+    def test__merge_reports__when_without_credentials__then_merge_shards(self):
+        # arrange
+        directory = tempfile.mkdtemp()
+        for index in (1, 2):
+            name = f"report.shard-{index}-of-2.txt"
+            with open(os.path.join(directory, name), "w", encoding="utf-8") as file:
+                file.write(f"File name: file_{index}.py \n\nreview {index}")
+
+        # act
+        result = self.runner.invoke(
+            self._cli.cli,
+            [
+                "--report-directory",
+                directory,
+                "--report-filename",
+                "report.txt",
+                "merge-reports",
+            ],
+            prog_name="reviewer_stk_ai",
+        )
+
+        # assert
+        self.assertEqual(EXIT_SUCCESS, result.exit_code, result.output)
+        self.assertIn("review 2", read_report(directory, "report.txt"))
+
+    def test__merge_reports__when_shards_of_different_splits__then_return_fail(self):
+        # arrange
+        directory = tempfile.mkdtemp()
+        for name in ("report.shard-1-of-3.txt", "report.shard-2-of-2.txt"):
+            with open(os.path.join(directory, name), "w", encoding="utf-8") as file:
+                file.write("File name: file.py \n\nreview")
+
+        # act
+        result = self.runner.invoke(
+            self._cli.cli,
+            [
+                "--report-directory",
+                directory,
+                "--report-filename",
+                "report.txt",
+                "merge-reports",
+            ],
+            prog_name="reviewer_stk_ai",
+        )
+
+        # assert
+        self.assertNotEqual(EXIT_SUCCESS, result.exit_code)
+        self.assertIn("different splits", result.output)
+
 
 if __name__ == "__cli__":
     unittest.main()